@@ -0,0 +1,63 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Runs the benchmark suite against a local stand-in Foundry server.
+
+    python -m benchmarks --latency 0.005 --save build/benchmarks.json
+    python -m benchmarks --latency 0.005 --baseline build/benchmarks.json --tolerance 0.2
+"""
+
+import argparse
+import json
+import sys
+
+from .server import StandInFoundryServer
+from .suite import regressions, run
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds added per request"
+    )
+    parser.add_argument(
+        "--bandwidth", type=float, default=None, help="bytes per second, per request"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--quick", action="store_true", help="use small data sizes")
+    parser.add_argument("--filter", help="only run benchmarks containing this name")
+    parser.add_argument("--save", help="write results to a baseline json file")
+    parser.add_argument("--baseline", help="fail if slower than this baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    with StandInFoundryServer(latency=args.latency, bandwidth=args.bandwidth) as server:
+        results = run(server, args.repeat, args.quick, args.filter)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump({result.key: result.best for result in results}, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            failures = regressions(results, json.load(file), args.tolerance)
+        for failure in failures:
+            print(f"REGRESSION {failure}", file=sys.stderr)
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
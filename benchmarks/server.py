@@ -0,0 +1,678 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+A stand-in for the Foundry HTTP endpoints bound in :mod:`palantir.datasets.rpc`, holding datasets in memory.
+
+Only the behaviour the SDK relies on is implemented. Latency is added to every request and request/response bodies are
+throttled to the configured bandwidth so that benchmarks can model a remote stack.
+"""
+
+import bisect
+import io
+import json
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from palantir.core import context
+from palantir.core.types import PalantirContext
+from palantir.datasets.compression import decompress
+
+_SELECT_STAR = re.compile(
+    r'SELECT \* FROM "(?P<end_ref>[^"@]+)@(?P<branch>[^"]+)"\."(?P<rid>[^"]+)"'
+)
+_WRITE_BLOCK_SIZE = 64 * 1024
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+@dataclass
+class _Transaction:
+    rid: str
+    dataset_rid: str
+    branch: str
+    txn_type: str = "APPEND"
+    status: str = "OPEN"
+    start_time: str = field(default_factory=_now)
+    close_time: Optional[str] = None
+    record: Dict[str, Any] = field(default_factory=dict)
+    files: Dict[str, Tuple[bytes, str]] = field(default_factory=dict)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "rid": self.rid,
+            "datasetRid": self.dataset_rid,
+            "type": self.txn_type,
+            "status": self.status,
+            "filePathType": "MANAGED_FILES",
+            "startTime": self.start_time,
+            "closeTime": self.close_time,
+            "record": self.record,
+            "isDataDeleted": False,
+            "isDeletionComplete": False,
+        }
+
+
+@dataclass
+class _Dataset:
+    rid: str
+    path: str
+    branches: Dict[str, List[_Transaction]] = field(default_factory=dict)
+    schemas: Dict[Tuple[str, Optional[str]], Dict[str, Any]] = field(
+        default_factory=dict
+    )
+
+
+class _View(NamedTuple):
+    files: Dict[str, Tuple[bytes, str, str]]
+    paths: List[str]
+
+
+class FoundryState:
+    """The in-memory catalog, file and schema state of the stand-in server."""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.datasets: Dict[str, _Dataset] = {}
+        self.transactions: Dict[str, _Transaction] = {}
+        self.concatenation_tasks: Dict[str, Dict[str, Any]] = {}
+        self.query_results: Dict[str, bytes] = {}
+        # views ending at a committed transaction never change, so they are indexed once like the catalog does
+        self.views: Dict[Tuple[str, Optional[str], bool], _View] = {}
+
+    def create_dataset(self, path: str) -> _Dataset:
+        with self.lock:
+            dataset = _Dataset(rid=f"ri.foundry.main.dataset.{uuid.uuid4()}", path=path)
+            self.datasets[dataset.rid] = dataset
+            return dataset
+
+    def by_path(self, path: str) -> Optional[_Dataset]:
+        with self.lock:
+            return next((ds for ds in self.datasets.values() if ds.path == path), None)
+
+    def transactions_in_view(
+        self,
+        dataset_rid: str,
+        end_ref: str,
+        start_transaction_rid: Optional[str] = None,
+        include_open: bool = False,
+    ) -> List[_Transaction]:
+        with self.lock:
+            dataset = self.datasets[dataset_rid]
+            end_txn = self.transactions.get(end_ref)
+            branch = end_txn.branch if end_txn is not None else end_ref
+            txns = [
+                txn
+                for txn in dataset.branches.get(branch, [])
+                if txn.status == "COMMITTED"
+                or (txn.status == "OPEN" and (include_open or txn is end_txn))
+            ]
+            if end_txn is not None:
+                txns = txns[: txns.index(end_txn) + 1]
+            if start_transaction_rid is not None:
+                start = next(
+                    i for i, txn in enumerate(txns) if txn.rid == start_transaction_rid
+                )
+            else:
+                start = max(
+                    (i for i, txn in enumerate(txns) if txn.txn_type == "SNAPSHOT"),
+                    default=0,
+                )
+            return txns[start:]
+
+    def commit_files(
+        self,
+        dataset_rid: str,
+        files: Dict[str, bytes],
+        branch: str = "master",
+        txn_type: str = "SNAPSHOT",
+    ) -> str:
+        """Commits a transaction containing the provided files without going through http, e.g. to seed a benchmark."""
+        with self.lock:
+            txn = _Transaction(
+                rid=f"ri.foundry.main.transaction.{uuid.uuid4()}",
+                dataset_rid=dataset_rid,
+                branch=branch,
+                txn_type=txn_type,
+                status="COMMITTED",
+                files={path: (content, _now()) for path, content in files.items()},
+            )
+            txn.close_time = _now()
+            self.datasets[dataset_rid].branches.setdefault(branch, []).append(txn)
+            self.transactions[txn.rid] = txn
+            return txn.rid
+
+    def view(
+        self,
+        dataset_rid: str,
+        end_ref: str,
+        start_transaction_rid: Optional[str] = None,
+        include_open: bool = False,
+    ) -> "_View":
+        """Returns the files in a view with their sorted paths, indexed once if the view cannot change."""
+        with self.lock:
+            end_txn = self.transactions.get(end_ref)
+            key = (end_ref, start_transaction_rid, include_open)
+            if key in self.views:
+                return self.views[key]
+            files = self.files_in_view(
+                dataset_rid, end_ref, start_transaction_rid, include_open
+            )
+            view = _View(files, sorted(files))
+            if end_txn is not None and end_txn.status == "COMMITTED":
+                self.views[key] = view
+            return view
+
+    def files_in_view(self, *args, **kwargs) -> Dict[str, Tuple[bytes, str, str]]:
+        """Returns a mapping from logical path to (content, transaction rid, modified time)."""
+        files: Dict[str, Tuple[bytes, str, str]] = {}
+        for txn in self.transactions_in_view(*args, **kwargs):
+            if txn.txn_type == "SNAPSHOT":
+                files = {}
+            for path, (content, modified) in txn.files.items():
+                if txn.txn_type == "DELETE":
+                    files.pop(path, None)
+                else:
+                    files[path] = (content, txn.rid, modified)
+        return files
+
+
+Route = Tuple[str, "re.Pattern[str]", Callable[..., Any]]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_HttpServer"
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        self._dispatch("GET")
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str) -> None:
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        url = urlsplit(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        body = self._read_body()
+        for route_method, pattern, handler in self.server.routes:
+            match = pattern.fullmatch(url.path)
+            if route_method == method and match:
+                path_params = {k: unquote(v) for k, v in match.groupdict().items()}
+                try:
+                    status, payload = handler(
+                        self.server.state,
+                        params=params,
+                        body=body,
+                        headers=self.headers,
+                        **path_params,
+                    )
+                except KeyError as exc:
+                    status, payload = 404, {"errorName": f"NotFound:{exc}"}
+                except ValueError as exc:
+                    status, payload = 409, {"errorName": str(exc)}
+                self._respond(status, payload)
+                return
+        self._respond(404, {"errorName": f"NoRoute:{method} {url.path}"})
+
+    def _read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b";")[0].strip(), 16)
+                chunk = self.rfile.read(size) if size else b""
+                self.rfile.readline()
+                if not size:
+                    break
+                chunks.append(chunk)
+            body = b"".join(chunks)
+        else:
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self._throttle(len(body))
+        if self.headers.get("Content-Encoding"):
+            body = b"".join(decompress([body], self.headers["Content-Encoding"]))
+        return body
+
+    def _respond(self, status: int, payload: Any) -> None:
+        if isinstance(payload, bytes):
+            content_type, data = "application/octet-stream", payload
+        elif payload is None:
+            content_type, data = "application/json", b""
+            status = 204 if status == 200 else status
+        else:
+            content_type, data = "application/json", json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        for offset in range(0, len(data), _WRITE_BLOCK_SIZE):
+            block = data[offset : offset + _WRITE_BLOCK_SIZE]
+            self.wfile.write(block)
+            self._throttle(len(block))
+
+    def _throttle(self, num_bytes: int) -> None:
+        if self.server.bandwidth and num_bytes:
+            time.sleep(num_bytes / self.server.bandwidth)
+
+
+class _HttpServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, state: FoundryState, latency, bandwidth):
+        super().__init__(address, _Handler)
+        self.state = state
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.routes = _ROUTES
+
+
+class StandInFoundryServer:
+    """
+    Serves the catalog, data-proxy, concatenation, schema, path and SQL endpoints used by :class:`DatasetsClient`.
+
+    Args:
+        latency: Seconds added to every request.
+        bandwidth: Bytes per second that request and response bodies are throttled to, unlimited if None.
+
+    Examples:
+        >>> with StandInFoundryServer(latency=0.01) as server:
+        ...     ds = dataset("/bench/dataset", create=True, ctx=server.context())
+    """
+
+    def __init__(
+        self, latency: float = 0.0, bandwidth: float = None, host: str = "127.0.0.1"
+    ):
+        self.state = FoundryState()
+        self._server = _HttpServer((host, 0), self.state, latency, bandwidth)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def hostname(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def context(self) -> PalantirContext:
+        return context(hostname=self.hostname, token="stand-in-token")
+
+    def start(self) -> "StandInFoundryServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def _get_resource_by_path(state: FoundryState, params, **_):
+    dataset = state.by_path(params["path"])
+    return 200, None if dataset is None else {"rid": dataset.rid}
+
+
+def _create_dataset(state: FoundryState, body, **_):
+    dataset = state.create_dataset(json.loads(body)["path"])
+    return 200, {"rid": dataset.rid, "fileSystemId": "stand-in"}
+
+
+def _create_branch(state: FoundryState, dataset_rid, branch_id, **_):
+    with state.lock:
+        state.datasets[dataset_rid].branches.setdefault(branch_id, [])
+    return 200, {
+        "id": branch_id,
+        "rid": f"ri.foundry.main.branch.{uuid.uuid4()}",
+        "ancestorBranchIds": [],
+        "creationTime": _now(),
+    }
+
+
+def _get_view_range(state: FoundryState, params, dataset_rid, end_ref, **_):
+    txns = state.transactions_in_view(
+        dataset_rid,
+        end_ref,
+        params.get("startTransactionRid"),
+        params.get("includeOpenExclusiveTransaction") == "true",
+    )
+    if not txns:
+        return 200, None
+    return 200, {
+        "startTransactionRid": txns[0].rid,
+        "endTransactionRid": txns[-1].rid,
+    }
+
+
+def _get_view_files(state: FoundryState, params, dataset_rid, end_ref, **_):
+    files, paths = state.view(
+        dataset_rid,
+        end_ref,
+        params.get("startTransactionRid"),
+        params.get("includeOpenExclusiveTransaction") == "true",
+    )
+    prefix = params.get("logicalPath") or ""
+    page_start = max(params.get("pageStartLogicalPath") or "", prefix)
+    page_size = int(params["pageSize"])
+    start = bisect.bisect_left(paths, page_start)
+    page = [
+        path for path in paths[start : start + page_size + 1] if path.startswith(prefix)
+    ]
+    page, rest = page[:page_size], page[page_size:]
+    return 200, {
+        "values": [
+            {
+                "logicalPath": path,
+                "physicalPath": path,
+                "transactionRid": files[path][1],
+                "fileMetadata": {"length": len(files[path][0])},
+                "isOpen": state.transactions[files[path][1]].status == "OPEN",
+                "timeModified": files[path][2],
+            }
+            for path in page
+        ],
+        "nextPageToken": rest[0] if rest else None,
+    }
+
+
+def _get_reverse_transactions(state: FoundryState, params, dataset_rid, end_ref, **_):
+    with state.lock:
+        end_txn = state.transactions.get(end_ref)
+        branch = end_txn.branch if end_txn is not None else end_ref
+        txns = state.datasets[dataset_rid].branches.get(branch, [])
+        if end_txn is not None:
+            txns = txns[: txns.index(end_txn) + 1]
+        txns = [
+            txn
+            for txn in reversed(txns)
+            if txn.status == "COMMITTED"
+            or (
+                txn.status == "OPEN"
+                and (
+                    params.get("includeOpenExclusiveTransaction") == "true"
+                    or txn is end_txn
+                )
+            )
+        ]
+        page_start = params.get("pageStartTransactionRid")
+        start = next((i for i, txn in enumerate(txns) if txn.rid == page_start), 0)
+        page_size = int(params["pageSize"])
+        page = txns[start : start + page_size + 1]
+        return 200, {
+            "values": [txn.to_json() for txn in page[:page_size]],
+            "nextPageToken": page[page_size].rid if len(page) > page_size else None,
+        }
+
+
+def _start_transaction(state: FoundryState, body, dataset_rid, **_):
+    request = json.loads(body)
+    with state.lock:
+        branch = state.datasets[dataset_rid].branches.setdefault(
+            request["branchId"], []
+        )
+        if any(txn.status == "OPEN" for txn in branch):
+            raise ValueError("Catalog:SimultaneousOpenTransactionsNotAllowed")
+        txn = _Transaction(
+            rid=f"ri.foundry.main.transaction.{uuid.uuid4()}",
+            dataset_rid=dataset_rid,
+            branch=request["branchId"],
+            record=request.get("record") or {},
+        )
+        branch.append(txn)
+        state.transactions[txn.rid] = txn
+    return 200, txn.to_json()
+
+
+def _set_transaction_type(state: FoundryState, body, transaction_rid, **_):
+    with state.lock:
+        txn = state.transactions[transaction_rid]
+        txn.txn_type = json.loads(body)
+    return 200, txn.to_json()
+
+
+def _get_transaction(state: FoundryState, transaction_rid, **_):
+    with state.lock:
+        return 200, state.transactions[transaction_rid].to_json()
+
+
+def _add_files_to_delete_transaction(state: FoundryState, body, transaction_rid, **_):
+    with state.lock:
+        txn = state.transactions[transaction_rid]
+        if txn.status != "OPEN" or txn.txn_type != "DELETE":
+            raise ValueError("Catalog:InvalidTransactionType")
+        for path in json.loads(body)["logicalPaths"]:
+            txn.files[path] = (b"", _now())
+    return 200, None
+
+
+def _close_transaction(status: str):
+    def close(state: FoundryState, body, transaction_rid, **_):
+        with state.lock:
+            txn = state.transactions[transaction_rid]
+            if txn.status != "OPEN":
+                raise ValueError("Catalog:TransactionNotOpen")
+            txn.status, txn.close_time = status, _now()
+            txn.record.update(json.loads(body or b"{}").get("record") or {})
+        return 200, None
+
+    return close
+
+
+def _get_file(
+    state: FoundryState, params, headers, dataset_rid, end_ref, logical_path, **_
+):
+    files = state.files_in_view(dataset_rid, end_ref, params.get("startTransactionRid"))
+    content = files[logical_path][0]
+    byte_range = re.fullmatch(r"bytes=(\d+)-", headers.get("Range", ""))
+    if byte_range:
+        return 206, content[int(byte_range.group(1)) :]
+    return 200, content
+
+
+def _put_file(state: FoundryState, params, body, transaction_rid, **_):
+    with state.lock:
+        txn = state.transactions[transaction_rid]
+        if txn.status != "OPEN":
+            raise ValueError("Catalog:TransactionNotOpen")
+        txn.files[params["logicalPath"]] = (body, _now())
+    return 200, None
+
+
+def _start_concatenation(state: FoundryState, body, transaction_rid, **_):
+    request = json.loads(body)
+    with state.lock:
+        txn = state.transactions[transaction_rid]
+        content = b"".join(txn.files.pop(path)[0] for path in request["sourcePaths"])
+        txn.files[request["destinationPath"]] = (content, _now())
+        task_id = str(uuid.uuid4())
+        state.concatenation_tasks[task_id] = {"type": "success", "success": {}}
+    return 200, {"concatenationTaskId": task_id}
+
+
+def _get_concatenation_status(state: FoundryState, concatenation_task_id, **_):
+    return 200, {
+        "status": state.concatenation_tasks[concatenation_task_id],
+        "reportedAt": _now(),
+    }
+
+
+def _put_schema(state: FoundryState, params, body, dataset_rid, branch_id, **_):
+    with state.lock:
+        state.datasets[dataset_rid].schemas[
+            (branch_id, params.get("endTransactionRid"))
+        ] = json.loads(body)
+    return 200, None
+
+
+def _get_schema(state: FoundryState, params, dataset_rid, branch_id, **_):
+    with state.lock:
+        schemas = state.datasets[dataset_rid].schemas
+        end_transaction_rid = params.get("endTransactionRid")
+        schema = schemas.get((branch_id, end_transaction_rid)) or next(
+            (s for (b, _), s in reversed(list(schemas.items())) if b == branch_id),
+            None,
+        )
+    if schema is None:
+        return 200, None
+    return 200, {
+        "branchId": branch_id,
+        "transactionRid": end_transaction_rid,
+        "versionId": "0",
+        "schema": schema,
+        "attribution": {"userId": "stand-in", "time": _now()},
+    }
+
+
+def _execute_query(state: FoundryState, body, **_):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    match = _SELECT_STAR.fullmatch(json.loads(body)["query"])
+    if match is None:
+        raise ValueError("Sql:UnsupportedQuery")
+    files = state.files_in_view(match.group("rid"), match.group("end_ref"))
+    table = pa.concat_tables(
+        pq.read_table(io.BytesIO(content))
+        for path, (content, _, _) in sorted(files.items())
+        if path.endswith(".parquet")
+    )
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    query_id = str(uuid.uuid4())
+    with state.lock:
+        state.query_results[query_id] = b"A" + sink.getvalue().to_pybytes()
+    return 200, {"queryId": query_id, "status": {"type": "ready", "ready": {}}}
+
+
+def _get_query_status(state: FoundryState, query_id, **_):
+    if query_id not in state.query_results:
+        raise KeyError(query_id)
+    return 200, {"status": {"type": "ready", "ready": {}}}
+
+
+def _get_query_results(state: FoundryState, query_id, **_):
+    with state.lock:
+        return 200, state.query_results.pop(query_id)
+
+
+_SEGMENT = "[^/]+"
+_CATALOG = "/foundry-catalog/api/catalog/datasets"
+_DATA_PROXY = "/foundry-data-proxy/api"
+
+
+def _route(method: str, path: str, handler: Callable[..., Any]) -> Route:
+    pattern = re.sub(r"{(\w+)}", lambda m: f"(?P<{m.group(1)}>{_SEGMENT})", path)
+    return method, re.compile(pattern), handler
+
+
+_ROUTES: List[Route] = [
+    _route("GET", "/compass/api/resources", _get_resource_by_path),
+    _route("POST", _CATALOG, _create_dataset),
+    _route(
+        "POST",
+        _CATALOG + "/{dataset_rid}/branchesUnrestricted2/{branch_id}",
+        _create_branch,
+    ),
+    _route("GET", _CATALOG + "/{dataset_rid}/views2/{end_ref}/range", _get_view_range),
+    _route("GET", _CATALOG + "/{dataset_rid}/views2/{end_ref}/files", _get_view_files),
+    _route(
+        "GET",
+        _CATALOG + "/{dataset_rid}/reverse-transactions2/{end_ref}",
+        _get_reverse_transactions,
+    ),
+    _route("POST", _CATALOG + "/{dataset_rid}/transactions", _start_transaction),
+    _route(
+        "POST",
+        _CATALOG + "/{dataset_rid}/transactions/{transaction_rid}",
+        _set_transaction_type,
+    ),
+    _route(
+        "GET",
+        _CATALOG + "/{dataset_rid}/transactions/{transaction_rid}",
+        _get_transaction,
+    ),
+    _route(
+        "POST",
+        _CATALOG
+        + "/{dataset_rid}/transactions/{transaction_rid}/files/addToDeleteTransaction",
+        _add_files_to_delete_transaction,
+    ),
+    _route(
+        "POST",
+        _CATALOG + "/{dataset_rid}/transactions/{transaction_rid}/commit",
+        _close_transaction("COMMITTED"),
+    ),
+    _route(
+        "POST",
+        _CATALOG + "/{dataset_rid}/transactions/{transaction_rid}/abortWithMetadata",
+        _close_transaction("ABORTED"),
+    ),
+    _route(
+        "GET",
+        _DATA_PROXY
+        + "/dataproxy/datasets/{dataset_rid}/views/{end_ref}/{logical_path}",
+        _get_file,
+    ),
+    _route(
+        "POST",
+        _DATA_PROXY
+        + "/dataproxy/datasets/{dataset_rid}/transactions/{transaction_rid}/putFile",
+        _put_file,
+    ),
+    _route(
+        "POST",
+        _DATA_PROXY
+        + "/concatenation-tasks/datasets/{dataset_rid}/transactions/{transaction_rid}/start",
+        _start_concatenation,
+    ),
+    _route(
+        "GET",
+        _DATA_PROXY
+        + "/concatenation-tasks/tasks/{concatenation_task_id}/status-report",
+        _get_concatenation_status,
+    ),
+    _route(
+        "POST",
+        "/foundry-metadata/api/schemas/datasets/{dataset_rid}/branches/{branch_id}",
+        _put_schema,
+    ),
+    _route(
+        "GET",
+        "/foundry-metadata/api/schemas/datasets/{dataset_rid}/branches/{branch_id}",
+        _get_schema,
+    ),
+    _route("POST", "/foundry-sql-server/api/queries/execute", _execute_query),
+    _route(
+        "GET", "/foundry-sql-server/api/queries/{query_id}/status", _get_query_status
+    ),
+    _route(
+        "GET", "/foundry-sql-server/api/queries/{query_id}/results", _get_query_results
+    ),
+]
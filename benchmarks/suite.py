@@ -0,0 +1,265 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import io
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+
+from palantir.datasets import dataset
+from palantir.datasets.chunking import ChunkSizer
+from palantir.datasets.core import Dataset
+from palantir.datasets.manifest import ManifestIndex
+
+from .server import StandInFoundryServer
+
+MEGABYTE = 1024 * 1024
+
+# a benchmark seeds the stand-in server and returns the operation to be timed
+Setup = Callable[[StandInFoundryServer, Dataset, int], Callable[[], object]]
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    name: str
+    setup: Setup
+    sizes: Sequence[int]
+    quick_sizes: Sequence[int]
+    unit: str
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    name: str
+    size: int
+    unit: str
+    best: float
+    median: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{self.size}]"
+
+    def __str__(self) -> str:
+        return f"{self.key:<32} {self.best * 1000:>10.1f}ms {self.median * 1000:>10.1f}ms  ({self.size} {self.unit})"
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(sizes: Sequence[int], quick_sizes: Sequence[int], unit: str):
+    def _decorator(setup: Setup) -> Setup:
+        BENCHMARKS.append(Benchmark(setup.__name__, setup, sizes, quick_sizes, unit))
+        return setup
+
+    return _decorator
+
+
+def _dataframe(rows: int):
+    import numpy as np
+    import pandas as pd
+
+    return pd.DataFrame(
+        {
+            "id": np.arange(rows, dtype=np.int64),
+            "value": np.random.default_rng(0).random(rows),
+            "word": pd.Series(np.arange(rows)).astype(str),
+        }
+    )
+
+
+def _parquet(rows: int) -> bytes:
+    with io.BytesIO() as buf:
+        _dataframe(rows).to_parquet(buf)
+        return buf.getvalue()
+
+
+@benchmark(sizes=[1_000, 10_000], quick_sizes=[50], unit="files")
+def list_files(server: StandInFoundryServer, target: Dataset, size: int):
+    server.state.commit_files(
+        str(target.rid), {f"files/{i:08d}.txt": b"x" for i in range(size)}
+    )
+    target.update_view()
+    return lambda: sum(1 for _ in target.list_files())
+
+
+@benchmark(sizes=[10_000, 100_000], quick_sizes=[50], unit="files")
+def list_files_concurrent(server: StandInFoundryServer, target: Dataset, size: int):
+    server.state.commit_files(
+        str(target.rid), {f"part={i % 16:02d}/{i:08d}.txt": b"x" for i in range(size)}
+    )
+    target.update_view()
+    return lambda: sum(1 for _ in target.list_files(max_workers=8))
+
+
+@benchmark(sizes=[10_000, 100_000], quick_sizes=[50], unit="files")
+def list_files_glob(server: StandInFoundryServer, target: Dataset, size: int):
+    server.state.commit_files(
+        str(target.rid),
+        {f"year={2000 + i % 16}/{i:08d}.parquet": b"x" for i in range(size)},
+    )
+    target.update_view()
+    # two of sixteen partitions are listed, the rest is never requested
+    return lambda: sum(1 for _ in target.list_files(glob="year={2003,2011}/*.parquet"))
+
+
+@benchmark(sizes=[10_000, 100_000], quick_sizes=[50], unit="files")
+def list_files_indexed(server: StandInFoundryServer, target: Dataset, size: int):
+    server.state.commit_files(
+        str(target.rid), {f"files/{i:08d}.txt": b"x" for i in range(size)}
+    )
+    target.update_view()
+    target.client.manifest_index = ManifestIndex(tempfile.mkdtemp())
+    # the first listing indexes the view, which every later listing of it is answered from
+    sum(1 for _ in target.list_files())
+    server.state.commit_files(
+        str(target.rid), {"appended.txt": b"x"}, txn_type="APPEND"
+    )
+    target.update_view()
+    return lambda: sum(1 for _ in target.list_files())
+
+
+@benchmark(sizes=[MEGABYTE, 64 * MEGABYTE], quick_sizes=[1024], unit="bytes")
+def file_read(server: StandInFoundryServer, target: Dataset, size: int):
+    server.state.commit_files(str(target.rid), {"blob.bin": b"0" * size})
+    target.update_view()
+    return lambda: target.file("blob.bin").read().read()
+
+
+@benchmark(sizes=[MEGABYTE, 64 * MEGABYTE], quick_sizes=[1024], unit="bytes")
+def file_read_arrow_buffer(server: StandInFoundryServer, target: Dataset, size: int):
+    server.state.commit_files(str(target.rid), {"blob.bin": b"0" * size})
+    target.update_view()
+    file = next(target.list_files())
+    return file.read_arrow_buffer
+
+
+@benchmark(sizes=[MEGABYTE, 16 * MEGABYTE], quick_sizes=[1024], unit="bytes")
+def put_file(_server: StandInFoundryServer, target: Dataset, size: int):
+    content = b"0" * size
+
+    def _write():
+        with target.start_transaction() as txn:
+            txn.write(f"{uuid.uuid4()}.bin", content)
+
+    return _write
+
+
+@benchmark(sizes=[MEGABYTE, 16 * MEGABYTE], quick_sizes=[4096], unit="bytes")
+def put_file_gzip(_server: StandInFoundryServer, target: Dataset, size: int):
+    target.client.compression = "gzip"
+    content = _dataframe(size // 16).to_csv().encode()[:size]
+
+    def _write():
+        with target.start_transaction() as txn:
+            txn.write(f"{uuid.uuid4()}.csv", content)
+
+    return _write
+
+
+@benchmark(sizes=[128 * MEGABYTE], quick_sizes=[51 * MEGABYTE], unit="bytes")
+def put_file_chunked(server: StandInFoundryServer, target: Dataset, size: int):
+    return put_file(server, target, size)
+
+
+@benchmark(sizes=[1_000, 10_000], quick_sizes=[50], unit="files")
+def write_many(_server: StandInFoundryServer, target: Dataset, size: int):
+    def _write():
+        prefix = uuid.uuid4()
+        with target.start_transaction() as txn:
+            txn.write_many(
+                {f"{prefix}/{i:08d}.txt": b"x" for i in range(size)},
+                max_workers=16,
+            )
+
+    return _write
+
+
+@benchmark(sizes=[10_000, 1_000_000], quick_sizes=[100], unit="rows")
+def read_arrow(server: StandInFoundryServer, target: Dataset, size: int):
+    server.state.commit_files(str(target.rid), {"dataframe.parquet": _parquet(size)})
+    target.update_view()
+    return target.read_arrow
+
+
+@benchmark(sizes=[10_000, 1_000_000], quick_sizes=[100], unit="rows")
+def write_pandas(_server: StandInFoundryServer, target: Dataset, size: int):
+    df = _dataframe(size)
+    return lambda: target.write_pandas(df)
+
+
+@benchmark(sizes=[1_000_000], quick_sizes=[20_000], unit="rows")
+def write_pandas_pipelined(_server: StandInFoundryServer, target: Dataset, size: int):
+    df = _dataframe(size)
+    # about eight chunks, so that encoding and uploading overlap
+    target.client.chunk_sizer = ChunkSizer(
+        initial_chunk_size=int(df.memory_usage().sum()) // 8
+    )
+    return lambda: target.write_pandas(df)
+
+
+@benchmark(sizes=[1], quick_sizes=[1], unit="imports")
+def import_dataset(_server: StandInFoundryServer, _ds: Dataset, _size: int):
+    # a cold start, as paid by short-lived cli tools and serverless functions
+    return lambda: subprocess.run(
+        [sys.executable, "-c", "from palantir.datasets import dataset"], check=True
+    )
+
+
+def run(
+    server: StandInFoundryServer,
+    repeat: int = 3,
+    quick: bool = False,
+    name_filter: Optional[str] = None,
+    report: Callable[[BenchmarkResult], None] = print,
+) -> List[BenchmarkResult]:
+    results = []
+    for bench in BENCHMARKS:
+        if name_filter and name_filter not in bench.name:
+            continue
+        for size in bench.quick_sizes if quick else bench.sizes:
+            target = dataset(
+                f"/benchmarks/{bench.name}/{uuid.uuid4()}",
+                create=True,
+                ctx=server.context(),
+            )
+            operation = bench.setup(server, target, size)
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                operation()
+                timings.append(time.perf_counter() - start)
+            result = BenchmarkResult(
+                bench.name, size, bench.unit, min(timings), statistics.median(timings)
+            )
+            report(result)
+            results.append(result)
+    return results
+
+
+def regressions(
+    results: Sequence[BenchmarkResult], baseline: Dict[str, float], tolerance: float
+) -> List[str]:
+    """Returns a description of each result that is slower than its baseline by more than the tolerance."""
+    return [
+        f"{result.key}: {result.best:.4f}s exceeds baseline {baseline[result.key]:.4f}s by more than {tolerance:.0%}"
+        for result in results
+        if result.key in baseline
+        and result.best > baseline[result.key] * (1 + tolerance)
+    ]
@@ -0,0 +1 @@
+__version__ = "9a93768"
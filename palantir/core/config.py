@@ -18,8 +18,6 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import NewType, Optional
 
-import tomli
-
 AuthToken = NewType("AuthToken", str)  # TODO(ahiggins): is a custom type worth it?
 
 
@@ -35,6 +33,8 @@ class ConfigLoader:
         self.path = path or Path.home() / ".palantir" / "config"
 
     def load_config(self) -> Config:
+        import tomli
+
         with open(self.path, "rb") as file:
             raw_config = tomli.load(file).get(self.namespace)
             if raw_config is None:
@@ -12,12 +12,18 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import functools
+
 from conjure_python_client import RequestsClient, ServiceConfiguration, Service
-from typing import TypeVar, Type, Any
+from requests import PreparedRequest, Session
+from requests.adapters import BaseAdapter
+from typing import TypeVar, Type, Any, List, cast
 from palantir._version import __version__
+from palantir.core import tracing
 
 ServiceT = TypeVar("ServiceT", bound=Service)
 USER_AGENT = [("palantir-python-sdk", __version__)]
+_SPAN_ATTRIBUTES = ("dataset_rid", "transaction_rid", "logical_path")
 
 
 def get_user_agent() -> str:
@@ -28,7 +34,70 @@ class ConjureClient:
     def service(self, service: Type[ServiceT], uri: str) -> ServiceT:
         config = ServiceConfiguration()
         config.uris = [uri]
-        return RequestsClient.create(service, get_user_agent(), config)
+        client = RequestsClient.create(
+            cast(Type[ServiceT], functools.partial(_create_service, service)),
+            get_user_agent(),
+            config,
+        )
+        return cast(ServiceT, _TracedService(client))
+
+
+def _create_service(
+    service: Type[ServiceT], session: Session, uris: List[str], *args: Any
+) -> ServiceT:
+    # conjure passes the session it configured to the constructor of the service, whose adapters are wrapped so that
+    # the context of the span of each rpc is written into its headers
+    for uri in uris:
+        session.mount(uri, _TraceHeadersAdapter(session.get_adapter(uri)))
+    return service(session, uris, *args)
+
+
+class _TraceHeadersAdapter(BaseAdapter):
+    """Writes the context of the current span into the headers of each request sent through the wrapped adapter."""
+
+    def __init__(self, adapter: BaseAdapter):
+        super().__init__()
+        self._adapter = adapter
+
+    def send(self, request: PreparedRequest, *args, **kwargs):
+        _inject_trace_headers(request)
+        return self._adapter.send(request, *args, **kwargs)
+
+    def close(self) -> None:
+        self._adapter.close()
+
+
+class _TracedService:
+    """Records each rpc made through the wrapped conjure service as a span."""
+
+    def __init__(self, service: Service):
+        self._service = service
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._service, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+        span_name = f"{type(self._service).__name__}.{name}"
+
+        @functools.wraps(attr)
+        def traced_rpc(*args, **kwargs):
+            attributes = {
+                f"palantir.{key}": str(kwargs[key])
+                for key in _SPAN_ATTRIBUTES
+                if kwargs.get(key) is not None
+            }
+            with tracing.span(span_name, attributes):
+                return attr(*args, **kwargs)
+
+        return traced_rpc
+
+    def __repr__(self) -> str:
+        return repr(self._service)
+
+
+def _inject_trace_headers(request: PreparedRequest) -> PreparedRequest:
+    tracing.inject_headers(request.headers)
+    return request
 
 
 def _is_collection(arg: Any, item_type: Type = object) -> bool:
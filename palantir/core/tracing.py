@@ -0,0 +1,154 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import contextlib
+import contextvars
+import functools
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Generator,
+    Iterable,
+    MutableMapping,
+    Optional,
+    Protocol,
+    TypeVar,
+    cast,
+)
+
+FuncT = TypeVar("FuncT", bound=Callable[..., Any])
+T = TypeVar("T")
+HeaderInjector = Callable[[MutableMapping[str, str]], None]
+
+
+class Tracer(Protocol):
+    """
+    The subset of the OpenTelemetry ``Tracer`` API used by the SDK. An ``opentelemetry.trace.Tracer`` satisfies this
+    protocol and can be passed to :func:`set_tracer` directly.
+    """
+
+    def start_as_current_span(
+        self,
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        end_on_exit: bool = True,
+    ) -> ContextManager[Any]:
+        ...
+
+
+class NoOpTracer:
+    def start_as_current_span(self, *_args, **_kwargs) -> ContextManager[Any]:
+        return contextlib.nullcontext()
+
+
+_tracer: Tracer = NoOpTracer()
+_inject: Optional[HeaderInjector] = None
+
+
+def set_tracer(tracer: Optional[Tracer], inject: HeaderInjector = None) -> None:
+    """
+    Enables tracing of SDK operations. High level :class:`Dataset`, :class:`File` and :class:`Transaction` methods are
+    recorded as spans, with a child span for each remote call they make. Tracing is disabled by default.
+
+    Args:
+        tracer: An OpenTelemetry compatible tracer, or None to disable tracing.
+        inject: A function that writes the context of the current span into a mutable mapping of request headers.
+            Defaults to `opentelemetry.propagate.inject` when OpenTelemetry is installed, e.g. through the
+            `opentelemetry` extra of this package.
+
+    Examples:
+        >>> from opentelemetry import trace
+        >>> from palantir.core.tracing import set_tracer
+        >>> set_tracer(trace.get_tracer("my-pipeline"))
+    """
+    global _tracer, _inject  # pylint: disable=global-statement
+    if tracer is None:
+        _tracer, _inject = NoOpTracer(), None
+        return
+    if inject is None:
+        try:
+            import opentelemetry.propagate as propagate
+
+            inject = propagate.inject
+        except ImportError:
+            pass
+    _tracer, _inject = tracer, inject
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def span(
+    name: str, attributes: Dict[str, Any] = None, end_on_exit: bool = True
+) -> ContextManager[Any]:
+    """
+    Returns a context manager that records a span as a child of the current span.
+
+    Args:
+        name: The name of the span.
+        attributes: Optional attributes of the span.
+        end_on_exit: Whether the span ends when the context manager exits. Otherwise, the span is only current within
+            the context manager and is ended by passing it to :func:`end`, e.g. once a stream it covers is closed.
+    """
+    return _tracer.start_as_current_span(
+        name, attributes=attributes, end_on_exit=end_on_exit
+    )
+
+
+def end(current_span: Any) -> None:
+    """Ends a span entered with `end_on_exit=False`."""
+    if current_span is not None:
+        current_span.end()
+
+
+def traced_iter(name: str, iterable: Iterable[T]) -> Generator[T, None, None]:
+    """
+    Records a span that lasts until the iterable is exhausted or the returned generator is closed, so that it covers
+    the remote calls made lazily while iterating, e.g. the pages of a listing.
+    """
+    with span(name):
+        yield from iterable
+
+
+def inject_headers(headers: MutableMapping[str, str]) -> None:
+    """Writes the context of the current span into the provided request headers."""
+    if _inject is not None:
+        _inject(headers)
+
+
+def in_current_context(func: Callable[..., T]) -> Callable[..., T]:
+    """
+    Returns: A callable that runs the function in a copy of the current context, e.g. when submitted to an executor, so
+    that the spans it records on a worker thread are children of the current span.
+    """
+    ctx = contextvars.copy_context()
+
+    def run(*args, **kwargs) -> T:
+        return ctx.run(func, *args, **kwargs)
+
+    return run
+
+
+def traced(func: FuncT) -> FuncT:
+    """Records each call to the decorated function as a span named after its qualified name."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with span(func.__qualname__):
+            return func(*args, **kwargs)
+
+    return cast(FuncT, wrapper)
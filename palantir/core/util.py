@@ -12,9 +12,13 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import contextlib
+import os
+import uuid
 from dataclasses import fields
+from pathlib import Path
 
-from typing import Any, Dict
+from typing import IO, Any, Dict, Iterator, Union
 
 
 def dataclass_from_dict(klass: Any, dikt: Dict[str, Any]):
@@ -59,3 +63,26 @@ def page_results(values_extractor, token_extractor, page_supplier, page_token=No
                 yield value
 
     return process_page(page_supplier(page_token))
+
+
+@contextlib.contextmanager
+def atomic_write(
+    path: Union[str, "os.PathLike[str]"], mode: str = "wb", encoding: str = None
+) -> Iterator[IO[Any]]:
+    """
+    Opens a temporary file next to a path for writing, which replaces the path once the block completes, so that an
+    interrupted write never leaves a partial file at the path. The temporary file is removed if the block raises.
+
+    Examples:
+        >>> with atomic_write("checkpoint", "w", encoding="utf-8") as file:
+        ...     file.write("content")
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4()}")
+    try:
+        with open(tmp, mode, encoding=encoding) as file:
+            yield file
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
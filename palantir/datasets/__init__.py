@@ -12,4 +12,19 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
-from .functions import dataset
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .functions import dataset
+
+__all__ = ["dataset"]
+
+
+def __getattr__(name: str) -> Any:
+    # `dataset` loads the client and rpc bindings, which are only imported on first use so that importing
+    # lightweight modules such as `palantir.datasets.types` stays cheap
+    if name == "dataset":
+        from .functions import dataset  # pylint: disable=redefined-outer-name
+
+        return dataset
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,64 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import os
+import shutil
+from pathlib import Path
+from typing import TYPE_CHECKING, Union
+from urllib.parse import quote
+
+from palantir.core.util import atomic_write
+
+if TYPE_CHECKING:
+    from palantir.datasets.core import File
+
+
+class FileCache:
+    """
+    Local copies of Dataset files, used by :meth:`palantir.datasets.core.Dataset.query_local`. The content of a file
+    written by a transaction never changes, so entries are keyed by the dataset, the transaction and the logical path
+    and are never invalidated. The cache is safe to share between threads and processes.
+    """
+
+    def __init__(self, root: Union[str, "os.PathLike[str]"] = None):
+        self.root = (
+            Path(root) if root else Path.home() / ".palantir" / "cache" / "datasets"
+        )
+
+    def path(self, file: "File") -> Path:
+        """Returns: The location of the file in the cache, whether or not it has been downloaded."""
+        if file.transaction_rid is None:
+            raise ValueError(
+                f"cannot cache '{file.path}' without the transaction that wrote it"
+            )
+        return (
+            self.root
+            / str(file.dataset.rid)
+            / str(file.transaction_rid)
+            / quote(file.path, safe="")
+        )
+
+    def get(self, file: "File") -> Path:
+        """
+        Downloads the file into the cache unless it is already there. The download is written to a temporary file and
+        moved into place, so that an interrupted download never leaves a partial entry.
+
+        Returns: The location of the file in the cache.
+        """
+        path = self.path(file)
+        if path.exists():
+            return path
+        with file.read() as source, atomic_write(path) as target:
+            shutil.copyfileobj(source, target)
+        return path
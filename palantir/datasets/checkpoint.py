@@ -0,0 +1,57 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+from palantir.core.types import ResourceIdentifier
+from palantir.core.util import atomic_write
+
+
+class FileCheckpoint:
+    """
+    Persists the last transaction read by an incremental consumer of a Dataset in a local file, for use with
+    :meth:`palantir.datasets.core.Dataset.read_arrow_since` and
+    :meth:`palantir.datasets.core.Dataset.list_files_since`.
+
+    Examples:
+        >>> checkpoint = FileCheckpoint("consumer.checkpoint")
+        >>> ds.update_view()
+        >>> table = ds.read_arrow_since(checkpoint.load())
+        >>> checkpoint.save(ds.view[1])
+    """
+
+    def __init__(self, path: Union[str, "os.PathLike[str]"]):
+        self.path = Path(path)
+
+    def load(self) -> Optional[ResourceIdentifier]:
+        """Returns: The saved transaction rid, or `None` if no checkpoint has been saved yet."""
+        try:
+            content = self.path.read_text(encoding="utf-8").strip()
+        except FileNotFoundError:
+            return None
+        return ResourceIdentifier.from_string(content) if content else None
+
+    def save(self, transaction_rid: Optional[Union[str, ResourceIdentifier]]) -> None:
+        """
+        Saves the transaction rid, replacing the file atomically so that a crash never leaves a partial checkpoint.
+
+        Args:
+            transaction_rid: The last transaction that was read. Nothing is saved if `None`, i.e. the view was empty.
+        """
+        if transaction_rid is None:
+            return
+        with atomic_write(self.path, "w", encoding="utf-8") as file:
+            file.write(str(transaction_rid))
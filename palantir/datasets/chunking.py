@@ -0,0 +1,92 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import math
+import threading
+from typing import Optional
+
+MEGABYTE = 1024 * 1024
+
+
+class ChunkSizer:
+    """
+    Chooses the size of the chunks that large files are uploaded in, from the upload throughput measured so far, the
+    size of the file and a memory budget. Files smaller than the chunk size are uploaded in a single request.
+
+    Each chunk is sized to take about `target_seconds` to upload, so that on fast links the overhead of each request
+    and of concatenating the chunks is amortized over larger chunks, and on slow links a failed chunk loses less. Until
+    an upload has been measured, the chunk size is `initial_chunk_size`. A sizer is safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        initial_chunk_size: int = 50 * MEGABYTE,
+        min_chunk_size: int = 8 * MEGABYTE,
+        max_chunk_size: int = 1024 * MEGABYTE,
+        target_seconds: float = 10.0,
+        max_chunks: int = 1000,
+        memory_budget: Optional[int] = None,
+    ):
+        """
+        Args:
+            initial_chunk_size: The chunk size until the throughput has been measured.
+            min_chunk_size: The smallest chunk size chosen from the throughput. Uploads smaller than this are not
+                measured, since their duration is mostly the latency of the request.
+            max_chunk_size: The largest chunk size chosen from the throughput.
+            target_seconds: The time each chunk should take to upload at the measured throughput.
+            max_chunks: The maximum number of chunks a file is split into, which takes precedence over
+                `max_chunk_size`, so that concatenation stays cheap.
+            memory_budget: An optional limit on the size of a chunk, each of which is copied in memory while it is
+                uploaded. Takes precedence over all other limits.
+        """
+        self.initial_chunk_size = initial_chunk_size
+        self.min_chunk_size = min_chunk_size
+        self.max_chunk_size = max_chunk_size
+        self.target_seconds = target_seconds
+        self.max_chunks = max_chunks
+        self.memory_budget = memory_budget
+        self._throughput: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def throughput(self) -> Optional[float]:
+        """The measured upload throughput in bytes per second, or None if no upload has been measured yet."""
+        return self._throughput
+
+    def record(self, num_bytes: int, seconds: float) -> None:
+        """Records the duration of an upload, updating a moving average of the throughput."""
+        if num_bytes < self.min_chunk_size or seconds <= 0:
+            return
+        throughput = num_bytes / seconds
+        with self._lock:
+            self._throughput = (
+                throughput
+                if self._throughput is None
+                else 0.7 * self._throughput + 0.3 * throughput
+            )
+
+    def chunk_size(self, file_size: int) -> int:
+        """Returns: The size of the chunks to upload a file of the given size in."""
+        throughput = self._throughput
+        if throughput is None:
+            size = self.initial_chunk_size
+        else:
+            size = min(
+                max(int(throughput * self.target_seconds), self.min_chunk_size),
+                self.max_chunk_size,
+            )
+        size = max(size, math.ceil(file_size / self.max_chunks))
+        if self.memory_budget is not None:
+            size = min(size, self.memory_budget)
+        return max(size, 1)
@@ -12,18 +12,47 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import functools
+import hashlib
 import io
+import itertools
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from os.path import relpath
-from time import sleep
-from typing import TYPE_CHECKING, Generator, Optional, Tuple, Any, Union, Dict
-
-from dateutil.parser import isoparse
+from time import monotonic, sleep
+from typing import (
+    TYPE_CHECKING,
+    Generator,
+    Iterable,
+    Optional,
+    Set,
+    Tuple,
+    Any,
+    Union,
+    Dict,
+    List,
+    Sequence,
+    cast,
+)
 
 import palantir
-from palantir.core.rpc import ConjureClient
+from palantir.core import tracing
 from palantir.core.types import PalantirContext, ResourceIdentifier
 from palantir.core.util import page_results
+from palantir.datasets.chunking import ChunkSizer
+from palantir.datasets.conjure_schema import from_conjure_schema, to_conjure_schema
+from palantir.datasets.compression import (
+    CompressedContent,
+    accept_encoding,
+    is_compressible,
+    validate_encoding,
+)
+from palantir.datasets.journal import JournalEntry, UploadJournal
+from palantir.datasets.listing import list_pages, list_shards
+from palantir.datasets.manifest import ManifestIndex
+from palantir.datasets.patterns import catalog_order
 from palantir.datasets.rpc.catalog import (
+    AddFilesToDeleteTransactionRequest,
     CatalogService,
     Transaction as ConjureTransaction,
     StartTransactionRequest,
@@ -33,6 +62,8 @@ from palantir.datasets.rpc.catalog import (
     Dataset as ConjureDataset,
     CreateDatasetRequest,
     CreateBranchRequest,
+    FileResource,
+    FileResourcesPage,
 )
 from palantir.datasets.rpc.data_proxy import (
     DataProxyService,
@@ -46,12 +77,7 @@ from palantir.datasets.rpc.data_proxy import (
     DataProxyConcatenationService,
 )
 from palantir.datasets.rpc.path import PathService, DecoratedResource
-from palantir.datasets.rpc.schema import (
-    FoundrySchema as ConjureFoundrySchema,
-    SchemaService,
-    FoundryFieldSchema,
-    FoundryFieldType,
-)
+from palantir.datasets.rpc.schema import SchemaService
 from palantir.datasets.rpc.sql import (
     SqlQueryService,
     SqlDialect,
@@ -60,28 +86,12 @@ from palantir.datasets.rpc.sql import (
     SqlQuery,
     QueryStatusVisitor,
 )
+from palantir.datasets.services import LOCAL_SCHEME, DatasetServices
 from palantir.datasets.types import (
     FileLocator,
     DatasetLocator,
     TransactionType,
     TransactionStatus,
-    FileFormat,
-    FieldType,
-    DecimalFieldType,
-    ArrayFieldType,
-    MapFieldType,
-    StructFieldType,
-    BinaryFieldType,
-    BooleanFieldType,
-    ByteFieldType,
-    DateFieldType,
-    DoubleFieldType,
-    FloatFieldType,
-    IntegerFieldType,
-    LongFieldType,
-    ShortFieldType,
-    StringFieldType,
-    TimestampFieldType,
     FoundrySchema,
 )
 
@@ -90,61 +100,72 @@ if TYPE_CHECKING:
     import pyarrow as pa
 
 
+def _skip(stream: io.IOBase, num_bytes: int) -> None:
+    while num_bytes:
+        skipped = len(stream.read(min(num_bytes, 1024 * 1024)))
+        if not skipped:
+            raise EOFError(f"stream ended {num_bytes} bytes before the requested range")
+        num_bytes -= skipped
+
+
 def _chunk(content, chunk_size):
     for offset in range(0, len(content), chunk_size):
         yield content[offset : offset + chunk_size]
 
 
-class DatasetServices:
-    def __init__(self, ctx: PalantirContext):
-        self.factory = ConjureClient()
-        self.ctx = ctx
-
-    @property
-    def catalog_service(self) -> CatalogService:
-        return self.factory.service(
-            CatalogService,
-            f"https://{self.ctx.hostname}/foundry-catalog/api",
-        )
-
-    @property
-    def data_proxy_service(self) -> DataProxyService:
-        return self.factory.service(
-            DataProxyService,
-            f"https://{self.ctx.hostname}/foundry-data-proxy/api",
-        )
-
-    @property
-    def data_proxy_concatenation_service(self) -> DataProxyConcatenationService:
-        return self.factory.service(
-            DataProxyConcatenationService,
-            f"https://{self.ctx.hostname}/foundry-data-proxy/api",
-        )
-
-    @property
-    def path_service(self) -> PathService:
-        return self.factory.service(
-            PathService, f"https://{self.ctx.hostname}/compass/api"
-        )
-
-    @property
-    def schema_service(self) -> SchemaService:
-        return self.factory.service(
-            SchemaService, f"https://{self.ctx.hostname}/foundry-metadata/api"
-        )
+def dataset_services(ctx: PalantirContext) -> DatasetServices:
+    """
+    Returns the services for the context's hostname, a `file://` uri selects a
+    :class:`palantir.datasets.local.LocalDatasetServices` rooted at its path.
+    """
+    hostname = ctx.hostname
+    if hostname.startswith(LOCAL_SCHEME):
+        from palantir.datasets.local import LocalDatasetServices
 
-    @property
-    def sql_query_service(self) -> SqlQueryService:
-        return self.factory.service(
-            SqlQueryService,
-            f"https://{self.ctx.hostname}/foundry-sql-server/api",
-        )
+        return LocalDatasetServices(hostname[len(LOCAL_SCHEME) :])
+    return DatasetServices(ctx)
 
 
 class DatasetsClient:
-    def __init__(self, services: DatasetServices):
+    """
+    Performs dataset operations against the Foundry services. A client holds no per-operation state and is safe to
+    share between threads, which then also share its connection pools and its cache of schemas.
+    """
+
+    def __init__(
+        self,
+        services: DatasetServices,
+        compression: Optional[str] = None,
+        upload_journal: Optional[UploadJournal] = None,
+        chunk_sizer: Optional[ChunkSizer] = None,
+        manifest_index: Optional[ManifestIndex] = None,
+    ):
+        """
+        Args:
+            services: The services to perform operations against.
+            compression: An optional transfer compression, "gzip" or "zstd", for uploads of files that are not already
+                compressed, e.g. csv or json but not parquet. Downloads then also accept any encoding that can be
+                decoded. Uploads are not negotiated: they are sent compressed without checking that the Foundry stack
+                accepts the encoding, so only enable compression against stacks known to decode compressed uploads.
+                "zstd" requires the `zstd` extra of this package.
+            upload_journal: An optional journal of the chunks of large files uploaded to open transactions, so that an
+                interrupted upload only sends the missing chunks when it is retried, see :class:`UploadJournal`.
+            chunk_sizer: Chooses the size of the chunks large files are uploaded in, by default a
+                :class:`ChunkSizer` adapting to the measured throughput from an initial 50 MB.
+            manifest_index: An optional local index of the files in the views of datasets, so that listing a view
+                again only requests the files written since it was last listed, see :class:`ManifestIndex`.
+        """
+        if compression is not None:
+            validate_encoding(compression)
         self.services = services
         self.ctx = services.ctx
+        self.compression = compression
+        self.upload_journal = upload_journal
+        self.chunk_sizer = chunk_sizer or ChunkSizer()
+        self.manifest_index = manifest_index
+        # the schema of a view ending at a transaction only changes if it is put again, which invalidates the entry
+        self._schemas: Dict[Tuple[str, str, str], Optional[FoundrySchema]] = {}
+        self._schemas_lock = threading.Lock()
 
     @property
     def _catalog_service(self) -> CatalogService:
@@ -239,49 +260,200 @@ class DatasetsClient:
         dataset: "Dataset",
         path: str = None,
         include_open_transaction: bool = False,
-        page_size: int = 100,
+        page_size: int = None,
+        start_transaction_rid: ResourceIdentifier = None,
+        max_workers: int = 1,
+        shards: Sequence[str] = None,
+        prefixes: Sequence[str] = None,
     ) -> Generator["File", None, None]:
-        if dataset.locator.end_transaction_rid is None:
-            return
-        for file in page_results(
-            values_extractor=lambda page: page.values,
-            token_extractor=lambda page: page.next_page_token,
-            page_supplier=lambda next_page_token: self._catalog_service.get_dataset_view_files2(
-                auth_header=self.ctx.auth_token,
-                dataset_rid=str(dataset.rid),
-                start_transaction_rid=str(dataset.locator.start_transaction_rid)
-                if dataset.locator.start_transaction_rid
-                else None,
-                end_ref=str(dataset.locator.end_transaction_rid)
-                if dataset.locator.end_transaction_rid is not None
-                else dataset.locator.branch_id
-                if dataset.locator.branch_id
-                else "master",
-                logical_path=None if path is None else relpath(path),
-                include_open_exclusive_transaction=include_open_transaction,
-                page_size=page_size,
-                page_start_logical_path=next_page_token,
-                exclude_hidden_files=True,
-            ),
+        """
+        Lists the files in the view of the Dataset.
+
+        Args:
+            dataset: The Dataset whose view to list.
+            path: An optional path prefix to use to filter when listing files.
+            include_open_transaction: Whether to include the files of the open transaction.
+            page_size: The number of files requested at a time. By default, pages start small so that the first files
+                arrive quickly, and grow up to the largest page the catalog serves while pages are served quickly.
+            start_transaction_rid: An optional transaction to narrow the start of the view to.
+            max_workers: The number of pages requested concurrently. If more than one, the logical paths are split
+                into shards which are listed concurrently, and files are yielded as pages arrive rather than in path
+                order.
+            shards: Logical paths at which to split the listing into shards, by default discovered from the paths
+                in the view, e.g. the partitions of a partitioned layout. Only used if `max_workers` is more than one.
+            prefixes: Several path prefixes to list instead of `path`, none of which is a prefix of another, e.g. the
+                alternatives of a brace pattern. If listed concurrently, each prefix is listed as a shard of its own.
+
+        Returns: A generator over :class:`File` objects, in path order unless listed concurrently.
+        """
+        logical_paths = (
+            [relpath(path) if path else None]
+            if prefixes is None
+            else [prefix or None for prefix in sorted(prefixes, key=catalog_order)]
+        )
+        if (
+            self.manifest_index is not None
+            and not include_open_transaction
+            and start_transaction_rid is None
+            and dataset.locator.end_transaction_rid is not None
         ):
-            yield palantir.datasets.core.File(
-                dataset=dataset,
-                path=file.logical_path,
-                modified=isoparse(file.time_modified),
-                transaction_rid=ResourceIdentifier.from_string(file.transaction_rid),
-                length=file.file_metadata.length
-                if file.file_metadata is not None
-                else None,
-                client=self,
+            return self._list_indexed_files(
+                dataset, self.manifest_index, logical_paths, max_workers, shards
             )
+        # all pages are listed from the view at the time of the call, even if the dataset's view is updated meanwhile
+        return self._list_files(
+            dataset,
+            dataset.locator.with_updated(start_transaction_rid=start_transaction_rid),
+            logical_paths,
+            include_open_transaction,
+            page_size,
+            max_workers,
+            shards,
+        )
 
-    def read_file(self, locator: FileLocator) -> io.IOBase:
+    def _list_indexed_files(
+        self,
+        dataset: "Dataset",
+        index: ManifestIndex,
+        logical_paths: Sequence[Optional[str]],
+        max_workers: int,
+        shards: Optional[Sequence[str]],
+    ) -> Generator["File", None, None]:
+        locator = dataset.locator
+        indexed = index.end_transaction_rids(locator)
+        if str(locator.end_transaction_rid) not in indexed:
+            since = self._transactions_since(dataset, locator, indexed)
+            # the files written by the oldest new transaction onwards, none of which deleted any files
+            if since is None or not index.update(
+                locator,
+                since[0],
+                self._list_files(
+                    dataset,
+                    locator.with_updated(start_transaction_rid=since[1][-1].rid),
+                    max_workers=max_workers,
+                    shards=shards,
+                ),
+            ):
+                index.replace(
+                    locator,
+                    self._list_files(
+                        dataset, locator, max_workers=max_workers, shards=shards
+                    ),
+                )
+        for logical_path in logical_paths:
+            files = index.files(dataset, locator, logical_path)
+            # the view was evicted by another process meanwhile
+            yield from files if files is not None else self._list_files(
+                dataset, locator, [logical_path]
+            )
+
+    def _transactions_since(
+        self, dataset: "Dataset", locator: DatasetLocator, indexed: Set[str]
+    ) -> Optional[Tuple[str, List["Transaction"]]]:
+        """
+        Returns: The latest indexed end transaction the view's end descends from, with the transactions committed after
+        it up to the end of the view, newest first, or `None` if the files in the view cannot be derived from those
+        of an indexed view and the files the transactions wrote.
+        """
+        if not indexed:
+            return None
+        transactions: List["Transaction"] = []
+        for txn in self.list_transactions(dataset, locator.end_transaction_rid):
+            if str(txn.rid) in indexed:
+                return str(txn.rid), transactions
+            if (
+                txn.txn_type in (TransactionType.DELETE, TransactionType.SNAPSHOT)
+                or txn.rid == locator.start_transaction_rid
+            ):
+                return None
+            transactions.append(txn)
+        return None
+
+    def _list_files(
+        self,
+        dataset: "Dataset",
+        locator: DatasetLocator,
+        logical_paths: Sequence[Optional[str]] = (None,),
+        include_open_transaction: bool = False,
+        page_size: int = None,
+        max_workers: int = 1,
+        shards: Sequence[str] = None,
+    ) -> Generator["File", None, None]:
+        if locator.end_transaction_rid is None:
+            return
+        list_page = functools.partial(
+            self._list_page, locator, include_open_transaction
+        )
+        files = (
+            list_shards(list_page, logical_paths, page_size, max_workers, shards)
+            if max_workers > 1
+            else list_pages(list_page, logical_paths, page_size)
+        )
+        for file in files:
+            yield self._file(dataset, file)
+
+    def _list_page(
+        self,
+        locator: DatasetLocator,
+        include_open_transaction: bool,
+        logical_path: Optional[str],
+        page_size: int,
+        page_start: Optional[str],
+    ) -> Tuple[FileResourcesPage, float]:
+        """Returns: A page of the files in the view, and the seconds it took to be served."""
+        start = monotonic()
+        page = self._catalog_service.get_dataset_view_files2(
+            auth_header=self.ctx.auth_token,
+            dataset_rid=str(locator.rid),
+            start_transaction_rid=str(locator.start_transaction_rid)
+            if locator.start_transaction_rid
+            else None,
+            end_ref=str(locator.end_transaction_rid),
+            logical_path=logical_path,
+            include_open_exclusive_transaction=include_open_transaction,
+            page_size=page_size,
+            page_start_logical_path=page_start,
+            exclude_hidden_files=True,
+        )
+        return page, monotonic() - start
+
+    def _file(self, dataset: "Dataset", file: FileResource) -> "File":
+        from dateutil.parser import isoparse
+
+        return palantir.datasets.core.File(
+            dataset=dataset,
+            path=file.logical_path,
+            modified=isoparse(file.time_modified),
+            transaction_rid=ResourceIdentifier.from_string(file.transaction_rid),
+            length=file.file_metadata.length
+            if file.file_metadata is not None
+            else None,
+            client=self,
+        )
+
+    def read_file(self, locator: FileLocator, offset: int = 0) -> io.IOBase:
+        if offset:
+            # a range of an encoded response is a range of the encoded bytes, so ranges are requested unencoded
+            stream = self._data_proxy_service.get_file_in_view(
+                auth_header=self.ctx.auth_token,
+                dataset_rid=str(locator.dataset_rid),
+                end_ref=locator.end_ref,
+                logical_path=relpath(locator.logical_path),
+                start_transaction_rid=locator.start_transaction_rid,
+                accept_encoding="identity",
+                byte_range=f"bytes={offset}-",
+            )
+            if getattr(stream, "status", 206) == 200:
+                # the range was ignored and the full content sent
+                _skip(stream, offset)
+            return stream
         return self._data_proxy_service.get_file_in_view(
             auth_header=self.ctx.auth_token,
             dataset_rid=str(locator.dataset_rid),
             end_ref=locator.end_ref,
             logical_path=relpath(locator.logical_path),
             start_transaction_rid=locator.start_transaction_rid,
+            **({"accept_encoding": accept_encoding()} if self.compression else {}),
         )
 
     def start_transaction(
@@ -315,7 +487,7 @@ class DatasetsClient:
             auth_header=self.ctx.auth_token,
             dataset_rid=str(txn.dataset.rid),
             transaction_rid=str(txn.rid),
-            request=CloseTransactionRequest(record={}),
+            request=CloseTransactionRequest(record=txn.record),
         )
 
     def abort_transaction(self, txn: "Transaction") -> None:
@@ -326,10 +498,67 @@ class DatasetsClient:
             request=CloseTransactionRequest(record={}),
         )
 
-    def put_schema(self, dataset: "Dataset", schema: FoundrySchema) -> None:
-        data_frame_reader_class, dataset_format = _get_data_frame_reader_class(
-            schema.format
+    def get_transaction(
+        self, dataset: "Dataset", transaction_rid: ResourceIdentifier
+    ) -> "Transaction":
+        txn: ConjureTransaction = self._catalog_service.get_transaction(
+            auth_header=self.ctx.auth_token,
+            dataset_rid=str(dataset.rid),
+            transaction_rid=str(transaction_rid),
         )
+        return self._transaction(dataset, txn)
+
+    def list_transactions(
+        self,
+        dataset: "Dataset",
+        end_ref: Union[str, ResourceIdentifier] = None,
+        page_size: int = 100,
+    ) -> Generator["Transaction", None, None]:
+        """
+        Lists the committed transactions of a branch of the Dataset, newest first.
+
+        Args:
+            dataset: The Dataset whose transactions to list.
+            end_ref: The transaction to list from, by default the head of the branch of the Dataset.
+            page_size: The number of transactions requested at a time.
+
+        Returns: A generator over the :class:`Transaction` objects up to and including the end ref.
+        """
+        end_ref = end_ref or dataset.branch or "master"
+        for txn in page_results(
+            values_extractor=lambda page: page.values,
+            token_extractor=lambda page: page.next_page_token,
+            page_supplier=lambda next_page_token: self._catalog_service.get_reverse_transactions2(
+                auth_header=self.ctx.auth_token,
+                dataset_rid=str(dataset.rid),
+                end_ref=str(end_ref),
+                page_size=page_size,
+                page_start_transaction_rid=next_page_token,
+            ),
+        ):
+            yield self._transaction(dataset, txn)
+
+    def _transaction(
+        self, dataset: "Dataset", txn: ConjureTransaction
+    ) -> "Transaction":
+        return palantir.datasets.core.Transaction(
+            dataset=dataset,
+            rid=ResourceIdentifier.from_string(txn.rid),
+            status=TransactionStatus(txn.status.value),
+            txn_type=TransactionType(txn.type.value),
+            client=self,
+            record=txn.record,
+        )
+
+    def delete_files(self, txn: "Transaction", paths: List[str]) -> None:
+        self._catalog_service.add_files_to_delete_transaction(
+            auth_header=self.ctx.auth_token,
+            dataset_rid=str(txn.dataset.rid),
+            transaction_rid=str(txn.rid),
+            request=AddFilesToDeleteTransactionRequest(logical_paths=paths),
+        )
+
+    def put_schema(self, dataset: "Dataset", schema: FoundrySchema) -> None:
         self._schema_service.put_schema(
             auth_header=self.ctx.auth_token,
             dataset_rid=str(dataset.rid),
@@ -337,54 +566,144 @@ class DatasetsClient:
             end_transaction_rid=str(dataset.locator.end_transaction_rid)
             if dataset.locator.end_transaction_rid
             else None,
-            schema=ConjureFoundrySchema(
-                field_schema_list=[
-                    _get_conjure_field_schema(
-                        field.type, field.name, field.nullable, field.metadata
-                    )
-                    for field in schema.fields
-                ],
-                data_frame_reader_class=data_frame_reader_class,
-                custom_metadata=_prune_absent_values(
-                    dict(
-                        {} if schema.metadata is None else schema.metadata,
-                        **{"format": dataset_format},
-                    )
-                ),
+            schema=to_conjure_schema(schema),
+        )
+        key = _schema_key(dataset.locator)
+        if key is not None:
+            with self._schemas_lock:
+                self._schemas.pop(key, None)
+
+    def get_schema(self, locator: DatasetLocator) -> Optional[FoundrySchema]:
+        key = _schema_key(locator)
+        if key is not None:
+            with self._schemas_lock:
+                if key in self._schemas:
+                    return self._schemas[key]
+        versioned_schema = self._schema_service.get_schema(
+            auth_header=self.ctx.auth_token,
+            dataset_rid=str(locator.rid),
+            branch_id=locator.branch_id,
+            # the query parameter is optional, the schema of the branch is returned without it
+            end_transaction_rid=cast(
+                str,
+                str(locator.end_transaction_rid)
+                if locator.end_transaction_rid
+                else None,
             ),
         )
+        if versioned_schema is None:
+            # not cached, another client can still put a schema on the same end transaction
+            return None
+        schema = from_conjure_schema(versioned_schema.schema)
+        if key is not None:
+            with self._schemas_lock:
+                self._schemas[key] = schema
+        return schema
 
     def put_file(self, locator: FileLocator, content: bytes) -> None:
-        megabyte = 1024 * 1024
-        max_chunk_size = 50 * megabyte
-        if len(content) < max_chunk_size:
+        recorded = self.upload_journal.chunks(locator) if self.upload_journal else {}
+        # a resumed upload keeps the chunk size it was started with, so that the uploaded chunks can be reused
+        chunk_size = (
+            recorded[0].size
+            if 0 in recorded
+            else self.chunk_sizer.chunk_size(len(content))
+        )
+        if len(content) < chunk_size:
             self._put_file(locator, content)
         else:
-            self._put_file_chunked(locator, content, max_chunk_size)
+            self._put_file_chunked(locator, content, chunk_size)
 
     def _put_file(self, locator: FileLocator, content: bytes) -> None:
+        self._put(locator, relpath(locator.logical_path), content)
+
+    def _put(self, locator: FileLocator, logical_path: str, content: bytes) -> None:
+        start = monotonic()
         self._data_proxy_service.put_file(
             auth_header=self.ctx.auth_token,
             dataset_rid=str(locator.dataset_rid),
             transaction_rid=locator.end_ref,
-            logical_path=relpath(locator.logical_path),
-            file_data=content,
+            logical_path=logical_path,
+            **self._file_data(locator, content),
         )
+        self.chunk_sizer.record(len(content), monotonic() - start)
+
+    def _file_data(self, locator: FileLocator, content: bytes) -> Dict[str, Any]:
+        if self.compression and is_compressible(locator.logical_path, content):
+            return {
+                "file_data": CompressedContent(content, self.compression),
+                "content_encoding": self.compression,
+            }
+        return {"file_data": content}
+
+    def put_file_chunks(
+        self, locator: FileLocator, chunks: Iterable[bytes], max_workers: int = 1
+    ) -> None:
+        """
+        Uploads the content of a file while it is being produced, e.g. serialized. Each chunk is uploaded as soon as it
+        is produced and the chunks are concatenated once all are uploaded; content of a single chunk is uploaded as is.
+
+        Args:
+            locator: The file to upload to, in an open transaction.
+            chunks: The consecutive chunks of the content.
+            max_workers: The maximum number of chunks uploaded at once. Producing the next chunk waits while this many
+                are being uploaded, so that at most `max_workers + 1` chunks are held in memory.
+        """
+        chunks = iter(chunks)
+        first = next(chunks, b"")
+        second = next(chunks, None)
+        if second is None:
+            self._put_file(locator, first)
+        else:
+            self._put_chunks(
+                locator, itertools.chain((first, second), chunks), max_workers
+            )
 
     def _put_file_chunked(
         self, locator: FileLocator, content: bytes, chunk_size: int
     ) -> None:
+        self._put_chunks(locator, _chunk(content, chunk_size), max_workers=1)
+
+    def _put_chunks(
+        self, locator: FileLocator, chunks: Iterable[bytes], max_workers: int
+    ) -> None:
+        journal = self.upload_journal
+        uploaded = self._uploaded_chunks(journal, locator) if journal else {}
         chunk_paths = []
-        for idx, chunk_content in enumerate(_chunk(content, chunk_size)):
-            chunk_path = f"{relpath(locator.logical_path)}.{idx}"
-            self._data_proxy_service.put_file(
-                auth_header=self.ctx.auth_token,
-                dataset_rid=str(locator.dataset_rid),
-                transaction_rid=locator.end_ref,
-                logical_path=chunk_path,
-                file_data=chunk_content,
-            )
-            chunk_paths.append(chunk_path)
+        pending: Set[Future] = set()
+        with ThreadPoolExecutor(max_workers) as executor:
+            try:
+                for idx, chunk_content in enumerate(chunks):
+                    chunk_path = f"{relpath(locator.logical_path)}.{idx}"
+                    chunk_paths.append(chunk_path)
+                    entry = None
+                    if journal:
+                        entry = JournalEntry(
+                            idx,
+                            len(chunk_content),
+                            hashlib.sha256(chunk_content).hexdigest(),
+                        )
+                        if uploaded.get(chunk_path) == entry:
+                            continue
+                    if len(pending) >= max_workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            future.result()
+                    pending.add(
+                        executor.submit(
+                            tracing.in_current_context(self._put_chunk),
+                            locator,
+                            chunk_path,
+                            chunk_content,
+                            journal,
+                            entry,
+                        )
+                    )
+                for future in pending:
+                    future.result()
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
 
         response: StartConcatenationTaskResponse = (
             self._data_proxy_concatenation_service.start_concatenation_task(
@@ -406,11 +725,68 @@ class DatasetsClient:
 
         while not is_terminal():
             sleep(0.5)
+        if journal:
+            journal.complete(locator)
+
+    def _put_chunk(
+        self,
+        locator: FileLocator,
+        chunk_path: str,
+        content: bytes,
+        journal: Optional[UploadJournal],
+        entry: Optional[JournalEntry],
+    ) -> None:
+        self._put(locator, chunk_path, content)
+        if journal is not None and entry is not None:
+            journal.record(locator, entry)
+
+    def _uploaded_chunks(
+        self, journal: UploadJournal, locator: FileLocator
+    ) -> Dict[str, JournalEntry]:
+        """
+        Returns: The chunks of the file recorded in the journal which are present in the open transaction with the
+        recorded size, by chunk path.
+        """
+        recorded = journal.chunks(locator)
+        if not recorded:
+            return {}
+        path = relpath(locator.logical_path)
+        present = {
+            file.logical_path: file.file_metadata.length
+            if file.file_metadata is not None
+            else None
+            for file in page_results(
+                values_extractor=lambda page: page.values,
+                token_extractor=lambda page: page.next_page_token,
+                page_supplier=lambda next_page_token: self._catalog_service.get_dataset_view_files2(
+                    auth_header=self.ctx.auth_token,
+                    dataset_rid=str(locator.dataset_rid),
+                    start_transaction_rid=str(locator.end_ref),
+                    end_ref=str(locator.end_ref),
+                    logical_path=path,
+                    include_open_exclusive_transaction=True,
+                    page_size=1000,
+                    page_start_logical_path=next_page_token,
+                    exclude_hidden_files=False,
+                ),
+            )
+        }
+        return {
+            f"{path}.{idx}": entry
+            for idx, entry in recorded.items()
+            if present.get(f"{path}.{idx}") == entry.size
+        }
 
     def read_dataset(
         self,
         locator: DatasetLocator,
     ) -> "pa.Table":
+        return self.read_dataset_stream(locator).read_all()
+
+    def read_dataset_stream(
+        self,
+        locator: DatasetLocator,
+    ) -> "pa.RecordBatchReader":
         if locator.end_transaction_rid is None:
             raise ValueError("read failed. unresolved end transaction rid")
 
@@ -447,7 +823,7 @@ class DatasetsClient:
         assert control == b"A"
         import pyarrow as pa
 
-        return pa.ipc.open_stream(stream).read_all()
+        return pa.ipc.open_stream(stream)
 
 
 class _IsQueryStatusTerminalVisitor(QueryStatusVisitor):
@@ -495,84 +871,8 @@ class ConcatenationTaskTerminationVisitor(ConcatenationTaskStatusVisitor):
         return False
 
 
-def _get_data_frame_reader_class(file_format: FileFormat) -> Tuple[str, Optional[str]]:
-    if file_format == FileFormat.AVRO:
-        return "com.palantir.foundry.spark.input.AvroDataFrameReader", "avro"
-    if file_format == FileFormat.CSV:
-        return "com.palantir.foundry.spark.input.TextDataFrameReader", None
-    if file_format == FileFormat.PARQUET:
-        return "com.palantir.foundry.spark.input.ParquetDataFrameReader", "parquet"
-    if file_format == FileFormat.SOHO:
-        return "com.palantir.foundry.spark.input.DataSourceDataFrameReader", "soho"
-    raise ValueError(f"unknown file format: {file_format}")
-
-
-def _get_conjure_field_schema(
-    field_type: FieldType,
-    name: Optional[str] = None,
-    nullable: bool = True,
-    metadata: Dict[str, Any] = None,
-) -> FoundryFieldSchema:
-    foundry_field_type = _get_conjure_field_type(field_type)
-    array_subtype = None
-    map_key_type = None
-    map_value_type = None
-    sub_schemas = None
-    precision = None
-    scale = None
-
-    if isinstance(field_type, DecimalFieldType):
-        precision = field_type.precision
-        scale = field_type.scale
-    elif isinstance(field_type, ArrayFieldType):
-        array_subtype = _get_conjure_field_schema(field_type.element_type)
-    elif isinstance(field_type, MapFieldType):
-        map_key_type = _get_conjure_field_schema(field_type.key_type, nullable=False)
-        map_value_type = _get_conjure_field_schema(field_type.value_type)
-    elif isinstance(field_type, StructFieldType):
-        sub_schemas = [_get_conjure_field_schema(child) for child in field_type.fields]
-
-    return FoundryFieldSchema(
-        field_type=foundry_field_type,
-        name=name,
-        nullable=nullable,
-        custom_metadata={} if metadata is None else metadata,
-        array_subtype=array_subtype,
-        map_key_type=map_key_type,
-        map_value_type=map_value_type,
-        sub_schemas=sub_schemas,
-        precision=precision,
-        scale=scale,
-    )
-
-
-def _get_conjure_field_type(field_type: FieldType) -> FoundryFieldType:
-    sdk_to_conjure = {
-        ArrayFieldType: FoundryFieldType.ARRAY,
-        BinaryFieldType: FoundryFieldType.BINARY,
-        BooleanFieldType: FoundryFieldType.BOOLEAN,
-        ByteFieldType: FoundryFieldType.BYTE,
-        DateFieldType: FoundryFieldType.DATE,
-        DecimalFieldType: FoundryFieldType.DECIMAL,
-        DoubleFieldType: FoundryFieldType.DOUBLE,
-        FloatFieldType: FoundryFieldType.FLOAT,
-        IntegerFieldType: FoundryFieldType.INTEGER,
-        LongFieldType: FoundryFieldType.LONG,
-        MapFieldType: FoundryFieldType.MAP,
-        ShortFieldType: FoundryFieldType.SHORT,
-        StringFieldType: FoundryFieldType.STRING,
-        StructFieldType: FoundryFieldType.STRUCT,
-        TimestampFieldType: FoundryFieldType.TIMESTAMP,
-    }
-    conjure_field_type = sdk_to_conjure.get(type(field_type))
-    if conjure_field_type is not None:
-        return conjure_field_type
-    raise ValueError(f"Unknown FoundryFieldType: {field_type}")
-
-
-def _prune_absent_values(dictionary):
-    return {
-        k: _prune_absent_values(v) if isinstance(v, dict) else v
-        for k, v in dictionary.items()
-        if v is not None
-    }
+def _schema_key(locator: DatasetLocator) -> Optional[Tuple[str, str, str]]:
+    """Returns: The key of the schema of the view in the cache, or None if the view has no end and may change."""
+    if locator.end_transaction_rid is None:
+        return None
+    return str(locator.rid), locator.branch_id, str(locator.end_transaction_rid)
@@ -0,0 +1,132 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Transfer compression of file content, i.e. the `Content-Encoding` of uploads and `Accept-Encoding` of downloads. Files
+are stored uncompressed, compression only reduces the bytes sent over the network.
+"""
+
+import zlib
+from typing import Iterable, Iterator
+
+ENCODINGS = ("gzip", "zstd")
+
+# content is compressed and sent in blocks so that no compressed copy of the whole file is held in memory
+_BLOCK_SIZE = 1024 * 1024
+# below this size, the saving does not make up for the cost of compressing
+_MIN_SIZE = 1024
+
+_COMPRESSED_EXTENSIONS = (
+    ".7z",
+    ".avro",
+    ".br",
+    ".bz2",
+    ".gz",
+    ".jpeg",
+    ".jpg",
+    ".lz4",
+    ".mp4",
+    ".orc",
+    ".parquet",
+    ".png",
+    ".snappy",
+    ".xz",
+    ".zip",
+    ".zst",
+)
+
+_COMPRESSED_MAGIC_BYTES = (
+    b"PAR1",  # parquet
+    b"ORC",  # orc
+    b"Obj\x01",  # avro
+    b"\x1f\x8b",  # gzip
+    b"\x28\xb5\x2f\xfd",  # zstd
+    b"\x04\x22\x4d\x18",  # lz4
+    b"BZh",  # bzip2
+    b"\xfd7zXZ\x00",  # xz
+    b"PK\x03\x04",  # zip
+    b"\x89PNG",  # png
+    b"\xff\xd8\xff",  # jpeg
+)
+
+
+def validate_encoding(encoding: str) -> None:
+    if encoding not in ENCODINGS:
+        raise ValueError(
+            f"unsupported compression '{encoding}', expected one of {ENCODINGS}"
+        )
+    if encoding == "zstd":
+        _zstd()
+
+
+def is_compressible(logical_path: str, content: bytes) -> bool:
+    """Returns whether content is likely to compress, i.e. is not small and not in an already compressed format."""
+    return (
+        len(content) >= _MIN_SIZE
+        and not logical_path.lower().endswith(_COMPRESSED_EXTENSIONS)
+        and not content[:8].startswith(_COMPRESSED_MAGIC_BYTES)
+    )
+
+
+def accept_encoding() -> str:
+    """Returns: The encodings that downloads can be decoded from, which include zstd if `zstandard` is installed."""
+    from urllib3.util.request import ACCEPT_ENCODING
+
+    return ACCEPT_ENCODING
+
+
+class CompressedContent:
+    """
+    An http request body that compresses content in blocks as it is sent. Each iteration compresses from the start,
+    so that the body can be sent again when a request is retried.
+    """
+
+    def __init__(self, content: bytes, encoding: str):
+        validate_encoding(encoding)
+        self.content = content
+        self.encoding = encoding
+
+    def __iter__(self) -> Iterator[bytes]:
+        if self.encoding == "zstd":
+            compressor = _zstd().ZstdCompressor().compressobj()
+        else:
+            compressor = zlib.compressobj(wbits=31)  # gzip container
+        view = memoryview(self.content)
+        for offset in range(0, len(view), _BLOCK_SIZE):
+            block = compressor.compress(view[offset : offset + _BLOCK_SIZE])
+            if block:
+                yield block
+        yield compressor.flush()
+
+
+def decompress(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    """Decodes the chunks of a request body sent with the given `Content-Encoding`."""
+    validate_encoding(encoding)
+    if encoding == "zstd":
+        decompressor = _zstd().ZstdDecompressor().decompressobj()
+    else:
+        decompressor = zlib.decompressobj(wbits=31)
+    for chunk in chunks:
+        yield decompressor.decompress(chunk)
+    yield decompressor.flush()
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise ImportError(
+            "zstd compression requires the 'zstandard' package, e.g. from the 'zstd' extra"
+        ) from exc
+    return zstandard
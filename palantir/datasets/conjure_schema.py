@@ -0,0 +1,240 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Conversion between the :class:`FoundrySchema` of the SDK and the schema of the conjure bindings of the schema service,
+see :meth:`palantir.datasets.client.DatasetsClient.put_schema` and
+:meth:`palantir.datasets.client.DatasetsClient.get_schema`.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+from palantir.datasets.rpc.schema import (
+    FoundrySchema as ConjureFoundrySchema,
+    FoundryFieldSchema,
+    FoundryFieldType,
+)
+from palantir.datasets.types import (
+    FileFormat,
+    FieldType,
+    DecimalFieldType,
+    ArrayFieldType,
+    MapFieldType,
+    StructFieldType,
+    BinaryFieldType,
+    BooleanFieldType,
+    ByteFieldType,
+    DateFieldType,
+    DoubleFieldType,
+    FloatFieldType,
+    IntegerFieldType,
+    LongFieldType,
+    ShortFieldType,
+    StringFieldType,
+    TimestampFieldType,
+    Field,
+    FoundrySchema,
+)
+
+
+def to_conjure_schema(schema: FoundrySchema) -> ConjureFoundrySchema:
+    data_frame_reader_class, dataset_format = _get_data_frame_reader_class(
+        schema.format
+    )
+    return ConjureFoundrySchema(
+        field_schema_list=[
+            _get_conjure_field_schema(
+                field.type, field.name, field.nullable, field.metadata
+            )
+            for field in schema.fields
+        ],
+        data_frame_reader_class=data_frame_reader_class,
+        custom_metadata=_prune_absent_values(
+            dict(
+                {} if schema.metadata is None else schema.metadata,
+                **{"format": dataset_format},
+            )
+        ),
+    )
+
+
+def _get_data_frame_reader_class(file_format: FileFormat) -> Tuple[str, Optional[str]]:
+    if file_format == FileFormat.AVRO:
+        return "com.palantir.foundry.spark.input.AvroDataFrameReader", "avro"
+    if file_format == FileFormat.CSV:
+        return "com.palantir.foundry.spark.input.TextDataFrameReader", None
+    if file_format == FileFormat.PARQUET:
+        return "com.palantir.foundry.spark.input.ParquetDataFrameReader", "parquet"
+    if file_format == FileFormat.SOHO:
+        return "com.palantir.foundry.spark.input.DataSourceDataFrameReader", "soho"
+    raise ValueError(f"unknown file format: {file_format}")
+
+
+def _get_file_format(
+    data_frame_reader_class: str, dataset_format: Optional[str]
+) -> FileFormat:
+    for file_format in FileFormat:
+        if _get_data_frame_reader_class(file_format) == (
+            data_frame_reader_class,
+            dataset_format,
+        ):
+            return file_format
+    for file_format in FileFormat:
+        if _get_data_frame_reader_class(file_format)[0] == data_frame_reader_class:
+            return file_format
+    raise ValueError(f"unknown data frame reader class: {data_frame_reader_class}")
+
+
+def from_conjure_schema(schema: ConjureFoundrySchema) -> FoundrySchema:
+    metadata = dict(schema.custom_metadata or {})
+    dataset_format = metadata.pop("format", None)
+    return FoundrySchema(
+        fields=[
+            Field(
+                field.name,
+                _get_sdk_field_type(field),
+                field.nullable is not False,
+                field.custom_metadata or None,
+            )
+            for field in schema.field_schema_list
+        ],
+        file_format=_get_file_format(schema.data_frame_reader_class, dataset_format),
+        metadata=metadata or None,
+    )
+
+
+def _get_sdk_field_type(field_schema: FoundryFieldSchema) -> FieldType:
+    foundry_field_type = field_schema.field_type
+    if foundry_field_type == FoundryFieldType.DECIMAL:
+        return DecimalFieldType(
+            DecimalFieldType.precision
+            if field_schema.precision is None
+            else field_schema.precision,
+            DecimalFieldType.scale
+            if field_schema.scale is None
+            else field_schema.scale,
+        )
+    if foundry_field_type == FoundryFieldType.ARRAY:
+        return ArrayFieldType(_get_sdk_child_type(field_schema.array_subtype))
+    if foundry_field_type == FoundryFieldType.MAP:
+        return MapFieldType(
+            _get_sdk_child_type(field_schema.map_key_type),
+            _get_sdk_child_type(field_schema.map_value_type),
+        )
+    if foundry_field_type == FoundryFieldType.STRUCT:
+        sub_schemas = field_schema.sub_schemas or []
+        names = [child.name for child in sub_schemas if child.name]
+        return StructFieldType(
+            [_get_sdk_field_type(child) for child in sub_schemas],
+            names if len(names) == len(sub_schemas) else None,
+        )
+    conjure_to_sdk = {
+        FoundryFieldType.BINARY: BinaryFieldType,
+        FoundryFieldType.BOOLEAN: BooleanFieldType,
+        FoundryFieldType.BYTE: ByteFieldType,
+        FoundryFieldType.DATE: DateFieldType,
+        FoundryFieldType.DOUBLE: DoubleFieldType,
+        FoundryFieldType.FLOAT: FloatFieldType,
+        FoundryFieldType.INTEGER: IntegerFieldType,
+        FoundryFieldType.LONG: LongFieldType,
+        FoundryFieldType.SHORT: ShortFieldType,
+        FoundryFieldType.STRING: StringFieldType,
+        FoundryFieldType.TIMESTAMP: TimestampFieldType,
+    }
+    sdk_field_type = conjure_to_sdk.get(foundry_field_type)
+    if sdk_field_type is not None:
+        return sdk_field_type()
+    raise ValueError(f"Unsupported FoundryFieldType: {foundry_field_type}")
+
+
+def _get_sdk_child_type(child_schema: Optional[FoundryFieldSchema]) -> FieldType:
+    if child_schema is None:
+        raise ValueError("array and map fields require the schemas of their children")
+    return _get_sdk_field_type(child_schema)
+
+
+def _get_conjure_field_schema(
+    field_type: FieldType,
+    name: Optional[str] = None,
+    nullable: bool = True,
+    metadata: Dict[str, Any] = None,
+) -> FoundryFieldSchema:
+    foundry_field_type = _get_conjure_field_type(field_type)
+    array_subtype = None
+    map_key_type = None
+    map_value_type = None
+    sub_schemas = None
+    precision = None
+    scale = None
+
+    if isinstance(field_type, DecimalFieldType):
+        precision = field_type.precision
+        scale = field_type.scale
+    elif isinstance(field_type, ArrayFieldType):
+        array_subtype = _get_conjure_field_schema(field_type.element_type)
+    elif isinstance(field_type, MapFieldType):
+        map_key_type = _get_conjure_field_schema(field_type.key_type, nullable=False)
+        map_value_type = _get_conjure_field_schema(field_type.value_type)
+    elif isinstance(field_type, StructFieldType):
+        sub_schemas = [
+            _get_conjure_field_schema(
+                child, field_type.names[index] if field_type.names else None
+            )
+            for index, child in enumerate(field_type.fields)
+        ]
+
+    return FoundryFieldSchema(
+        field_type=foundry_field_type,
+        name=name,
+        nullable=nullable,
+        custom_metadata={} if metadata is None else metadata,
+        array_subtype=array_subtype,
+        map_key_type=map_key_type,
+        map_value_type=map_value_type,
+        sub_schemas=sub_schemas,
+        precision=precision,
+        scale=scale,
+    )
+
+
+def _get_conjure_field_type(field_type: FieldType) -> FoundryFieldType:
+    sdk_to_conjure = {
+        ArrayFieldType: FoundryFieldType.ARRAY,
+        BinaryFieldType: FoundryFieldType.BINARY,
+        BooleanFieldType: FoundryFieldType.BOOLEAN,
+        ByteFieldType: FoundryFieldType.BYTE,
+        DateFieldType: FoundryFieldType.DATE,
+        DecimalFieldType: FoundryFieldType.DECIMAL,
+        DoubleFieldType: FoundryFieldType.DOUBLE,
+        FloatFieldType: FoundryFieldType.FLOAT,
+        IntegerFieldType: FoundryFieldType.INTEGER,
+        LongFieldType: FoundryFieldType.LONG,
+        MapFieldType: FoundryFieldType.MAP,
+        ShortFieldType: FoundryFieldType.SHORT,
+        StringFieldType: FoundryFieldType.STRING,
+        StructFieldType: FoundryFieldType.STRUCT,
+        TimestampFieldType: FoundryFieldType.TIMESTAMP,
+    }
+    conjure_field_type = sdk_to_conjure.get(type(field_type))
+    if conjure_field_type is not None:
+        return conjure_field_type
+    raise ValueError(f"Unknown FoundryFieldType: {field_type}")
+
+
+def _prune_absent_values(dictionary):
+    return {
+        k: _prune_absent_values(v) if isinstance(v, dict) else v
+        for k, v in dictionary.items()
+        if v is not None
+    }
@@ -12,33 +12,84 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import collections
+import functools
 import io
-from datetime import datetime
-from typing import Generator, Union, Tuple, TYPE_CHECKING, Optional
+import itertools
+import os
+import threading
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+    Set,
+    Union,
+    Tuple,
+    TYPE_CHECKING,
+    Optional,
+    Pattern,
+    cast,
+    overload,
+)
 
-from palantir.core import context
+from palantir.core import tracing
+from palantir.core.tracing import traced
 from palantir.core.types import ResourceIdentifier
-from palantir.datasets.client import DatasetsClient, DatasetServices
-from palantir.datasets.errors import TransactionAbortedError
-from palantir.datasets.schema import pandas_to_foundry_schema
+from palantir.datasets.errors import SchemaMismatchError, TransactionAbortedError
+from palantir.datasets.file import File, default_client, read_all
+from palantir.datasets.patterns import (
+    PathPattern,
+    catalog_order,
+    narrow_prefixes,
+    relative_path,
+)
+from palantir.datasets.schema import (
+    foundry_schema_to_arrow,
+    is_compatible,
+    pandas_to_foundry_schema,
+)
+from palantir.datasets.tables import chunk_batches, parquet_chunks, to_pandas
 from palantir.datasets.types import (
+    DatasetLocator,
+    FileChange,
+    FileChangeType,
     FileLocator,
+    FoundrySchema,
+    MapResult,
+    SyncResult,
     TransactionType,
     TransactionStatus,
 )
 
 if TYPE_CHECKING:
+    import duckdb
+    from palantir.datasets.cache import FileCache
     import pandas as pd
+    import polars as pl
     import pyarrow as pa
-    from palantir.datasets.types import DatasetLocator
+    from palantir.datasets.client import DatasetsClient
 
 
-class Dataset:
-    """A reference to a Foundry Dataset, resolved to a branch and view (i.e. Transaction Range)."""
+class Dataset:  # pylint: disable=too-many-public-methods
+    """
+    A reference to a Foundry Dataset, resolved to a branch and view (i.e. Transaction Range).
+
+    A Dataset may be shared between threads, its view is updated atomically by :meth:`update_view` and by committed
+    transactions.
+    """
 
     def __init__(self, client: "DatasetsClient", locator: "DatasetLocator"):
         self.client = client
         self.locator = locator
+        self._lock = threading.RLock()
 
     @property
     def rid(self):
@@ -53,22 +104,306 @@ class Dataset:
     @property
     def view(self) -> Tuple[Optional[ResourceIdentifier], Optional[ResourceIdentifier]]:
         """Returns The view (i.e. Transaction Range) that this Dataset object is bound to."""
+        locator = self.locator
         return (
-            self.locator.start_transaction_rid,
-            self.locator.end_transaction_rid,
+            locator.start_transaction_rid,
+            locator.end_transaction_rid,
         )
 
-    def list_files(self, path: str = None) -> Generator["File", None, None]:
+    def list_files(
+        self,
+        path: str = None,
+        max_workers: int = 1,
+        shards: Sequence[str] = None,
+        glob: str = None,
+        regex: Union[str, Pattern[str]] = None,
+    ) -> Generator["File", None, None]:
         """
         Lists the files in the Dataset for the :prop:`view`.
 
         Args:
             path: An optional path prefix to use to filter when listing files.
+            max_workers: The number of pages of files requested concurrently. If more than one, the logical paths are
+                split into shards which are listed concurrently, so that listing a very large Dataset takes time in
+                proportion to the files per connection, and files are yielded as pages arrive rather than in path
+                order.
+            shards: Logical paths at which to split a concurrent listing, e.g. `["year=2023/", "year=2024/"]`. By
+                default, the paths are split at the first character in which they differ, found with a few requests
+                for single files.
+            glob: An optional glob the whole logical path must match, see :meth:`PathPattern.from_glob`. Only the
+                files under its literal prefix are listed, e.g. under `year=2024/` for `year=2024/**/*.parquet`, and
+                the prefixes of the alternatives of a brace pattern are listed one after another, or concurrently if
+                `max_workers` is more than one.
+            regex: An optional regular expression the whole logical path must match. Only the files under its literal
+                prefix are listed.
+
+        Logical paths are relative to the root of the Dataset, so a leading `./` or `/` of `path` or `glob` is ignored.
 
         Returns: A generator over pages of :class:`File` objects in the current view and branch.
+
+        Examples:
+            >>> total = sum(file.length for file in ds.list_files(max_workers=16))
+
+            >>> parquet = list(ds.list_files(glob="{year=2023,year=2024}/**/*.parquet"))
+        """
+        if path is not None:
+            path = relative_path(path)
+        if glob is not None and regex is not None:
+            raise ValueError("only one of glob and regex may be given")
+        if glob is not None:
+            pattern = PathPattern.from_glob(relative_path(glob))
+        elif regex is not None:
+            pattern = PathPattern.from_regex(regex)
+        else:
+            return tracing.traced_iter(
+                "Dataset.list_files",
+                self.client.list_files(
+                    dataset=self, path=path, max_workers=max_workers, shards=shards
+                ),
+            )
+        prefixes = narrow_prefixes(
+            [
+                prefix if path is None or prefix.startswith(path) else path
+                for prefix in pattern.prefixes
+                if path is None or prefix.startswith(path) or path.startswith(prefix)
+            ]
+        )
+        if not prefixes:
+            return tracing.traced_iter("Dataset.list_files", [])
+        files = self.client.list_files(
+            dataset=self, max_workers=max_workers, shards=shards, prefixes=prefixes
+        )
+        return tracing.traced_iter(
+            "Dataset.list_files",
+            (file for file in files if pattern.matches(file.path)),
+        )
+
+    def iter_file_contents(
+        self, path: str = None, prefetch: int = 4, max_bytes: int = 256 * 1024 * 1024
+    ) -> Iterator[Tuple["File", bytes]]:
+        """
+        Iterates over the content of the files in the :prop:`view`, in listing order, while the next files are
+        downloaded in the background, so that download latency is hidden while the caller processes each file.
+
+        Args:
+            path: An optional path prefix to use to filter when listing files.
+            prefetch: The maximum number of files downloaded ahead of the caller.
+            max_bytes: The maximum total length of the files downloaded ahead of the caller. A file larger than this is
+                still downloaded, once no other file is held.
+
+        Returns: An iterator of each :class:`File` with its content.
+
+        Examples:
+            >>> for file, content in ds.iter_file_contents(prefetch=8):
+            ...     process(content)
+        """
+        files = self.list_files(path)
+        queue: Deque[Tuple[File, Future]] = collections.deque()
+        queued_bytes = 0
+        next_file: Optional[File] = next(files, None)
+        with ThreadPoolExecutor(max(prefetch, 1)) as executor:
+            try:
+                while next_file is not None or queue:
+                    while (
+                        next_file is not None
+                        and len(queue) < max(prefetch, 1)
+                        and (
+                            not queue
+                            or queued_bytes + (next_file.length or 0) <= max_bytes
+                        )
+                    ):
+                        queue.append(
+                            (
+                                next_file,
+                                executor.submit(
+                                    tracing.in_current_context(read_all), next_file
+                                ),
+                            )
+                        )
+                        queued_bytes += next_file.length or 0
+                        next_file = next(files, None)
+                    file, future = queue.popleft()
+                    content = future.result()
+                    queued_bytes -= file.length or 0
+                    yield file, content
+            finally:
+                for _, future in queue:
+                    future.cancel()
+
+    def map_files(
+        self,
+        func: Callable[["File"], Any],
+        processes: int = None,
+        threads_per_process: int = 4,
+        ordered: bool = True,
+        errors: str = "raise",
+        path: str = None,
+    ) -> Iterator[MapResult]:
+        """
+        Applies a function to each file in the :prop:`view` across a pool of processes, e.g. to parse the files using
+        all cores. Files are listed in this process and sent in batches to the worker processes, each of which creates
+        its own client and applies the function to `threads_per_process` files at once, so that downloads overlap with
+        processing.
+
+        Args:
+            func: The function to apply, called with a :class:`File` which it reads itself, e.g. with
+                :meth:`File.read`. Must be picklable, e.g. a module level function, as must be the values it returns.
+            processes: The number of worker processes. Defaults to the number of CPUs.
+            threads_per_process: The number of files processed at once by each worker process.
+            ordered: Whether to yield results in listing order, rather than as soon as they complete.
+            errors: "raise" to raise the first error raised by the function, or "collect" to yield it as a result.
+            path: An optional path prefix to use to filter when listing files.
+
+        Returns: An iterator of the :class:`MapResult` of each file.
+
+        Examples:
+            >>> def count_lines(file):
+            ...     return sum(1 for _ in file.read())
+            >>> total = sum(result.value for result in ds.map_files(count_lines, processes=8))
+        """
+        from palantir.datasets.parallel import map_files
+
+        return map_files(
+            self, func, processes, threads_per_process, ordered, errors, path
+        )
+
+    def list_files_since(
+        self,
+        transaction_rid: Optional[Union[str, ResourceIdentifier]],
+        path: str = None,
+    ) -> Generator["File", None, None]:
+        """
+        Lists the files in the :prop:`view` that were written by transactions after the given one, e.g. the files
+        appended to the Dataset since it was last read.
+
+        Args:
+            transaction_rid: The last transaction that was already processed, usually the end of a previously read
+                view. If `None`, all files in the view are listed.
+            path: An optional path prefix to use to filter when listing files.
+
+        Returns: A generator over :class:`File` objects written after the transaction.
+        """
+        if transaction_rid is None:
+            yield from self.list_files(path)
+            return
+        checkpoint = ResourceIdentifier.from_string(str(transaction_rid))
+        # the view is narrowed to start at the checkpoint, whose own files are then skipped
+        for file in self.client.list_files(
+            dataset=self, path=path, start_transaction_rid=checkpoint
+        ):
+            if file.transaction_rid != checkpoint:
+                yield file
+
+    def diff(
+        self,
+        other_view: Union["Dataset", Tuple[Optional[str], Optional[str]]],
+        path: str = None,
+    ) -> Generator[FileChange, None, None]:
         """
-        return self.client.list_files(dataset=self, path=path)
+        Compares the files in another view of the Dataset, e.g. an earlier one, with the files in the :prop:`view`.
+        Both listings are consumed page by page in the catalog's path order and merged, so memory use does not grow with
+        the number of files.
 
+        Args:
+            other_view: The view to compare against, as a :class:`Dataset` or a tuple containing a start and end
+                transaction rid.
+            path: An optional path prefix to use to filter when listing files.
+
+        Returns: A generator over a :class:`FileChange` for each file that was added, replaced or removed going from
+        the other view to the :prop:`view`, in the catalog's path order.
+
+        Examples:
+            >>> before = ds.view
+            >>> ds.update_view()
+            >>> for change in ds.diff(before):
+            ...     print(change.change_type, change.path)
+        """
+        if not isinstance(other_view, Dataset):
+            start_transaction_rid, end_transaction_rid = other_view
+            other_view = Dataset(
+                self.client,
+                DatasetLocator(
+                    rid=self.rid,
+                    branch_id=self.branch,
+                    start_transaction_rid=ResourceIdentifier.from_string(
+                        str(start_transaction_rid)
+                    )
+                    if start_transaction_rid
+                    else None,
+                    end_transaction_rid=ResourceIdentifier.from_string(
+                        str(end_transaction_rid)
+                    )
+                    if end_transaction_rid
+                    else None,
+                ),
+            )
+        before = other_view.list_files(path)
+        after = self.list_files(path)
+        old, new = next(before, None), next(after, None)
+        # both listings are in the catalog's order of paths, which the merge has to compare by
+        while old is not None and new is not None:
+            if catalog_order(old.path) < catalog_order(new.path):
+                yield FileChange(old.path, FileChangeType.REMOVED, old, None)
+                old = next(before, None)
+            elif catalog_order(new.path) < catalog_order(old.path):
+                yield FileChange(new.path, FileChangeType.ADDED, None, new)
+                new = next(after, None)
+            else:
+                if (
+                    old.transaction_rid != new.transaction_rid
+                    or old.length != new.length
+                ):
+                    yield FileChange(new.path, FileChangeType.REPLACED, old, new)
+                old, new = next(before, None), next(after, None)
+        if old is not None:
+            for file in itertools.chain([old], before):
+                yield FileChange(file.path, FileChangeType.REMOVED, file, None)
+        if new is not None:
+            for file in itertools.chain([new], after):
+                yield FileChange(file.path, FileChangeType.ADDED, None, file)
+
+    def diff_arrow(
+        self,
+        other_view: Union["Dataset", Tuple[Optional[str], Optional[str]]],
+        path: str = None,
+    ) -> "pa.Table":
+        """
+        Returns: The changes of :meth:`diff` as an Apache Arrow :class:`pa.Table` with the columns `path`,
+        `change_type`, and the `transaction_rid` and `length` of the file `before` and `after` the change.
+        """
+        import pyarrow as pa
+
+        columns: Dict[str, list] = {
+            "path": [],
+            "change_type": [],
+            "before_transaction_rid": [],
+            "after_transaction_rid": [],
+            "before_length": [],
+            "after_length": [],
+        }
+        for change in self.diff(other_view, path):
+            columns["path"].append(change.path)
+            columns["change_type"].append(change.change_type.value)
+            for side, file in (("before", change.before), ("after", change.after)):
+                columns[f"{side}_transaction_rid"].append(
+                    str(file.transaction_rid) if file and file.transaction_rid else None
+                )
+                columns[f"{side}_length"].append(file.length if file else None)
+        return pa.table(
+            columns,
+            schema=pa.schema(
+                [
+                    ("path", pa.string()),
+                    ("change_type", pa.string()),
+                    ("before_transaction_rid", pa.string()),
+                    ("after_transaction_rid", pa.string()),
+                    ("before_length", pa.int64()),
+                    ("after_length", pa.int64()),
+                ]
+            ),
+        )
+
+    @traced
     def file(self, file_ref: str) -> "File":
         """
         Creates a new :class:`File` object representing a File within a dataset.
@@ -87,6 +422,25 @@ class Dataset:
             client=self.client,
         )
 
+    @traced
+    def schema(self) -> Optional[FoundrySchema]:
+        """
+        Returns: The schema of the Dataset at the current view, or `None` if the Dataset has no schema. Schemas are
+        cached by the client for each view, so inspecting the schema does not read any data and is only requested once
+        per view. A missing schema is requested again, as a schema can still be put on the view.
+        """
+        return self.client.get_schema(self.locator)
+
+    @traced
+    def arrow_schema(self) -> "Optional[pa.Schema]":
+        """
+        Returns: The schema of the Dataset at the current view as an Apache Arrow :class:`pa.Schema`, or `None` if the
+        Dataset has no schema.
+        """
+        schema = self.schema()
+        return None if schema is None else foundry_schema_to_arrow(schema)
+
+    @traced
     def read_arrow(self) -> "pa.Table":
         """
         Returns: The full content of the Dataset at the current view as an Apache Arrow :class:`pa.Table`. The dataset
@@ -94,27 +448,246 @@ class Dataset:
         """
         return self.client.read_dataset(self.locator)
 
-    def read_pandas(self) -> "pd.DataFrame":
+    @traced
+    def read_arrow_since(
+        self, transaction_rid: Optional[Union[str, ResourceIdentifier]]
+    ) -> "pa.Table":
         """
-        Returns: The full content of the Dataset at the current view as a Pandas :class:`pd.DataFrame`. The dataset
-        must have a schema and be tabular or this method will raise an Error.
+        Reads the parquet files in the :prop:`view` that were written by transactions after the given one. For an
+        append-only Dataset, this is the data appended since the transaction.
+
+        Args:
+            transaction_rid: The last transaction that was already read. If `None`, all files in the view are read.
+
+        Returns: The content of the new files as an Apache Arrow :class:`pa.Table`, without columns if there are none.
+
+        Examples:
+            >>> from palantir.datasets.checkpoint import FileCheckpoint
+            >>> checkpoint = FileCheckpoint("consumer.checkpoint")
+            >>> ds.update_view()
+            >>> table = ds.read_arrow_since(checkpoint.load())
+            >>> checkpoint.save(ds.view[1])
         """
-        return self.read_arrow().to_pandas()
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        tables = [
+            pq.read_table(pa.BufferReader(read_all(file)))
+            for file in self.list_files_since(transaction_rid)
+            if file.path.endswith(".parquet")
+        ]
+        return pa.concat_tables(tables) if tables else pa.table({})
+
+    @overload
+    def read_pandas(
+        self,
+        dtype_backend: str = ...,
+        strings_as_categories: Union[bool, Sequence[str]] = ...,
+        self_destruct: bool = ...,
+        split_blocks: bool = ...,
+        chunk_size: None = ...,
+    ) -> "pd.DataFrame":
+        ...
+
+    @overload
+    def read_pandas(
+        self,
+        dtype_backend: str = ...,
+        strings_as_categories: Union[bool, Sequence[str]] = ...,
+        self_destruct: bool = ...,
+        split_blocks: bool = ...,
+        *,
+        chunk_size: int,
+    ) -> Iterator["pd.DataFrame"]:
+        ...
+
+    @traced
+    def read_pandas(
+        self,
+        dtype_backend: str = "numpy",
+        strings_as_categories: Union[bool, Sequence[str]] = False,
+        self_destruct: bool = True,
+        split_blocks: bool = True,
+        chunk_size: Optional[int] = None,
+    ) -> Union["pd.DataFrame", Iterator["pd.DataFrame"]]:
+        """
+        Reads the full content of the Dataset at the current view into Pandas. The dataset must have a schema and be
+        tabular or this method will raise an Error.
+
+        By default, Arrow memory is released column by column as it is converted, so that the data is not held twice.
 
-    def write_pandas(self, df: "pd.DataFrame") -> None:
+        Args:
+            dtype_backend: "numpy" for numpy backed columns and python string objects, or "pyarrow" for columns backed
+                by Arrow arrays (:class:`pd.ArrowDtype`), which avoids converting the data.
+            strings_as_categories: Whether to convert string columns to categoricals, or the names of the columns to
+                convert. Saves memory for columns with repeated values.
+            self_destruct: Whether to release each Arrow column once it is converted.
+            split_blocks: Whether to create a block per column, rather than consolidating columns of the same type,
+                which avoids a copy.
+            chunk_size: If set, the content is streamed and returned as an iterator of DataFrames with at most this many
+                rows each, so that only one chunk is held in memory at a time.
+
+        Returns: A :class:`pd.DataFrame`, or an iterator of them if `chunk_size` is set.
         """
-        Writes the content of the provided DataFrame to a new Snapshot transaction in the Dataset. Uses parquet as a
-        serialization format. Updates the schema of the Dataset based on the type information of the DataFrame.
+        convert = functools.partial(
+            to_pandas,
+            dtype_backend=dtype_backend,
+            strings_as_categories=strings_as_categories,
+            self_destruct=self_destruct,
+            split_blocks=split_blocks,
+        )
+        if chunk_size is None:
+            return convert(self.read_arrow())
+        return map(
+            convert,
+            chunk_batches(self.client.read_dataset_stream(self.locator), chunk_size),
+        )
+
+    @traced
+    def read_polars(self, lazy: bool = False) -> Union["pl.DataFrame", "pl.LazyFrame"]:
+        """
+        Reads the full content of the Dataset at the current view into Polars, without copying the Arrow data. Requires
+        `polars` to be installed, e.g. through the `polars` extra of this package.
 
         Args:
-            df: a Pandas :class:`pd.DataFrame`
+            lazy: Whether to return a :class:`pl.LazyFrame` that streams the Arrow batches as it is collected, so that
+                projections and filters are applied to each batch rather than to the full content. The stream can only
+                be read once, so the LazyFrame can only be collected once.
+
+        Returns: A :class:`pl.DataFrame`, or a :class:`pl.LazyFrame` if `lazy` is set.
+        """
+        import polars as pl
+
+        reader = self.client.read_dataset_stream(self.locator)
+        if lazy:
+            import pyarrow.dataset as ds
+
+            return pl.scan_pyarrow_dataset(ds.dataset(reader))
+        # a table is converted to a DataFrame, only arrays are converted to a Series
+        return cast("pl.DataFrame", pl.from_arrow(reader.read_all()))
+
+    @traced
+    def to_duckdb(
+        self, connection: "duckdb.DuckDBPyConnection" = None
+    ) -> "duckdb.DuckDBPyRelation":
         """
-        with io.BytesIO() as buf:
-            df.to_parquet(buf)
-            buf.seek(0)
-            self.file("dataframe.parquet").write(buf.read(), TransactionType.SNAPSHOT)
-        self.client.put_schema(self, pandas_to_foundry_schema(df))
+        Returns: The content of the Dataset at the current view as a DuckDB relation that scans the Arrow stream of
+        results without copying it. The stream can only be read once, so the relation can only be executed once.
+        Requires `duckdb` to be installed, e.g. through the `duckdb` extra of this package.
 
+        Args:
+            connection: The DuckDB connection to create the relation in, by default DuckDB's default in memory
+                database. The relation can only be executed while the connection is open.
+        """
+        stream = self.client.read_dataset_stream(self.locator)
+        if connection is None:
+            import duckdb
+
+            # a relation does not keep its connection open, unlike the default connection of module level relations
+            return duckdb.from_arrow(stream)
+        return connection.from_arrow(stream)
+
+    @traced
+    def query_local(
+        self, sql: str, cache: "FileCache" = None, max_workers: int = 8
+    ) -> "pa.Table":
+        """
+        Runs a SQL query with an embedded DuckDB engine over the parquet files in the :prop:`view`, which are downloaded
+        into a local cache first. Only the columns and row groups needed by the query are read, and files already in
+        the cache are not downloaded again, so repeated queries against the same view run locally without a round trip
+        to Foundry. Requires `duckdb` to be installed, e.g. through the `duckdb` extra of this package.
+
+        Args:
+            sql: The query, in which the Dataset is the table `ds`.
+            cache: The cache to download files into, by default under `~/.palantir/cache/datasets`.
+            max_workers: The maximum number of files downloaded at once.
+
+        Returns: The result of the query as an Apache Arrow :class:`pa.Table`.
+
+        Examples:
+            >>> ds.query_local("SELECT word, count(*) AS n FROM ds WHERE id > 10 GROUP BY word")
+        """
+        import duckdb
+
+        from palantir.datasets.cache import FileCache
+
+        cache = cache or FileCache()
+        files = [file for file in self.list_files() if file.path.endswith(".parquet")]
+        if not files:
+            raise ValueError(f"no parquet files in the view of dataset {self.rid}")
+        with ThreadPoolExecutor(max_workers) as executor:
+            futures = [
+                executor.submit(tracing.in_current_context(cache.get), file)
+                for file in files
+            ]
+            paths = [str(future.result()) for future in futures]
+        connection = duckdb.connect()
+        # duckdb reads a list of files too, although its type stubs only declare a single glob
+        connection.read_parquet(cast(Any, paths)).create_view("ds")
+        return connection.sql(sql).fetch_arrow_table()
+
+    @traced
+    def write_pandas(
+        self, df: "pd.DataFrame", mode: str = "snapshot", max_workers: int = 4
+    ) -> None:
+        """
+        Writes the content of the provided DataFrame to the Dataset. Uses parquet as a serialization format.
+
+        In "snapshot" mode, the DataFrame replaces the content of the Dataset in a new Snapshot transaction and the
+        schema of the Dataset is updated based on the type information of the DataFrame. In "append" and "update"
+        modes, the DataFrame is written as a new uniquely named part file in an Append or Update transaction, so the
+        cost of the write is proportional to the new data only. The DataFrame must then have the same columns and
+        types as the existing schema of the Dataset, which is kept.
+
+        A DataFrame larger than an upload chunk is encoded in row groups while the chunks encoded so far are uploaded
+        on other threads, so that the write takes about as long as the slower of encoding and uploading rather than
+        their sum.
+
+        Args:
+            df: a Pandas :class:`pd.DataFrame`
+            mode: One of "snapshot", "append" or "update". Defaults to "snapshot".
+            max_workers: The maximum number of chunks of a large DataFrame uploaded at once.
+
+        Raises:
+            SchemaMismatchError: If the DataFrame is incompatible with the existing schema in "append" or "update"
+                mode.
+        """
+        modes = {
+            "snapshot": TransactionType.SNAPSHOT,
+            "append": TransactionType.APPEND,
+            "update": TransactionType.UPDATE,
+        }
+        if mode not in modes:
+            raise ValueError(
+                f"unsupported mode '{mode}', expected one of {list(modes)}"
+            )
+        schema = pandas_to_foundry_schema(df)
+        path = "dataframe.parquet"
+        if mode != "snapshot":
+            existing = self.client.get_schema(self.locator)
+            if existing is not None:
+                if not is_compatible(existing, schema):
+                    raise SchemaMismatchError(self.locator, existing, schema)
+                schema = existing
+            path = f"part-{uuid.uuid4()}.parquet"
+        chunk_size = self.client.chunk_sizer.chunk_size(0)
+        # string and other object columns only count their pointers unless measured deeply
+        if df.memory_usage(deep=True).sum() < chunk_size:
+            with io.BytesIO() as buf:
+                df.to_parquet(buf)
+                buf.seek(0)
+                self.file(path).write(buf.read(), modes[mode])
+        else:
+            file = self.file(path)
+            with self.client.start_transaction(self, modes[mode]) as txn:
+                self.client.put_file_chunks(
+                    file.locator().with_updated(end_ref=str(txn.rid)),
+                    parquet_chunks(df, chunk_size),
+                    max_workers,
+                )
+        self.client.put_schema(self, schema)
+
+    @traced
     def start_transaction(
         self, txn_type: Union[str, TransactionType] = None
     ) -> "Transaction":
@@ -149,6 +722,28 @@ class Dataset:
         )
         return self.client.start_transaction(self, _txn_type)
 
+    @traced
+    def transaction(
+        self, transaction_rid: Union[str, ResourceIdentifier]
+    ) -> "Transaction":
+        """
+        Returns an existing Transaction on the Dataset, e.g. to resume writing to a transaction left open by a process
+        that died, see :class:`palantir.datasets.journal.UploadJournal`.
+
+        Args:
+            transaction_rid: The Resource Identifier of the transaction.
+
+        Returns:
+            A :class:`Transaction` object that can be used to manage the lifecyle of the Transaction.
+        """
+        return self.client.get_transaction(
+            self,
+            transaction_rid
+            if isinstance(transaction_rid, ResourceIdentifier)
+            else ResourceIdentifier.from_string(transaction_rid),
+        )
+
+    @traced
     def update_view(
         self,
         transaction_range: Tuple[str, str] = None,
@@ -159,22 +754,62 @@ class Dataset:
         Args:
             transaction_range: A tuple containing a start and end transaction rid.
         """
-        (
-            start_transaction_rid,
-            end_transaction_rid,
-        ) = (
-            transaction_range
-            if transaction_range is not None
-            else self.client.get_transaction_range(self.rid, self.branch)
-        )
-        self.locator = self.locator.with_updated(
-            start_transaction_rid=ResourceIdentifier.from_string(start_transaction_rid)
-            if start_transaction_rid
-            else None,
-            end_transaction_rid=ResourceIdentifier.from_string(end_transaction_rid)
-            if end_transaction_rid
-            else None,
-        )
+        # the latest view is fetched under the lock, so that a transaction committed meanwhile is not overwritten
+        # with the older view
+        with self._lock:
+            (
+                start_transaction_rid,
+                end_transaction_rid,
+            ) = (
+                transaction_range
+                if transaction_range is not None
+                else self.client.get_transaction_range(self.rid, self.branch)
+            )
+            self._update_locator(
+                start_transaction_rid=ResourceIdentifier.from_string(
+                    start_transaction_rid
+                )
+                if start_transaction_rid
+                else None,
+                end_transaction_rid=ResourceIdentifier.from_string(end_transaction_rid)
+                if end_transaction_rid
+                else None,
+            )
+
+    def _update_locator(self, **changes) -> None:
+        with self._lock:
+            self.locator = self.locator.with_updated(**changes)
+
+    @traced
+    def sync_from(
+        self,
+        local_dir: Union[str, "os.PathLike[str]"],
+        delete: bool = False,
+        checksum: bool = False,
+        max_workers: int = 8,
+    ) -> SyncResult:
+        """
+        Mirrors a local directory into the Dataset. Files that are new or changed are uploaded in an UPDATE
+        transaction, unchanged files are not transferred. Hidden files, i.e. with a path component starting with "." or
+        "_", are not synced.
+
+        A file is changed if its size differs from the file in the latest view of the Dataset. With `checksum`, a file
+        of the same size is also changed if its SHA-256 hash differs from the one recorded by a previous sync; the
+        hashes of uploaded files are stored in the record of the transaction.
+
+        Args:
+            local_dir: The directory to mirror, file paths in the Dataset are relative to it.
+            delete: Whether to remove files that are not in the local directory from the Dataset, in a DELETE
+                transaction.
+            checksum: Whether to compare content hashes of files of the same size.
+            max_workers: The maximum number of files to upload at the same time.
+
+        Returns:
+            A :class:`SyncResult` with the paths of uploaded and deleted files.
+        """
+        from palantir.datasets.sync import sync_from
+
+        return sync_from(self, local_dir, delete, checksum, max_workers)
 
     def __repr__(self):
         return f'Dataset(rid="{self.locator.rid}", branch="{self.locator.branch_id}")'
@@ -188,32 +823,36 @@ class Transaction:
         status: TransactionStatus,
         txn_type: TransactionType,
         client: "DatasetsClient",
+        record: Dict[str, Any] = None,
     ):
         self.dataset = dataset
         self.rid = rid
         self.status = status
         self.txn_type = txn_type
-        self.client = client or DatasetsClient(DatasetServices(context()))
+        self.client = client or default_client()
+        # metadata stored with the transaction when it is committed
+        self.record: Dict[str, Any] = record if record is not None else {}
 
+    @traced
     def commit(self) -> None:
         """Commits the open transaction, updates the attached :class:`Dataset` object's view range."""
         self.client.commit_transaction(self)
         self.status = TransactionStatus.COMMITTED
         if self.txn_type == TransactionType.SNAPSHOT:
-            self.dataset.locator = self.dataset.locator.with_updated(
+            self.dataset._update_locator(
                 start_transaction_rid=self.rid,
                 end_transaction_rid=self.rid,
             )
         else:
-            self.dataset.locator = self.dataset.locator.with_updated(
-                end_transaction_rid=self.rid
-            )
+            self.dataset._update_locator(end_transaction_rid=self.rid)
 
+    @traced
     def abort(self) -> None:
         """Aborts the open transaction."""
         self.client.abort_transaction(self)
         self.status = TransactionStatus.ABORTED
 
+    @traced
     def write(self, path: str, content: bytes) -> None:
         """
         Writes content to a file in the transaction.
@@ -229,6 +868,60 @@ class Transaction:
         )
         self.client.put_file(file, content)
 
+    @traced
+    def write_many(
+        self,
+        files: Union[Mapping[str, bytes], Iterable[Tuple[str, bytes]]],
+        max_workers: int = 8,
+    ) -> None:
+        """
+        Writes many files to the transaction concurrently. Like :meth:`write`, large files are uploaded in chunks and
+        concatenated.
+
+        If an upload fails, no further uploads are started and the error is raised once the uploads in progress have
+        finished. Used within the transaction's context manager, the transaction is then aborted.
+
+        Args:
+            files: A mapping, or an iterable of pairs, from the path of each file to its binary content. An iterable is
+                consumed lazily, so that only the files being uploaded are held in memory.
+            max_workers: The maximum number of files to upload at the same time.
+
+        Examples:
+            >>> with ds.start_transaction() as txn:
+            ...     txn.write_many({f"part-{i}.csv": content for i, content in enumerate(parts)})
+        """
+        items = files.items() if isinstance(files, Mapping) else files
+        pending: Set[Future] = set()
+        with ThreadPoolExecutor(max_workers) as executor:
+            try:
+                for path, content in items:
+                    if len(pending) >= max_workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            future.result()
+                    pending.add(
+                        executor.submit(
+                            tracing.in_current_context(self.write), path, content
+                        )
+                    )
+                for future in pending:
+                    future.result()
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+
+    @traced
+    def delete(self, paths: Iterable[str]) -> None:
+        """
+        Removes files from the dataset view once the transaction is committed. The transaction must be of type
+        `TransactionType.DELETE`.
+
+        Args:
+            paths: The paths of the files to remove.
+        """
+        self.client.delete_files(self, list(paths))
+
     def __enter__(self):
         return self
 
@@ -249,70 +942,3 @@ class Transaction:
 
     def __repr__(self) -> str:
         return f"Transaction(rid='{self.rid}', dataset_rid='{self.dataset.locator.rid}', type={self.txn_type}, status={self.status})"
-
-
-class File:
-    def __init__(
-        self,
-        dataset: Dataset,
-        path: str,
-        modified: datetime = None,
-        transaction_rid: ResourceIdentifier = None,
-        length: int = None,
-        client: "DatasetsClient" = None,
-    ):
-        self.dataset = dataset
-        self.path = path
-        self.modified = modified
-        self.transaction_rid = transaction_rid
-        self.length = length
-        self.client = client or DatasetsClient(DatasetServices(context()))
-
-    def locator(self):
-        return FileLocator(
-            dataset_rid=self.dataset.rid,
-            end_ref=str(self.transaction_rid)
-            if self.transaction_rid
-            else self.dataset.branch,
-            logical_path=self.path,
-        )
-
-    def read(self) -> io.IOBase:
-        """Returns: A binary stream of the file content."""
-        return self.client.read_file(self.locator())
-
-    def write(
-        self,
-        content: bytes,
-        txn_type: Union[str, TransactionType] = TransactionType.UPDATE,
-    ):
-        """
-        Writes the specified content to the File in a new transaction. Automatically commits the transaction, updating
-        the view on the parent :class:`Dataset` object.
-
-        Args:
-            content: Binary content to upload.
-            txn_type: Transaction Type, Defaults to `TransactionType.UPDATE`.
-        """
-        with self.client.start_transaction(
-            self.dataset,
-            txn_type
-            if isinstance(txn_type, TransactionType)
-            else TransactionType[txn_type.upper()],
-        ) as txn:
-            self.client.put_file(
-                self.locator().with_updated(end_ref=str(txn.rid)), content
-            )
-
-    def __repr__(self):
-        return f'File(dataset_rid="{self.dataset.rid}", path="{self.path}")'
-
-    def __eq__(self, other: object) -> bool:
-        return other is self or (
-            isinstance(other, File)
-            and other.dataset == self.dataset
-            and other.path == self.path
-            and other.modified == self.modified
-            and other.transaction_rid == self.transaction_rid
-            and other.client == self.client
-        )
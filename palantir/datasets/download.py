@@ -0,0 +1,133 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import http.client
+import io
+import time
+from typing import Any, Callable, Optional
+
+
+class ResumableStream(io.RawIOBase):
+    """
+    A binary stream of file content that tracks the bytes received and, when the connection drops, reconnects with a
+    Range request from the last byte received, so that a long download continues rather than restarting from the
+    first byte. The content is also reread from where it stopped if the connection closes before `length` bytes have
+    been received.
+    """
+
+    def __init__(
+        self,
+        open_at: Callable[[int], io.BufferedIOBase],
+        length: int,
+        max_retries: int = 5,
+        retry_interval: float = 1.0,
+    ):
+        """
+        Args:
+            open_at: Opens a stream of the content from the given offset, which is read into buffers.
+            length: The length of the content.
+            max_retries: The maximum number of consecutive reconnections without receiving any content.
+            retry_interval: The interval before the first reconnection, doubled for each consecutive reconnection.
+        """
+        super().__init__()
+        self.length = length
+        self.position = 0
+        self.max_retries = max_retries
+        self.retry_interval = retry_interval
+        self._open_at = open_at
+        self._stream: Optional[io.BufferedIOBase] = None
+        self._retries = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        view = memoryview(buffer).cast("B")
+        if not view or self.position >= self.length:
+            return 0
+        while True:
+            try:
+                if self._stream is None:
+                    self._stream = self._open_at(self.position)
+                num_bytes = self._stream.readinto(view) or 0
+            except Exception as exc:  # pylint: disable=broad-except
+                if not _is_retryable(exc):
+                    raise
+                self._reconnect(exc)
+                continue
+            if not num_bytes:
+                self._reconnect(
+                    EOFError(
+                        f"connection closed after {self.position} of {self.length} bytes"
+                    )
+                )
+                continue
+            self._retries = 0
+            self.position += num_bytes
+            if self.position > self.length:
+                raise IOError(
+                    f"received {self.position} bytes, more than the length of {self.length} bytes"
+                )
+            return num_bytes
+
+    def close(self) -> None:
+        self._close_stream()
+        super().close()
+
+    def _reconnect(self, exc: BaseException) -> None:
+        self._close_stream()
+        if self._retries >= self.max_retries:
+            raise exc
+        time.sleep(self.retry_interval * 2**self._retries)
+        self._retries += 1
+
+    def _close_stream(self) -> None:
+        if self._stream is not None:
+            try:
+                self._stream.close()
+            except Exception as exc:  # pylint: disable=broad-except
+                if not _is_retryable(exc):
+                    raise
+            finally:
+                self._stream = None
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """
+    Returns: Whether an error is transient, i.e. a dropped or refused connection, a timeout, a truncated response or
+    a 5xx response. Other errors, such as 4xx responses or a missing file, are permanent.
+    """
+    from requests.exceptions import (
+        ChunkedEncodingError,
+        ConnectionError as RequestsConnectionError,
+        HTTPError,
+        Timeout,
+    )
+    from urllib3.exceptions import ProtocolError, TimeoutError as Urllib3TimeoutError
+
+    if isinstance(exc, HTTPError):
+        return exc.response is not None and exc.response.status_code >= 500
+    return isinstance(
+        exc,
+        (
+            ConnectionError,
+            TimeoutError,
+            http.client.IncompleteRead,
+            RequestsConnectionError,
+            ChunkedEncodingError,
+            Timeout,
+            ProtocolError,
+            Urllib3TimeoutError,
+        ),
+    )
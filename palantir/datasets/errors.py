@@ -14,7 +14,7 @@
 
 from typing import TYPE_CHECKING
 
-from palantir.datasets.types import DatasetLocator
+from palantir.datasets.types import DatasetLocator, FoundrySchema
 
 if TYPE_CHECKING:
     from palantir.datasets.core import Transaction
@@ -34,3 +34,26 @@ class TransactionAbortedError(Exception):
             f"Transaction '{txn.rid}' on '{txn.dataset.rid}' aborted due to error"
         )
         self.txn = txn
+
+
+class SchemaMismatchError(Exception):
+    def __init__(
+        self, locator: DatasetLocator, existing: FoundrySchema, new: FoundrySchema
+    ):
+        existing_types = {field.name: field.type for field in existing.fields}
+        new_types = {field.name: field.type for field in new.fields}
+        # the names of schema fields are optional, although columns are always named
+        mismatched = sorted(
+            (
+                name
+                for name in existing_types.keys() | new_types.keys()
+                if existing_types.get(name) != new_types.get(name)
+            ),
+            key=lambda name: name or "",
+        )
+        super().__init__(
+            f"Schema is incompatible with the existing schema of '{locator.rid}' in columns {mismatched}"
+        )
+        self.locator = locator
+        self.existing = existing
+        self.new = new
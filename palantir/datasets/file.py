@@ -0,0 +1,275 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import io
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Union, cast
+
+from palantir.core import context
+from palantir.core import tracing
+from palantir.core.tracing import traced
+from palantir.core.types import ResourceIdentifier
+from palantir.core.util import atomic_write
+from palantir.datasets.types import FileLocator, TransactionType
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+    from palantir.datasets.client import DatasetsClient
+    from palantir.datasets.core import Dataset
+
+# the largest slice of a buffer read into at once by `File.read_into`
+_READ_INTO_SIZE = 1024 * 1024
+
+
+class File:
+    def __init__(
+        self,
+        dataset: "Dataset",
+        path: str,
+        modified: datetime = None,
+        transaction_rid: ResourceIdentifier = None,
+        length: int = None,
+        client: "DatasetsClient" = None,
+    ):
+        self.dataset = dataset
+        self.path = path
+        self.modified = modified
+        self.transaction_rid = transaction_rid
+        self.length = length
+        self.client = client or default_client()
+
+    def locator(self):
+        return FileLocator(
+            dataset_rid=self.dataset.rid,
+            end_ref=str(self.transaction_rid)
+            if self.transaction_rid
+            else self.dataset.branch,
+            logical_path=self.path,
+        )
+
+    def read(self) -> io.IOBase:
+        """Returns: A binary stream of the file content, whose span lasts until the stream is closed."""
+        read_span = None
+        try:
+            with tracing.span("File.read", end_on_exit=False) as read_span:
+                stream = self.client.read_file(self.locator())
+        except BaseException:
+            tracing.end(read_span)
+            raise
+        return cast(io.IOBase, _TracedStream(stream, read_span))
+
+    @traced
+    def read_into(self, buffer: Any) -> int:
+        """
+        Reads the file content into a preallocated buffer, in slices of at most 1 MiB, so that at most one slice of the
+        content is held in memory besides the buffer.
+
+        Args:
+            buffer: A writable object supporting the buffer protocol, e.g. a `bytearray`, a numpy array or a mutable
+                pyarrow buffer, of at least the length of the file.
+
+        Returns: The number of bytes read, i.e. the length of the file.
+
+        Raises:
+            ValueError: If the file is larger than the buffer.
+        """
+        view = memoryview(buffer).cast("B")
+        # the http responses and local files returned by the services both read into buffers
+        stream = cast(io.BufferedIOBase, self.read())
+        try:
+            total = 0
+            while total < len(view):
+                # http responses read the requested number of bytes and copy them in, so reads are bounded
+                num_bytes = stream.readinto(view[total : total + _READ_INTO_SIZE])
+                if not num_bytes:
+                    return total
+                total += num_bytes
+            if stream.read(1):
+                raise ValueError(
+                    f"file '{self.path}' is larger than the buffer of {len(view)} bytes"
+                )
+            return total
+        finally:
+            stream.close()
+
+    @traced
+    def read_arrow_buffer(self) -> "pa.Buffer":
+        """
+        Returns: The file content in a pyarrow :class:`pa.Buffer` that is allocated once for the length of the file and
+        read into directly.
+        """
+        import pyarrow as pa
+
+        length = self.length if self.length is not None else self._resolve_length()
+        buffer = pa.allocate_buffer(length)
+        num_bytes = self.read_into(buffer)
+        return buffer if num_bytes == length else buffer.slice(0, num_bytes)
+
+    @traced
+    def read_resumable(
+        self, max_retries: int = 5, retry_interval: float = 1.0
+    ) -> io.BufferedReader:
+        """
+        Returns a binary stream of the file content that reconnects when the connection drops, requesting the content
+        from the last byte received, so that long transfers over unreliable connections do not restart from the first
+        byte. The content is read from the transaction that wrote the file, and the number of bytes received is
+        verified against the length of the file.
+
+        Args:
+            max_retries: The maximum number of consecutive reconnections without receiving any content.
+            retry_interval: The interval in seconds before the first reconnection, doubled for each consecutive
+                reconnection.
+        """
+        from palantir.datasets.download import ResumableStream
+
+        file = (
+            self if self.transaction_rid and self.length is not None else self._listed()
+        )
+        if file.length is None:
+            raise ValueError(f"could not resolve the length of file '{self.path}'")
+        locator = file.locator()
+        return io.BufferedReader(
+            ResumableStream(
+                lambda offset: cast(
+                    io.BufferedIOBase, self.client.read_file(locator, offset)
+                ),
+                file.length,
+                max_retries,
+                retry_interval,
+            ),
+            buffer_size=1024 * 1024,
+        )
+
+    @traced
+    def download(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        max_retries: int = 5,
+        retry_interval: float = 1.0,
+    ) -> Path:
+        """
+        Downloads the file content to a local path with :meth:`read_resumable`. The content is written to a temporary
+        file next to the path and moved into place once complete, so that an interrupted download never leaves a
+        partial file at the path.
+
+        Args:
+            path: The local path to download to.
+            max_retries: The maximum number of consecutive reconnections without receiving any content.
+            retry_interval: The interval in seconds before the first reconnection, doubled for each consecutive
+                reconnection.
+
+        Returns: The local path.
+        """
+        path = Path(path)
+        with self.read_resumable(max_retries, retry_interval) as source, atomic_write(
+            path
+        ) as target:
+            shutil.copyfileobj(source, target, 1024 * 1024)
+        return path
+
+    def _resolve_length(self) -> int:
+        file = self._listed()
+        if file.length is None:
+            raise ValueError(f"could not resolve the length of file '{self.path}'")
+        return file.length
+
+    def _listed(self) -> "File":
+        """Returns: The file as listed in the view of the dataset, with its transaction and length."""
+        for file in self.client.list_files(self.dataset, path=self.path):
+            if file.path == self.path:
+                return file
+        raise FileNotFoundError(
+            f"file '{self.path}' not found in dataset {self.dataset.rid}"
+        )
+
+    @traced
+    def write(
+        self,
+        content: bytes,
+        txn_type: Union[str, TransactionType] = TransactionType.UPDATE,
+    ):
+        """
+        Writes the specified content to the File in a new transaction. Automatically commits the transaction, updating
+        the view on the parent :class:`Dataset` object.
+
+        Args:
+            content: Binary content to upload.
+            txn_type: Transaction Type, Defaults to `TransactionType.UPDATE`.
+        """
+        with self.client.start_transaction(
+            self.dataset,
+            txn_type
+            if isinstance(txn_type, TransactionType)
+            else TransactionType[txn_type.upper()],
+        ) as txn:
+            self.client.put_file(
+                self.locator().with_updated(end_ref=str(txn.rid)), content
+            )
+
+    def __repr__(self):
+        return f'File(dataset_rid="{self.dataset.rid}", path="{self.path}")'
+
+    def __eq__(self, other: object) -> bool:
+        return other is self or (
+            isinstance(other, File)
+            and other.dataset == self.dataset
+            and other.path == self.path
+            and other.modified == self.modified
+            and other.transaction_rid == self.transaction_rid
+            and other.client == self.client
+        )
+
+
+class _TracedStream:
+    """A stream that ends the span of the read it was returned by when it is closed."""
+
+    def __init__(self, stream: Any, read_span: Any):
+        self._stream = stream
+        self._span = read_span
+        self._ended = False
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
+
+    def __iter__(self):
+        return iter(self._stream)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            if not self._ended:
+                self._ended = True
+                tracing.end(self._span)
+
+
+def read_all(file: "File") -> bytes:
+    with file.read() as stream:
+        return stream.read()
+
+
+def default_client() -> "DatasetsClient":
+    # imported lazily, the client pulls in the rpc bindings and their http dependencies
+    from palantir.datasets.client import DatasetsClient, dataset_services
+
+    return DatasetsClient(dataset_services(context()))
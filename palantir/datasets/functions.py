@@ -16,8 +16,11 @@ from typing import Tuple
 
 from palantir.core import context
 from palantir.core.types import PalantirContext, ResourceIdentifier
-from palantir.datasets.client import DatasetsClient, DatasetServices
+from palantir.datasets.chunking import ChunkSizer
+from palantir.datasets.client import DatasetsClient, dataset_services
 from palantir.datasets.core import Dataset
+from palantir.datasets.journal import UploadJournal
+from palantir.datasets.manifest import ManifestIndex
 from palantir.datasets.types import DatasetLocator
 
 
@@ -27,6 +30,10 @@ def dataset(
     transaction_range: Tuple[str, str] = None,
     create: bool = False,
     ctx: PalantirContext = None,
+    compression: str = None,
+    upload_journal: UploadJournal = None,
+    chunk_sizer: ChunkSizer = None,
+    manifest_index: ManifestIndex = None,
 ) -> "Dataset":
     """
     Constructs a new Dataset object from the provided reference.
@@ -37,6 +44,14 @@ def dataset(
         transaction_range: A tuple containing a start and end transaction rid.
         create: Whether to create the Dataset if it does not already exist.
         ctx: An optional :class:`PalantirContext` (see :func:`palantir.core.context`) to override environment defaults.
+        compression: An optional transfer compression for file uploads and downloads, "gzip" or "zstd". Uploads are
+            sent compressed without checking that the Foundry stack accepts the encoding, see :class:`DatasetsClient`.
+        upload_journal: An optional journal that makes uploads of large files resumable, see
+            :class:`palantir.datasets.journal.UploadJournal`.
+        chunk_sizer: An optional policy for the size of the chunks large files are uploaded in, see
+            :class:`palantir.datasets.chunking.ChunkSizer`.
+        manifest_index: An optional persistent local index of the files in the views of Datasets, so that listing a
+            view again only requests the files written since, see :class:`palantir.datasets.manifest.ManifestIndex`.
 
     Returns: A :class:`Dataset` object resolved to the view at the specified transaction range or at the latest
     transaction range at the time of initialization.
@@ -46,7 +61,13 @@ def dataset(
 
         >>> dataset("ri.foundry.main.dataset.3bb94822-d16f-4094-9834-f79a61a29859")
     """
-    client = DatasetsClient(DatasetServices(ctx or context()))
+    client = DatasetsClient(
+        dataset_services(ctx or context()),
+        compression,
+        upload_journal,
+        chunk_sizer,
+        manifest_index,
+    )
     rid = client.get_dataset(dataset_ref)
     branch_id = branch or "master"
     if not rid:
@@ -0,0 +1,134 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import json
+import os
+import threading
+from dataclasses import dataclass
+from os.path import relpath
+from pathlib import Path
+from typing import Any, Dict, List, Tuple, Union
+
+from palantir.core.types import ResourceIdentifier
+from palantir.core.util import atomic_write
+from palantir.datasets.types import FileLocator
+
+
+@dataclass(frozen=True)
+class JournalEntry:
+    """A chunk of a file uploaded to an open transaction, see :class:`UploadJournal`."""
+
+    index: int
+    size: int
+    sha256: str
+
+
+class UploadJournal:
+    """
+    A local record of the chunks of large files uploaded to open transactions. Files larger than the chunk size are
+    uploaded as chunks which are concatenated once all are uploaded. If the process dies during the upload, the chunks
+    already uploaded remain in the open transaction, and uploading the same file to the same transaction again with the
+    same journal only sends the chunks that are missing or differ.
+
+    The journal is appended to as each chunk is uploaded, so that a crash loses at most the chunk in flight. A journal
+    is safe to share between threads but not between processes.
+
+    Examples:
+        >>> journal = UploadJournal("nightly.journal")
+        >>> ds = dataset("/path/to/dataset", upload_journal=journal)
+        >>> pending = journal.transactions(ds.rid)
+        >>> txn = ds.transaction(pending[-1]) if pending else ds.start_transaction()
+        >>> with txn:
+        ...     txn.write("large.bin", content)
+    """
+
+    def __init__(self, path: Union[str, "os.PathLike[str]"]):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def chunks(self, locator: FileLocator) -> Dict[int, JournalEntry]:
+        """Returns: The chunks recorded for the upload of a file to the transaction of the locator, by index."""
+        key = _key(locator)
+        return {
+            entry["index"]: JournalEntry(entry["index"], entry["size"], entry["sha256"])
+            for entry in self._entries()
+            if _entry_key(entry) == key
+        }
+
+    def transactions(
+        self, dataset_rid: Union[str, ResourceIdentifier]
+    ) -> List[ResourceIdentifier]:
+        """Returns: The transactions of the dataset with incomplete uploads, in the order they were first recorded."""
+        rids: Dict[str, None] = {}
+        for entry in self._entries():
+            if entry["datasetRid"] == str(dataset_rid):
+                rids.setdefault(entry["transactionRid"])
+        return [ResourceIdentifier.from_string(rid) for rid in rids]
+
+    def record(self, locator: FileLocator, entry: JournalEntry) -> None:
+        """Records that a chunk of the file has been uploaded."""
+        dataset_rid, transaction_rid, logical_path = _key(locator)
+        line = json.dumps(
+            {
+                "datasetRid": dataset_rid,
+                "transactionRid": transaction_rid,
+                "path": logical_path,
+                "index": entry.index,
+                "size": entry.size,
+                "sha256": entry.sha256,
+            }
+        )
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(line + "\n")
+                file.flush()
+                os.fsync(file.fileno())
+
+    def complete(self, locator: FileLocator) -> None:
+        """Removes the chunks of a file once they have been concatenated, replacing the journal atomically."""
+        key = _key(locator)
+        with self._lock:
+            entries = [entry for entry in self._entries() if _entry_key(entry) != key]
+            if not entries:
+                self.path.unlink(missing_ok=True)
+                return
+            with atomic_write(self.path, "w", encoding="utf-8") as file:
+                file.write("".join(json.dumps(entry) + "\n" for entry in entries))
+
+    def _entries(self) -> List[Dict[str, Any]]:
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            return []
+        entries = []
+        for line in lines:
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                # the last line is incomplete if the process died while writing it
+                continue
+        return entries
+
+
+def _key(locator: FileLocator) -> Tuple[str, str, str]:
+    return (
+        str(locator.dataset_rid),
+        str(locator.end_ref),
+        relpath(locator.logical_path),
+    )
+
+
+def _entry_key(entry: Dict[str, Any]) -> Tuple[str, str, str]:
+    return entry["datasetRid"], entry["transactionRid"], entry["path"]
@@ -0,0 +1,209 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Listing of the files in a view page by page, see :meth:`palantir.datasets.client.DatasetsClient.list_files`. A listing
+is either paged through in path order, or split into range shards whose pages are requested concurrently.
+"""
+
+import collections
+import functools
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from palantir.core import tracing
+from palantir.datasets.patterns import catalog_order
+from palantir.datasets.rpc.catalog import FileResource, FileResourcesPage
+
+# the largest page of files the catalog serves
+MAX_PAGE_SIZE = 1000
+_INITIAL_PAGE_SIZE = 100
+# pages grow while they are served within this time, and shrink again if they take much longer
+_PAGE_TARGET_SECONDS = 1.0
+# more shards than workers, so that workers are kept busy while the shards of uneven size finish
+_SHARDS_PER_WORKER = 4
+# sorts after any logical path starting with a given prefix, in the catalog's utf-16 order
+_MAX_CHAR = "\uffff"
+
+# requests a page of the files under a logical path, of a page size from a page start, and returns it with the
+# seconds it took to be served
+ListPage = Callable[
+    [Optional[str], int, Optional[str]], Tuple[FileResourcesPage, float]
+]
+
+
+@dataclass
+class _Shard:
+    """A range of the files under a path prefix listed page by page, from `page_start` until a path reaches `upper`."""
+
+    logical_path: Optional[str]
+    page_start: Optional[str]
+    upper: Optional[str]
+    page_size: int
+
+
+def list_pages(
+    list_page: ListPage,
+    logical_paths: Sequence[Optional[str]],
+    page_size: Optional[int],
+) -> Iterator[FileResource]:
+    """Lists the files under each logical path in turn, in path order, one page after the other."""
+    for logical_path in logical_paths:
+        size = page_size or _INITIAL_PAGE_SIZE
+        page_start = None
+        while True:
+            page, seconds = list_page(logical_path, size, page_start)
+            yield from page.values
+            if page.next_page_token is None:
+                break
+            page_start = page.next_page_token
+            if page_size is None:
+                size = _next_page_size(size, page, seconds)
+
+
+def list_shards(
+    list_page: ListPage,
+    logical_paths: Sequence[Optional[str]],
+    page_size: Optional[int],
+    max_workers: int,
+    shards: Optional[Sequence[str]],
+) -> Iterator[FileResource]:
+    """
+    Lists the files under the logical paths in range shards on `max_workers` threads, yielding the files of each page
+    as it arrives. Each shard is listed from its lower bound until a path reaches the next shard, one page at a time,
+    and its next page is only requested once the page before has been consumed.
+    """
+    queued: Deque[_Shard] = collections.deque(
+        _shards(list_page, logical_paths, page_size, max_workers, shards)
+    )
+    pending: Dict[Future, _Shard] = {}
+    with ThreadPoolExecutor(max_workers) as executor:
+        try:
+            while queued or pending:
+                while queued and len(pending) < max_workers:
+                    shard = queued.popleft()
+                    pending[
+                        executor.submit(
+                            tracing.in_current_context(list_page),
+                            shard.logical_path,
+                            shard.page_size,
+                            shard.page_start,
+                        )
+                    ] = shard
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    shard = pending.pop(future)
+                    page, seconds = future.result()
+                    yield from _shard_files(shard, page)
+                    if _advance(shard, page, seconds, page_size is None):
+                        queued.append(shard)
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _shards(
+    list_page: ListPage,
+    logical_paths: Sequence[Optional[str]],
+    page_size: Optional[int],
+    max_workers: int,
+    shards: Optional[Sequence[str]],
+) -> Iterator[_Shard]:
+    for logical_path in logical_paths:
+        if shards is not None:
+            points = sorted(
+                {point for point in shards if point.startswith(logical_path or "")},
+                key=catalog_order,
+            )
+        elif len(logical_paths) == 1:
+            points = _split_points(
+                functools.partial(list_page, logical_path),
+                _SHARDS_PER_WORKER * max_workers,
+            )
+        else:
+            points = []
+        lowers: List[Optional[str]] = [None, *points]
+        uppers: List[Optional[str]] = [*points, None]
+        for lower, upper in zip(lowers, uppers):
+            yield _Shard(logical_path, lower, upper, page_size or _INITIAL_PAGE_SIZE)
+
+
+def _shard_files(shard: _Shard, page: FileResourcesPage) -> Iterator[FileResource]:
+    """Yields the files of a page of the shard, until a path reaches the next shard."""
+    for file in page.values:
+        if _reaches(file.logical_path, shard.upper):
+            return
+        yield file
+
+
+def _advance(
+    shard: _Shard, page: FileResourcesPage, seconds: float, adaptive: bool
+) -> bool:
+    """Moves the shard past a page, returning whether it has more pages to list."""
+    if page.next_page_token is None or (
+        page.values and _reaches(page.values[-1].logical_path, shard.upper)
+    ):
+        return False
+    shard.page_start = page.next_page_token
+    if adaptive:
+        shard.page_size = _next_page_size(shard.page_size, page, seconds)
+    return True
+
+
+def _reaches(logical_path: str, upper: Optional[str]) -> bool:
+    return upper is not None and catalog_order(logical_path) >= catalog_order(upper)
+
+
+def _next_page_size(page_size: int, page: FileResourcesPage, seconds: float) -> int:
+    if len(page.values) < page_size:
+        return page_size
+    if seconds < _PAGE_TARGET_SECONDS:
+        return min(page_size * 2, MAX_PAGE_SIZE)
+    if seconds > 2 * _PAGE_TARGET_SECONDS:
+        return max(page_size // 2, _INITIAL_PAGE_SIZE)
+    return page_size
+
+
+def _split_points(
+    list_page: Callable[[int, Optional[str]], Tuple[FileResourcesPage, float]],
+    max_shards: int,
+) -> List[str]:
+    """
+    Discovers logical paths to split a listing at with single-file pages: the paths share the longest prefix of the
+    first path that no path sorts beyond, and are split at each distinct character following that prefix, e.g. at
+    each partition of a partitioned layout.
+    """
+
+    def _first_path(page_start: Optional[str]) -> Optional[str]:
+        values = list_page(1, page_start)[0].values
+        return values[0].logical_path if values else None
+
+    first = _first_path(None)
+    if first is None:
+        return []
+    # every path starts with first[:low], and not every path with first[:high + 1]
+    low, high = 0, len(first)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if _first_path(first[:middle] + _MAX_CHAR) is None:
+            low = middle
+        else:
+            high = middle - 1
+    points: List[str] = []
+    path = _first_path(first[: low + 1] + _MAX_CHAR)
+    while path is not None and len(points) < max_shards - 1:
+        points.append(path[: low + 1])
+        path = _first_path(path[: low + 1] + _MAX_CHAR)
+    return points
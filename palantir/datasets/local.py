@@ -0,0 +1,804 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+A local filesystem implementation of the services used by :class:`DatasetsClient`.
+
+Datasets are stored under a root directory with the layout::
+
+    <root>/paths.json                                        dataset path -> rid
+    <root>/<dataset rid>/dataset.json                        branches and their ordered transaction rids
+    <root>/<dataset rid>/transactions/<txn rid>.json         transaction metadata
+    <root>/<dataset rid>/files/<txn rid>/<logical path>      file content written in the transaction
+    <root>/<dataset rid>/schemas/<branch>.json               schemas by end transaction rid
+
+Views are resolved the same way as in Foundry: a view starts at the latest SNAPSHOT transaction (or the requested start
+transaction), UPDATE and APPEND transactions add files on top of earlier ones and DELETE transactions remove them. A
+root directory supports concurrent use from a single process.
+"""
+
+import io
+import json
+import os
+import re
+import shutil
+import threading
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from conjure_python_client import ConjureDecoder, ConjureEncoder
+
+from palantir.core import context
+from palantir.core.types import ResourceIdentifier
+from palantir.core.util import atomic_write
+from palantir.datasets.compression import decompress
+from palantir.datasets.errors import SimultaneousOpenTransactionError
+from palantir.datasets.patterns import catalog_order, is_hidden
+from palantir.datasets.rpc.catalog import (
+    AddFilesToDeleteTransactionRequest,
+    Branch,
+    CatalogService,
+    CloseTransactionRequest,
+    CreateBranchRequest,
+    CreateDatasetRequest,
+    Dataset as ConjureDataset,
+    FileMetadata,
+    FilePathType,
+    FileResource,
+    FileResourcesPage,
+    StartTransactionRequest,
+    Transaction as ConjureTransaction,
+    TransactionRange,
+    TransactionsPage,
+    TransactionStatus as ConjureTransactionStatus,
+    TransactionType as ConjureTransactionType,
+)
+from palantir.datasets.rpc.data_proxy import (
+    ConcatenationTaskStatus,
+    ConcatenationTaskStatusReport,
+    ConcatenationTaskSuccess,
+    DataProxyConcatenationService,
+    DataProxyService,
+    StartConcatenationTaskRequest,
+    StartConcatenationTaskResponse,
+)
+from palantir.datasets.rpc.path import DecoratedResource, PathService
+from palantir.datasets.rpc.schema import (
+    Attribution,
+    FoundrySchema as ConjureFoundrySchema,
+    SchemaService,
+    VersionedFoundrySchema,
+)
+from palantir.datasets.rpc.sql import (
+    QueryStatus,
+    ReadyQueryStatus,
+    SqlExecuteRequest,
+    SqlExecuteResponse,
+    SqlGetStatusResponse,
+    SqlQueryService,
+)
+from palantir.datasets.services import LOCAL_SCHEME, DatasetServices
+from palantir.datasets.types import DatasetLocator
+
+_SELECT_STAR = re.compile(
+    r'SELECT \* FROM "(?P<end_ref>[^"@]+)@(?P<branch>[^"]+)"\."(?P<rid>[^"]+)"'
+)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _new_rid(resource_type: str) -> str:
+    return f"ri.foundry.local.{resource_type}.{uuid.uuid4()}"
+
+
+class LocalDatasetStore:
+    """Reads and writes dataset state under a root directory. See the module documentation for the layout."""
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.RLock()
+
+    def read_json(self, path: Path, default: Any = None) -> Any:
+        """Returns: The JSON document at a path, or the default if given and there is none."""
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            if default is not None:
+                return default
+            raise
+
+    def write_json(self, path: Path, value: Any) -> None:
+        """Atomically replaces the JSON document at a path."""
+        with atomic_write(path, "w", encoding="utf-8") as file:
+            json.dump(value, file)
+
+    def _dataset_dir(self, dataset_rid: str) -> Path:
+        path = self.root / dataset_rid
+        if not path.is_dir():
+            raise ValueError(f"dataset '{dataset_rid}' does not exist")
+        return path
+
+    def file_path(
+        self, dataset_rid: str, transaction_rid: str, logical_path: str
+    ) -> Path:
+        """
+        Returns: The location of the content of a file written in a transaction.
+
+        Raises:
+            ValueError: If the logical path resolves outside of the files of the transaction, e.g. `../x`.
+        """
+        txn_dir = (self._dataset_dir(dataset_rid) / "files" / transaction_rid).resolve()
+        path = (txn_dir / logical_path).resolve()
+        if txn_dir not in path.parents:
+            raise ValueError(
+                f"logical path '{logical_path}' is outside of transaction '{transaction_rid}'"
+            )
+        return path
+
+    def resolve_path(self, path: str) -> Optional[str]:
+        return self.read_json(self.root / "paths.json", {}).get(path)
+
+    def create_dataset(self, path: str) -> str:
+        with self.lock:
+            paths = self.read_json(self.root / "paths.json", {})
+            if path in paths:
+                raise ValueError(f"dataset '{path}' already exists")
+            rid = _new_rid("dataset")
+            (self.root / rid).mkdir(parents=True)
+            self.write_json(self.root / rid / "dataset.json", {"branches": {}})
+            paths[path] = rid
+            self.write_json(self.root / "paths.json", paths)
+            return rid
+
+    def branches(self, dataset_rid: str) -> Dict[str, List[str]]:
+        return self.read_json(self._dataset_dir(dataset_rid) / "dataset.json")[
+            "branches"
+        ]
+
+    def create_branch(self, dataset_rid: str, branch_id: str) -> None:
+        with self.lock:
+            metadata = self.read_json(self._dataset_dir(dataset_rid) / "dataset.json")
+            metadata["branches"].setdefault(branch_id, [])
+            self.write_json(self.root / dataset_rid / "dataset.json", metadata)
+
+    def transaction(self, dataset_rid: str, transaction_rid: str) -> Dict[str, Any]:
+        try:
+            return self.read_json(
+                self._dataset_dir(dataset_rid)
+                / "transactions"
+                / f"{transaction_rid}.json"
+            )
+        except FileNotFoundError as exc:
+            raise ValueError(f"transaction '{transaction_rid}' does not exist") from exc
+
+    def save_transaction(self, txn: Dict[str, Any]) -> None:
+        self.write_json(
+            self._dataset_dir(txn["datasetRid"])
+            / "transactions"
+            / f"{txn['rid']}.json",
+            txn,
+        )
+
+    def start_transaction(
+        self, dataset_rid: str, branch_id: str, record: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        with self.lock:
+            metadata = self.read_json(self._dataset_dir(dataset_rid) / "dataset.json")
+            branch = metadata["branches"].setdefault(branch_id, [])
+            if branch and self.transaction(dataset_rid, branch[-1])["status"] == "OPEN":
+                raise SimultaneousOpenTransactionError(
+                    DatasetLocator(
+                        rid=ResourceIdentifier.from_string(dataset_rid),
+                        branch_id=branch_id,
+                    )
+                )
+            txn: Dict[str, Any] = {
+                "rid": _new_rid("transaction"),
+                "datasetRid": dataset_rid,
+                "branch": branch_id,
+                "type": "APPEND",
+                "status": "OPEN",
+                "startTime": _now(),
+                "closeTime": None,
+                "record": record,
+                "deletedPaths": [],
+            }
+            self.save_transaction(txn)
+            branch.append(txn["rid"])
+            self.write_json(self.root / dataset_rid / "dataset.json", metadata)
+            return txn
+
+    def update_transaction(
+        self, dataset_rid: str, transaction_rid: str, **updates: Any
+    ) -> Dict[str, Any]:
+        with self.lock:
+            txn = self.transaction(dataset_rid, transaction_rid)
+            if txn["status"] != "OPEN":
+                raise ValueError(f"transaction '{transaction_rid}' is not open")
+            txn.update(updates)
+            self.save_transaction(txn)
+            return txn
+
+    def transactions_in_view(
+        self,
+        dataset_rid: str,
+        end_ref: str,
+        start_transaction_rid: Optional[str] = None,
+        include_open: bool = False,
+    ) -> List[Dict[str, Any]]:
+        txns = self.transactions_on_branch(dataset_rid, end_ref, include_open)
+        if start_transaction_rid is not None:
+            start = next(
+                (
+                    i
+                    for i, txn in enumerate(txns)
+                    if txn["rid"] == start_transaction_rid
+                ),
+                len(txns),
+            )
+        else:
+            start = max(
+                (i for i, txn in enumerate(txns) if txn["type"] == "SNAPSHOT"),
+                default=0,
+            )
+        return txns[start:]
+
+    def transactions_on_branch(
+        self, dataset_rid: str, end_ref: str, include_open: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Returns the committed transactions of the branch of the ref, oldest first, up to the ref if it is one."""
+        branches = self.branches(dataset_rid)
+        if end_ref in branches:
+            branch, end_rid = end_ref, None
+        else:
+            branch = self.transaction(dataset_rid, end_ref)["branch"]
+            end_rid = end_ref
+        txns = []
+        for rid in branches[branch]:
+            txn = self.transaction(dataset_rid, rid)
+            if txn["status"] == "COMMITTED" or (
+                txn["status"] == "OPEN" and (include_open or rid == end_rid)
+            ):
+                txns.append(txn)
+            if rid == end_rid:
+                break
+        return txns
+
+    def files_in_view(self, *args, **kwargs) -> Dict[str, Tuple[Path, Dict[str, Any]]]:
+        """Returns a mapping from logical path to the location of its content and the transaction that wrote it."""
+        files: Dict[str, Tuple[Path, Dict[str, Any]]] = {}
+        for txn in self.transactions_in_view(*args, **kwargs):
+            if txn["type"] == "SNAPSHOT":
+                files = {}
+            for logical_path in txn["deletedPaths"]:
+                files.pop(logical_path, None)
+            for logical_path, path in self._transaction_files(txn):
+                files[logical_path] = (path, txn)
+        return files
+
+    def _transaction_files(self, txn: Dict[str, Any]) -> Iterator[Tuple[str, Path]]:
+        txn_dir = self.root / txn["datasetRid"] / "files" / txn["rid"]
+        for dirpath, _, filenames in os.walk(txn_dir):
+            for filename in filenames:
+                path = Path(dirpath) / filename
+                yield path.relative_to(txn_dir).as_posix(), path
+
+
+class LocalCatalogService(CatalogService):
+    def __init__(
+        self, store: LocalDatasetStore
+    ):  # pylint: disable=super-init-not-called
+        self._store = store
+
+    def create_dataset(
+        self, auth_header: str, request: CreateDatasetRequest
+    ) -> ConjureDataset:
+        return ConjureDataset(
+            file_system_id="local", rid=self._store.create_dataset(request.path)
+        )
+
+    def create_branch2(
+        self,
+        auth_header: str,
+        branch_id: str,
+        dataset_rid: str,
+        request: CreateBranchRequest,
+    ) -> Branch:
+        self._store.create_branch(dataset_rid, branch_id)
+        return Branch(
+            ancestor_branch_ids=[],
+            creation_time=_now(),
+            id=branch_id,
+            rid=_new_rid("branch"),
+        )
+
+    def get_dataset_view_range2(
+        self,
+        auth_header: str,
+        dataset_rid: str,
+        end_ref: str,
+        include_open_exclusive_transaction: Optional[bool] = None,
+        start_transaction_rid: Optional[str] = None,
+    ) -> Optional[TransactionRange]:
+        txns = self._store.transactions_in_view(
+            dataset_rid,
+            end_ref,
+            start_transaction_rid,
+            bool(include_open_exclusive_transaction),
+        )
+        if not txns:
+            return None
+        return TransactionRange(
+            end_transaction_rid=txns[-1]["rid"],
+            start_transaction_rid=txns[0]["rid"],
+        )
+
+    def get_dataset_view_files2(
+        self,
+        auth_header: str,
+        dataset_rid: str,
+        end_ref: str,
+        page_size: int,
+        exclude_hidden_files: bool = None,
+        include_open_exclusive_transaction: bool = None,
+        logical_path: str = None,
+        page_start_logical_path: str = None,
+        start_transaction_rid: str = None,
+    ) -> FileResourcesPage:
+        files = self._store.files_in_view(
+            dataset_rid,
+            end_ref,
+            start_transaction_rid,
+            bool(include_open_exclusive_transaction),
+        )
+        paths = sorted(
+            (
+                path
+                for path in files
+                if path.startswith(logical_path or "")
+                and catalog_order(path) >= catalog_order(page_start_logical_path or "")
+                and not (exclude_hidden_files and is_hidden(path))
+            ),
+            key=catalog_order,
+        )
+        values = []
+        for path in paths[:page_size]:
+            location, txn = files[path]
+            stat = location.stat()
+            values.append(
+                FileResource(
+                    is_open=txn["status"] == "OPEN",
+                    logical_path=path,
+                    physical_path=str(location),
+                    time_modified=datetime.fromtimestamp(
+                        stat.st_mtime, timezone.utc
+                    ).isoformat(),
+                    transaction_rid=txn["rid"],
+                    file_metadata=FileMetadata(length=stat.st_size),
+                )
+            )
+        return FileResourcesPage(
+            values=values,
+            next_page_token=paths[page_size] if len(paths) > page_size else None,
+        )
+
+    def start_transaction(
+        self, auth_header: str, dataset_rid: str, request: StartTransactionRequest
+    ) -> ConjureTransaction:
+        return _conjure_transaction(
+            self._store.start_transaction(
+                dataset_rid, request.branch_id, request.record
+            )
+        )
+
+    def set_transaction_type(
+        self,
+        auth_header: str,
+        dataset_rid: str,
+        transaction_rid: str,
+        txn_type: ConjureTransactionType,
+    ) -> ConjureTransaction:
+        return _conjure_transaction(
+            self._store.update_transaction(
+                dataset_rid, transaction_rid, type=txn_type.value
+            )
+        )
+
+    def get_transaction(
+        self, auth_header: str, dataset_rid: str, transaction_rid: str
+    ) -> ConjureTransaction:
+        return _conjure_transaction(
+            self._store.transaction(dataset_rid, transaction_rid)
+        )
+
+    def get_reverse_transactions2(
+        self,
+        auth_header: str,
+        dataset_rid: str,
+        end_ref: str,
+        page_size: int,
+        include_open_exclusive_transaction: bool = None,
+        page_start_transaction_rid: str = None,
+    ) -> TransactionsPage:
+        txns = self._store.transactions_on_branch(
+            dataset_rid, end_ref, bool(include_open_exclusive_transaction)
+        )[::-1]
+        start = next(
+            (
+                i
+                for i, txn in enumerate(txns)
+                if txn["rid"] == page_start_transaction_rid
+            ),
+            0,
+        )
+        page = txns[start : start + page_size + 1]
+        return TransactionsPage(
+            values=[_conjure_transaction(txn) for txn in page[:page_size]],
+            next_page_token=page[page_size]["rid"] if len(page) > page_size else None,
+        )
+
+    def add_files_to_delete_transaction(
+        self,
+        auth_header: str,
+        dataset_rid: str,
+        request: AddFilesToDeleteTransactionRequest,
+        transaction_rid: str,
+    ):
+        with self._store.lock:
+            txn = self._store.transaction(dataset_rid, transaction_rid)
+            if txn["type"] != "DELETE":
+                raise ValueError(f"transaction '{transaction_rid}' is not a DELETE")
+            self._store.update_transaction(
+                dataset_rid,
+                transaction_rid,
+                deletedPaths=sorted(
+                    set(txn["deletedPaths"]).union(request.logical_paths)
+                ),
+            )
+
+    def commit_transaction(
+        self,
+        auth_header: str,
+        dataset_rid: str,
+        request: CloseTransactionRequest,
+        transaction_rid: str,
+    ):
+        self._close(dataset_rid, transaction_rid, request, "COMMITTED")
+
+    def abort_transaction(
+        self,
+        auth_header: str,
+        dataset_rid: str,
+        request: CloseTransactionRequest,
+        transaction_rid: str,
+    ):
+        self._close(dataset_rid, transaction_rid, request, "ABORTED")
+
+    def _close(
+        self,
+        dataset_rid: str,
+        transaction_rid: str,
+        request: CloseTransactionRequest,
+        status: str,
+    ) -> None:
+        with self._store.lock:
+            txn = self._store.transaction(dataset_rid, transaction_rid)
+            self._store.update_transaction(
+                dataset_rid,
+                transaction_rid,
+                status=status,
+                closeTime=_now(),
+                record=dict(txn["record"] or {}, **(request.record or {})),
+            )
+
+
+class LocalDataProxyService(DataProxyService):
+    def __init__(
+        self, store: LocalDatasetStore
+    ):  # pylint: disable=super-init-not-called
+        self._store = store
+
+    def get_file_in_view(
+        self,
+        auth_header: str,
+        dataset_rid: str,
+        end_ref: str,
+        logical_path: str,
+        start_transaction_rid: str = None,
+        accept_encoding: Optional[str] = None,
+        byte_range: Optional[str] = None,
+    ) -> io.IOBase:
+        files = self._store.files_in_view(dataset_rid, end_ref, start_transaction_rid)
+        if logical_path not in files:
+            raise FileNotFoundError(
+                f"'{logical_path}' not found in '{dataset_rid}' at '{end_ref}'"
+            )
+        file = open(files[logical_path][0], "rb")  # pylint: disable=consider-using-with
+        if byte_range is not None:
+            file.seek(_range_start(byte_range))
+        return file
+
+    def put_file(
+        self,
+        auth_header: str,
+        dataset_rid: str,
+        file_data: Any,
+        logical_path: str,
+        transaction_rid: str,
+        overwrite: Optional[bool] = None,
+        content_encoding: Optional[str] = None,
+    ):
+        if self._store.transaction(dataset_rid, transaction_rid)["status"] != "OPEN":
+            raise ValueError(f"transaction '{transaction_rid}' is not open")
+        path = self._store.file_path(dataset_rid, transaction_rid, logical_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if content_encoding is not None:
+            file_data = decompress(file_data, content_encoding)
+        with open(path, "wb") as file:
+            if isinstance(file_data, (bytes, bytearray, memoryview)):
+                file.write(file_data)
+            elif hasattr(file_data, "read"):
+                shutil.copyfileobj(file_data, file)
+            else:
+                for chunk in file_data:
+                    file.write(chunk)
+
+
+def _range_start(byte_range: str) -> int:
+    """Returns the first byte of a `Range` header of the form "bytes=<start>-", the only form the SDK sends."""
+    match = re.fullmatch(r"bytes=(\d+)-", byte_range)
+    if match is None:
+        raise ValueError(f"unsupported range '{byte_range}'")
+    return int(match.group(1))
+
+
+class LocalDataProxyConcatenationService(DataProxyConcatenationService):
+    def __init__(
+        self, store: LocalDatasetStore
+    ):  # pylint: disable=super-init-not-called
+        self._store = store
+
+    def start_concatenation_task(
+        self,
+        auth_header: str,
+        dataset_rid: str,
+        request: StartConcatenationTaskRequest,
+        transaction_rid: str,
+    ) -> StartConcatenationTaskResponse:
+        destination = self._store.file_path(
+            dataset_rid, transaction_rid, request.destination_path
+        )
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        with open(destination, "wb") as file:
+            for source_path in request.source_paths:
+                source = self._store.file_path(
+                    dataset_rid, transaction_rid, source_path
+                )
+                with open(source, "rb") as chunk:
+                    shutil.copyfileobj(chunk, file)
+                source.unlink()
+        return StartConcatenationTaskResponse(concatenation_task_id=str(uuid.uuid4()))
+
+    def get_concatenation_task_status(
+        self, auth_header: str, concatenation_task_id: str
+    ) -> ConcatenationTaskStatusReport:
+        # concatenation happens synchronously when the task is started
+        return ConcatenationTaskStatusReport(
+            reported_at=_now(),
+            status=ConcatenationTaskStatus(success=ConcatenationTaskSuccess()),
+        )
+
+
+class LocalPathService(PathService):
+    def __init__(
+        self, store: LocalDatasetStore
+    ):  # pylint: disable=super-init-not-called
+        self._store = store
+
+    def get_resource_by_path(
+        self, auth_header: str, path: Optional[str] = None
+    ) -> Optional[DecoratedResource]:
+        rid = self._store.resolve_path(path) if path else None
+        return DecoratedResource(rid=rid) if rid else None
+
+
+class _Decoder(ConjureDecoder):
+    """Decodes the values of `any` fields, which the bindings declare as :class:`typing.Any`, as they are."""
+
+    @classmethod
+    def decode_primitive(cls, obj, object_type):
+        if object_type is Any:
+            return obj
+        return super().decode_primitive(obj, object_type)
+
+
+class LocalSchemaService(SchemaService):
+    def __init__(
+        self, store: LocalDatasetStore
+    ):  # pylint: disable=super-init-not-called
+        self._store = store
+
+    def _schemas_path(self, dataset_rid: str, branch_id: str) -> Path:
+        return self._store.root / dataset_rid / "schemas" / f"{branch_id}.json"
+
+    def put_schema(
+        self,
+        auth_header: str,
+        dataset_rid: str,
+        branch_id: str,
+        schema: ConjureFoundrySchema,
+        end_transaction_rid: Optional[str],
+    ) -> None:
+        path = self._schemas_path(dataset_rid, branch_id)
+        with self._store.lock:
+            schemas = self._store.read_json(path, {})
+            schemas[end_transaction_rid or ""] = ConjureEncoder.do_encode(schema)
+            self._store.write_json(path, schemas)
+
+    def get_schema(
+        self,
+        auth_header: str,
+        dataset_rid: str,
+        branch_id: str,
+        end_transaction_rid: str,
+        version_rid: Optional[str] = None,
+    ) -> Optional[VersionedFoundrySchema]:
+        schemas = self._store.read_json(self._schemas_path(dataset_rid, branch_id), {})
+        # fall back to the schema of the latest transaction before the requested one
+        candidates = [
+            txn["rid"]
+            for txn in self._store.transactions_in_view(
+                dataset_rid, end_transaction_rid or branch_id, include_open=True
+            )
+        ]
+        transaction_rid = next(
+            (rid for rid in reversed(candidates) if rid in schemas),
+            "" if "" in schemas else None,
+        )
+        if transaction_rid is None:
+            return None
+        return VersionedFoundrySchema(
+            branch_id=branch_id,
+            transaction_rid=transaction_rid,
+            version_id=transaction_rid,
+            schema=_Decoder().decode(schemas[transaction_rid], ConjureFoundrySchema),
+            attribution=Attribution(time=_now(), user_id="local"),
+        )
+
+
+class LocalSqlQueryService(SqlQueryService):
+    """Supports the `SELECT *` queries issued by :meth:`DatasetsClient.read_dataset` over parquet files."""
+
+    def __init__(
+        self, store: LocalDatasetStore
+    ):  # pylint: disable=super-init-not-called
+        self._store = store
+        self._results: Dict[str, bytes] = {}
+
+    def execute(
+        self, auth_header: str, request: SqlExecuteRequest
+    ) -> SqlExecuteResponse:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        match = _SELECT_STAR.fullmatch(request.query)
+        if match is None:
+            raise ValueError(f"unsupported query: {request.query}")
+        files = self._store.files_in_view(match.group("rid"), match.group("end_ref"))
+        parquet_files = [
+            str(location)
+            for path, (location, _) in sorted(files.items())
+            if path.endswith(".parquet") and not is_hidden(path)
+        ]
+        table = pa.concat_tables(pq.read_table(path) for path in parquet_files)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        query_id = str(uuid.uuid4())
+        with self._store.lock:
+            self._results[query_id] = b"A" + sink.getvalue().to_pybytes()
+        return SqlExecuteResponse(
+            query_id=query_id, status=QueryStatus(ready=ReadyQueryStatus())
+        )
+
+    def get_status(self, auth_header: str, query_id: str) -> SqlGetStatusResponse:
+        return SqlGetStatusResponse(status=QueryStatus(ready=ReadyQueryStatus()))
+
+    def get_results(self, auth_header: str, query_id: str) -> io.IOBase:
+        with self._store.lock:
+            return io.BytesIO(self._results.pop(query_id))
+
+
+class LocalDatasetServices(DatasetServices):
+    """
+    Serves :class:`DatasetsClient` from a local directory instead of a Foundry stack, with the same transaction, view,
+    file listing, schema and read semantics.
+
+    Local services are selected by :func:`palantir.datasets.dataset` when the context hostname is a `file://` uri.
+
+    Examples:
+        >>> from palantir.core import context
+        >>> from palantir.datasets import dataset
+        >>> ds = dataset("/path/to/dataset", create=True, ctx=context("file:///tmp/foundry"))
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        # local services do not authenticate, so no token needs to be configured
+        super().__init__(context(hostname=f"{LOCAL_SCHEME}{root}", token="local"))
+        store = _store(Path(root).resolve())
+        self._catalog_service = LocalCatalogService(store)
+        self._data_proxy_service = LocalDataProxyService(store)
+        self._data_proxy_concatenation_service = LocalDataProxyConcatenationService(
+            store
+        )
+        self._path_service = LocalPathService(store)
+        self._schema_service = LocalSchemaService(store)
+        self._sql_query_service = LocalSqlQueryService(store)
+
+    @property
+    def catalog_service(self) -> CatalogService:
+        return self._catalog_service
+
+    @property
+    def data_proxy_service(self) -> DataProxyService:
+        return self._data_proxy_service
+
+    @property
+    def data_proxy_concatenation_service(self) -> DataProxyConcatenationService:
+        return self._data_proxy_concatenation_service
+
+    @property
+    def path_service(self) -> PathService:
+        return self._path_service
+
+    @property
+    def schema_service(self) -> SchemaService:
+        return self._schema_service
+
+    @property
+    def sql_query_service(self) -> SqlQueryService:
+        return self._sql_query_service
+
+
+_stores: Dict[Path, LocalDatasetStore] = {}
+_stores_lock = threading.Lock()
+
+
+def _store(root: Path) -> LocalDatasetStore:
+    # services for the same root share a store so that its lock covers all of them
+    with _stores_lock:
+        if root not in _stores:
+            _stores[root] = LocalDatasetStore(root)
+        return _stores[root]
+
+
+def _conjure_transaction(txn: Dict[str, Any]) -> ConjureTransaction:
+    return ConjureTransaction(
+        dataset_rid=txn["datasetRid"],
+        file_path_type=FilePathType.MANAGED_FILES,
+        is_data_deleted=False,
+        is_deletion_complete=False,
+        rid=txn["rid"],
+        start_time=txn["startTime"],
+        close_time=txn["closeTime"],
+        status=ConjureTransactionStatus[txn["status"]],
+        type=ConjureTransactionType[txn["type"]],
+        record=txn["record"],
+    )
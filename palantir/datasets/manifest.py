@@ -0,0 +1,283 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import os
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Set, Union, cast
+
+from palantir.core.types import ResourceIdentifier
+from palantir.datasets.types import DatasetLocator
+
+if TYPE_CHECKING:
+    from palantir.datasets.core import Dataset, File
+
+_SCHEMA_VERSION = 1
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS views (
+    id INTEGER PRIMARY KEY,
+    branch_id TEXT NOT NULL,
+    start_transaction_rid TEXT NOT NULL,
+    end_transaction_rid TEXT NOT NULL,
+    last_used REAL NOT NULL,
+    UNIQUE (branch_id, start_transaction_rid, end_transaction_rid)
+);
+CREATE TABLE IF NOT EXISTS files (
+    view_id INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    transaction_rid TEXT NOT NULL,
+    modified TEXT,
+    length INTEGER,
+    PRIMARY KEY (view_id, path)
+) WITHOUT ROWID;
+"""
+
+# sorts after any logical path that starts with a given prefix
+_MAX_CHAR = "\U0010ffff"
+
+
+class ManifestIndex:
+    """
+    A persistent local index of the files in the views of Datasets, used by
+    :meth:`palantir.datasets.core.Dataset.list_files` when passed to :func:`palantir.datasets.dataset`. The files
+    written by a committed transaction never change, so a view is indexed once and a listing of it is then answered
+    from the index without further requests. A view that ends at a later transaction than an indexed view with the
+    same branch and start is indexed from the files of the indexed view and those of the transactions committed since,
+    which are listed from the catalog and merged in. A view is listed in full when no such view is indexed, e.g. after
+    a snapshot, or when files were deleted since.
+
+    Views are keyed by their branch, start and end transaction, so that listing an earlier view or another branch
+    does not discard the index of a later one, and at most `max_views` views of each Dataset are kept, evicting the
+    least recently listed.
+
+    Each Dataset has its own SQLite database under the root. An index is safe to share between threads and processes,
+    which then wait for each other while a view is being indexed.
+
+    Examples:
+        >>> ds = dataset("/path/to/dataset", manifest_index=ManifestIndex())
+        >>> sum(file.length for file in ds.list_files("year=2024/"))
+    """
+
+    def __init__(
+        self, root: Union[str, "os.PathLike[str]"] = None, max_views: int = 16
+    ):
+        if max_views < 1:
+            raise ValueError("max_views must be at least 1")
+        self.root = (
+            Path(root) if root else Path.home() / ".palantir" / "cache" / "manifests"
+        )
+        self.max_views = max_views
+
+    def end_transaction_rids(self, locator: DatasetLocator) -> Set[str]:
+        """Returns: The end transactions of the indexed views with the branch and start of the locator."""
+        connection = self._connect(locator)
+        try:
+            return {
+                row[0]
+                for row in connection.execute(
+                    "SELECT end_transaction_rid FROM views "
+                    "WHERE branch_id = ? AND start_transaction_rid = ?",
+                    (locator.branch_id, _start(locator)),
+                )
+            }
+        finally:
+            connection.close()
+
+    def replace(self, locator: DatasetLocator, files: Iterable["File"]) -> None:
+        """Indexes all the files of the view of the locator, replacing any earlier index of the same view."""
+        connection = self._connect(locator)
+        try:
+            with connection:
+                connection.execute("BEGIN IMMEDIATE")
+                view_id = _new_view(connection, locator)
+                connection.executemany(
+                    "INSERT INTO files VALUES (?, ?, ?, ?, ?)",
+                    (_row(view_id, file) for file in files),
+                )
+                self._evict(connection)
+        finally:
+            connection.close()
+
+    def update(
+        self, locator: DatasetLocator, since: str, files: Iterable["File"]
+    ) -> bool:
+        """
+        Indexes the view of the locator from the indexed view with the same branch and start that ends at an earlier
+        transaction, and the files written by the transactions after it. The transactions must not have deleted any
+        files.
+
+        Args:
+            locator: The view to index.
+            since: The end transaction of the indexed view.
+            files: The files written by the transactions after `since` up to the end of the view.
+
+        Returns: Whether the view was indexed, i.e. the view ending at `since` was still indexed. Otherwise, the files
+        are not consumed and the view must be indexed with :meth:`replace`.
+        """
+        connection = self._connect(locator)
+        try:
+            with connection:
+                connection.execute("BEGIN IMMEDIATE")
+                base_id = _view_id(connection, locator, since)
+                if base_id is None:
+                    return False
+                view_id = _new_view(connection, locator)
+                connection.execute(
+                    "INSERT INTO files SELECT ?, path, transaction_rid, modified, length "
+                    "FROM files WHERE view_id = ?",
+                    (view_id, base_id),
+                )
+                connection.executemany(
+                    "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+                    (_row(view_id, file) for file in files),
+                )
+                self._evict(connection)
+                return True
+        finally:
+            connection.close()
+
+    def files(
+        self, dataset: "Dataset", locator: DatasetLocator, logical_path: str = None
+    ) -> Optional[Iterator["File"]]:
+        """
+        Lists the indexed files of a view in path order. The rows are read in a single transaction which ends before
+        this returns, so that concurrent updates are not observed and the database is not held open while the caller
+        consumes the files.
+
+        Args:
+            dataset: The Dataset the files belong to.
+            locator: The view to list.
+            logical_path: An optional prefix of the logical paths of the files to list.
+
+        Returns: An iterator over the :class:`File` objects in the view, or `None` if the view is not indexed.
+        """
+        prefix = logical_path or ""
+        end = str(locator.end_transaction_rid)
+        connection = self._connect(locator)
+        try:
+            connection.execute(
+                "UPDATE views SET last_used = ? "
+                "WHERE branch_id = ? AND start_transaction_rid = ? AND end_transaction_rid = ?",
+                (time.time(), locator.branch_id, _start(locator), end),
+            )
+            with connection:
+                connection.execute("BEGIN")
+                view_id = _view_id(connection, locator, end)
+                if view_id is None:
+                    return None
+                rows = connection.execute(
+                    "SELECT path, transaction_rid, modified, length FROM files "
+                    "WHERE view_id = ? AND path >= ? AND path < ? ORDER BY path",
+                    (view_id, prefix, prefix + _MAX_CHAR),
+                ).fetchall()
+        finally:
+            connection.close()
+        return _files(dataset, rows)
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        """Removes the least recently used views beyond the limit."""
+        evicted = [
+            (row[0],)
+            for row in connection.execute(
+                "SELECT id FROM views ORDER BY last_used DESC LIMIT -1 OFFSET ?",
+                (self.max_views,),
+            )
+        ]
+        connection.executemany("DELETE FROM files WHERE view_id = ?", evicted)
+        connection.executemany("DELETE FROM views WHERE id = ?", evicted)
+
+    def _connect(self, locator: DatasetLocator) -> sqlite3.Connection:
+        self.root.mkdir(parents=True, exist_ok=True)
+        # an index is rebuilt while other processes wait for it, which can take a while for millions of files
+        connection = sqlite3.connect(
+            self.root / f"{locator.rid}.sqlite",
+            timeout=600,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            if (
+                connection.execute("PRAGMA user_version").fetchone()[0]
+                != _SCHEMA_VERSION
+            ):
+                connection.executescript(
+                    f"BEGIN IMMEDIATE; {_SCHEMA} PRAGMA user_version = {_SCHEMA_VERSION}; COMMIT;"
+                )
+        except BaseException:
+            connection.close()
+            raise
+        return connection
+
+
+def _files(dataset: "Dataset", rows: List[tuple]) -> Iterator["File"]:
+    from palantir.datasets.core import File
+
+    for path, transaction_rid, modified, length in rows:
+        yield File(
+            dataset=dataset,
+            path=path,
+            modified=datetime.fromisoformat(modified) if modified else None,
+            transaction_rid=ResourceIdentifier.from_string(transaction_rid),
+            length=length,
+            client=dataset.client,
+        )
+
+
+def _start(locator: DatasetLocator) -> str:
+    return str(locator.start_transaction_rid or "")
+
+
+def _new_view(connection: sqlite3.Connection, locator: DatasetLocator) -> int:
+    """Returns: The id of an empty view for the locator."""
+    connection.execute(
+        "DELETE FROM files WHERE view_id IN (SELECT id FROM views "
+        "WHERE branch_id = ? AND start_transaction_rid = ? AND end_transaction_rid = ?)",
+        (locator.branch_id, _start(locator), str(locator.end_transaction_rid)),
+    )
+    cursor = connection.execute(
+        "INSERT OR REPLACE INTO views "
+        "(branch_id, start_transaction_rid, end_transaction_rid, last_used) VALUES (?, ?, ?, ?)",
+        (
+            locator.branch_id,
+            _start(locator),
+            str(locator.end_transaction_rid),
+            time.time(),
+        ),
+    )
+    # set by a successful INSERT
+    return cast(int, cursor.lastrowid)
+
+
+def _view_id(
+    connection: sqlite3.Connection, locator: DatasetLocator, end: str
+) -> Optional[int]:
+    row = connection.execute(
+        "SELECT id FROM views "
+        "WHERE branch_id = ? AND start_transaction_rid = ? AND end_transaction_rid = ?",
+        (locator.branch_id, _start(locator), end),
+    ).fetchone()
+    return row[0] if row else None
+
+
+def _row(view_id: int, file: "File") -> tuple:
+    return (
+        view_id,
+        file.path,
+        str(file.transaction_rid),
+        file.modified.isoformat() if file.modified else None,
+        file.length,
+    )
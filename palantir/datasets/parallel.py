@@ -0,0 +1,190 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Processing of the files of a Dataset across a pool of processes, see :meth:`palantir.datasets.core.Dataset.map_files`.
+The functions run in the worker processes are module level so that they can be pickled.
+"""
+
+import collections
+import os
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Deque,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from palantir.core.types import PalantirContext, ResourceIdentifier
+from palantir.datasets.types import DatasetLocator, MapResult
+
+if TYPE_CHECKING:
+    from palantir.datasets.client import DatasetsClient
+    from palantir.datasets.core import Dataset, File
+
+# a file as sent to a worker process: its path, the transaction that wrote it and its length
+_FileEntry = Tuple[str, Optional[str], Optional[int]]
+
+# the client of a worker process, created once by the pool initializer
+_client: "Optional[DatasetsClient]" = None
+
+
+def map_files(
+    dataset: "Dataset",
+    func: Callable[["File"], Any],
+    processes: Optional[int],
+    threads_per_process: int,
+    ordered: bool,
+    errors: str,
+    path: Optional[str],
+) -> Iterator[MapResult]:
+    if errors not in ("raise", "collect"):
+        raise ValueError(
+            f"unsupported errors '{errors}', expected 'raise' or 'collect'"
+        )
+    return _map(
+        dataset,
+        func,
+        processes or os.cpu_count() or 1,
+        threads_per_process,
+        ordered,
+        errors == "raise",
+        path,
+    )
+
+
+def _map(
+    dataset: "Dataset",
+    func: Callable[["File"], Any],
+    processes: int,
+    threads_per_process: int,
+    ordered: bool,
+    raise_errors: bool,
+    path: Optional[str],
+) -> Iterator[MapResult]:
+    locator = dataset.locator
+    batches = _batches(dataset.list_files(path), threads_per_process)
+    pending: Deque[Tuple[List[_FileEntry], Future]] = collections.deque()
+    with ProcessPoolExecutor(
+        processes,
+        initializer=_init_worker,
+        initargs=(dataset.client.ctx, dataset.client.compression),
+    ) as executor:
+        try:
+            batch = next(batches, None)
+            while batch is not None or pending:
+                # two batches per process, so that a process has its next batch as soon as it finishes one
+                while batch is not None and len(pending) < 2 * processes:
+                    pending.append(
+                        (
+                            batch,
+                            executor.submit(
+                                _map_batch, func, locator, batch, threads_per_process
+                            ),
+                        )
+                    )
+                    batch = next(batches, None)
+                if ordered:
+                    done_batch, future = pending.popleft()
+                else:
+                    done, _ = wait(
+                        [future for _, future in pending], return_when=FIRST_COMPLETED
+                    )
+                    done_batch, future = [
+                        entry for entry in pending if entry[1] in done
+                    ][0]
+                    pending.remove((done_batch, future))
+                for result in _results(done_batch, future):
+                    if result.error is not None and raise_errors:
+                        raise result.error
+                    yield result
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+
+def _batches(files: Iterable["File"], size: int) -> Iterator[List[_FileEntry]]:
+    batch: List[_FileEntry] = []
+    for file in files:
+        batch.append(
+            (
+                file.path,
+                str(file.transaction_rid) if file.transaction_rid else None,
+                file.length,
+            )
+        )
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _results(batch: List[_FileEntry], future: Future) -> List[MapResult]:
+    try:
+        return future.result()
+    except Exception as exc:  # pylint: disable=broad-except
+        # the batch failed as a whole, e.g. a result could not be pickled or a worker process died
+        return [MapResult(path, None, exc) for path, _, _ in batch]
+
+
+def _init_worker(ctx: PalantirContext, compression: Optional[str]) -> None:
+    global _client  # pylint: disable=global-statement
+    from palantir.datasets.client import DatasetsClient, dataset_services
+
+    _client = DatasetsClient(dataset_services(ctx), compression)
+
+
+def _map_batch(
+    func: Callable[["File"], Any],
+    locator: DatasetLocator,
+    batch: List[_FileEntry],
+    threads: int,
+) -> List[MapResult]:
+    from palantir.datasets.core import Dataset, File
+
+    client = _client
+    assert client is not None, "the worker process was not initialized"
+    dataset = Dataset(client, locator)
+
+    def _apply(entry: _FileEntry) -> MapResult:
+        path, transaction_rid, length = entry
+        file = File(
+            dataset,
+            path,
+            transaction_rid=ResourceIdentifier.from_string(transaction_rid)
+            if transaction_rid
+            else None,
+            length=length,
+            client=client,
+        )
+        try:
+            return MapResult(path, func(file), None)
+        except Exception as exc:  # pylint: disable=broad-except
+            return MapResult(path, None, exc)
+
+    with ThreadPoolExecutor(threads) as executor:
+        return list(executor.map(_apply, batch))
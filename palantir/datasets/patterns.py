@@ -0,0 +1,231 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Pattern, Sequence, Union
+
+_GLOB_SPECIAL = "*?["
+_REGEX_SPECIAL = ".^$*+?{}[]|()"
+_QUANTIFIERS = "*+?{"
+
+
+@dataclass(frozen=True)
+class PathPattern:
+    """
+    A pattern matched against the whole logical path of each file, together with the literal path prefixes every
+    matching path starts with, so that a listing can be narrowed to those prefixes by the catalog and only the rest of
+    the pattern is applied while streaming.
+    """
+
+    regex: Pattern[str]
+    prefixes: List[str]
+
+    @classmethod
+    def from_glob(cls, pattern: str) -> "PathPattern":
+        """
+        Args:
+            pattern: A glob over logical paths, in which `*` matches any characters except `/`, `**` matches any
+                number of whole directories, `?` matches a character except `/`, `[...]` matches a character from a
+                set and `{a,b}` matches either alternative, e.g. `year=2024/**/*.parquet` or `{raw,clean}/*.csv`.
+
+        Returns: A :class:`PathPattern` with a prefix for each alternative of the brace patterns in the glob.
+        """
+        alternatives = expand_braces(pattern)
+        return cls(
+            re.compile("|".join(f"(?:{glob_to_regex(alt)})" for alt in alternatives)),
+            narrow_prefixes([glob_prefix(alt) for alt in alternatives]),
+        )
+
+    @classmethod
+    def from_regex(cls, pattern: Union[str, Pattern[str]]) -> "PathPattern":
+        """
+        Args:
+            pattern: A regular expression matched against whole logical paths, e.g. `year=2024/.*\\.parquet`.
+
+        Returns: A :class:`PathPattern` with the literal prefix the regular expression starts with, if any.
+        """
+        regex = re.compile(pattern)
+        # the literal characters of a case insensitive pattern do not narrow the listing
+        prefix = "" if regex.flags & re.IGNORECASE else regex_prefix(regex.pattern)
+        return cls(regex, [prefix])
+
+    def matches(self, path: str) -> bool:
+        """Returns: Whether the whole logical path matches the pattern."""
+        return self.regex.fullmatch(path) is not None
+
+
+def is_hidden(logical_path: str) -> bool:
+    """Returns: Whether a directory or the file of a logical path starts with `.` or `_`, like `_SUCCESS` or `.crc`."""
+    return any(part.startswith((".", "_")) for part in logical_path.split("/"))
+
+
+def catalog_order(logical_path: str) -> bytes:
+    """
+    Returns: A key that sorts logical paths in the order the catalog lists them, i.e. by UTF-16 code units, which
+    differs from the code point order of `str` for characters outside of the basic multilingual plane.
+    """
+    return logical_path.encode("utf-16-be")
+
+
+def expand_braces(pattern: str) -> List[str]:
+    """Returns: The alternatives of a glob with brace patterns, e.g. `a/{b,c}.csv` expands to `a/b.csv` and `a/c.csv`."""
+    start = pattern.find("{")
+    while start != -1:
+        end, options = _brace_options(pattern, start)
+        if end is not None and len(options) > 1:
+            return [
+                expanded
+                for option in options
+                for expanded in expand_braces(
+                    pattern[:start] + option + pattern[end + 1 :]
+                )
+            ]
+        start = pattern.find("{", start + 1)
+    return [pattern]
+
+
+def _brace_options(pattern: str, start: int):
+    depth = 0
+    options = []
+    option_start = start + 1
+    for index in range(start, len(pattern)):
+        if pattern[index] == "{":
+            depth += 1
+        elif pattern[index] == "}":
+            depth -= 1
+            if depth == 0:
+                options.append(pattern[option_start:index])
+                return index, options
+        elif pattern[index] == "," and depth == 1:
+            options.append(pattern[option_start:index])
+            option_start = index + 1
+    return None, options
+
+
+def glob_to_regex(pattern: str) -> str:
+    """Returns: A regular expression matching the same whole logical paths as a glob without brace patterns."""
+    parts = []
+    index = 0
+    while index < len(pattern):
+        if pattern.startswith("**", index):
+            end = index + 2
+            if (index == 0 or pattern[index - 1] == "/") and pattern.startswith(
+                "/", end
+            ):
+                # a leading or delimited **/ matches no directory too
+                parts.append("(?:.*/)?")
+                end += 1
+            else:
+                parts.append(".*")
+            index = end
+        elif pattern[index] == "*":
+            parts.append("[^/]*")
+            index += 1
+        elif pattern[index] == "?":
+            parts.append("[^/]")
+            index += 1
+        elif pattern[index] == "[" and "]" in pattern[index + 2 :]:
+            end = pattern.index("]", index + 2)
+            members = pattern[index + 1 : end].replace("\\", "\\\\")
+            if members.startswith("!"):
+                members = "^" + members[1:]
+            elif members.startswith("^"):
+                members = "\\" + members
+            parts.append("[" + members + "]")
+            index = end + 1
+        else:
+            parts.append(re.escape(pattern[index]))
+            index += 1
+    return "".join(parts)
+
+
+def glob_prefix(pattern: str) -> str:
+    """Returns: The literal characters a glob without brace patterns starts with."""
+    end = min(
+        (index for index in (pattern.find(c) for c in _GLOB_SPECIAL) if index != -1),
+        default=len(pattern),
+    )
+    return pattern[:end]
+
+
+def regex_prefix(pattern: str) -> str:
+    """Returns: The literal characters every path matching a regular expression from its start begins with."""
+    if _has_top_level_alternation(pattern):
+        return ""
+    prefix = []
+    index = 1 if pattern.startswith("^") else 0
+    while index < len(pattern):
+        literal: Optional[str] = None
+        if pattern[index] == "\\":
+            if index + 1 < len(pattern) and not pattern[index + 1].isalnum():
+                literal, step = pattern[index + 1], 2
+        elif pattern[index] not in _REGEX_SPECIAL:
+            literal, step = pattern[index], 1
+        if literal is None:
+            break
+        quantifier = pattern[index + step] if index + step < len(pattern) else None
+        if quantifier is not None and quantifier in _QUANTIFIERS:
+            # a repeated character occurs at least once, but nothing is known about what follows it
+            if quantifier == "+":
+                prefix.append(literal)
+            break
+        prefix.append(literal)
+        index += step
+    return "".join(prefix)
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    depth = 0
+    in_class = False
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\":
+            index += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+            index += 1
+            # a ] first in a set is a member
+            for member in ("^", "]"):
+                if pattern.startswith(member, index):
+                    index += 1
+            continue
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return True
+        index += 1
+    return False
+
+
+def relative_path(path: str) -> str:
+    """Returns: The path without a leading `./` or `/`, since logical paths are relative to the root of the Dataset."""
+    while path.startswith(("./", "/")):
+        path = path[1:] if path.startswith("/") else path[2:]
+    return path
+
+
+def narrow_prefixes(prefixes: Sequence[str]) -> List[str]:
+    """Returns: The sorted prefixes, without those that start with another of the prefixes."""
+    narrowed: List[str] = []
+    for prefix in sorted(set(prefixes)):
+        if not narrowed or not prefix.startswith(narrowed[-1]):
+            narrowed.append(prefix)
+    return narrowed
@@ -12,6 +12,8 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+# pylint: disable=too-many-lines
+
 from typing import Optional, List, Dict, Any
 
 from conjure_python_client import (
@@ -170,6 +172,43 @@ class CatalogService(Service):
         _decoder = ConjureDecoder()
         return _decoder.decode(_response.json(), FileResourcesPage)
 
+    def get_reverse_transactions2(
+        self,
+        auth_header: str,
+        dataset_rid: str,
+        end_ref: str,
+        page_size: int,
+        include_open_exclusive_transaction: bool = None,
+        page_start_transaction_rid: str = None,
+    ) -> "TransactionsPage":
+        _headers: Dict[str, Any] = {
+            "Accept": "application/json",
+            "Authorization": auth_header,
+        }
+
+        _params: Dict[str, Any] = {
+            "pageSize": page_size,
+            "pageStartTransactionRid": page_start_transaction_rid,
+            "includeOpenExclusiveTransaction": include_open_exclusive_transaction,
+        }
+
+        _path_params: Dict[str, Any] = {
+            "datasetRid": dataset_rid,
+            "endRef": end_ref,
+        }
+
+        _json = None
+
+        _path = "/catalog/datasets/{datasetRid}/reverse-transactions2/{endRef}"
+        _path = format_path_with_params(_path, _path_params)
+
+        _response = self._request(
+            "GET", self._uri + _path, params=_params, headers=_headers, json=_json
+        )
+
+        _decoder = ConjureDecoder()
+        return _decoder.decode(_response.json(), TransactionsPage)
+
     def start_transaction(
         self, auth_header: str, dataset_rid: str, request: "StartTransactionRequest"
     ) -> "Transaction":
@@ -287,6 +326,63 @@ class CatalogService(Service):
             "POST", self._uri + _path, params=_params, headers=_headers, json=_json
         )
 
+    def get_transaction(
+        self,
+        auth_header: str,
+        dataset_rid: str,
+        transaction_rid: str,
+    ) -> "Transaction":
+        _headers: Dict[str, Any] = {
+            "Accept": "application/json",
+            "Authorization": auth_header,
+        }
+
+        _params: Dict[str, Any] = {}
+
+        _path_params: Dict[str, Any] = {
+            "datasetRid": dataset_rid,
+            "transactionRid": transaction_rid,
+        }
+
+        _path = "/catalog/datasets/{datasetRid}/transactions/{transactionRid}"
+        _path = format_path_with_params(_path, _path_params)
+
+        _response = self._request(
+            "GET", self._uri + _path, params=_params, headers=_headers
+        )
+
+        _decoder = ConjureDecoder()
+        return _decoder.decode(_response.json(), Transaction)
+
+    def add_files_to_delete_transaction(
+        self,
+        auth_header: str,
+        dataset_rid: str,
+        request: "AddFilesToDeleteTransactionRequest",
+        transaction_rid: str,
+    ):
+        _headers: Dict[str, Any] = {
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+            "Authorization": auth_header,
+        }
+
+        _params: Dict[str, Any] = {}
+
+        _path_params: Dict[str, Any] = {
+            "datasetRid": dataset_rid,
+            "transactionRid": transaction_rid,
+        }
+
+        _json: Any = ConjureEncoder().default(request)
+
+        _path = "/catalog/datasets/{datasetRid}/transactions/{transactionRid}/files/addToDeleteTransaction"
+        _path = format_path_with_params(_path, _path_params)
+
+        _response = self._request(
+            "POST", self._uri + _path, params=_params, headers=_headers, json=_json
+        )
+
 
 class StartTransactionRequest(ConjureBeanType):
     @classmethod
@@ -369,6 +465,23 @@ class CloseTransactionRequest(ConjureBeanType):
         return self._do_sever_inherited_permissions
 
 
+class AddFilesToDeleteTransactionRequest(ConjureBeanType):
+    @classmethod
+    def _fields(cls) -> Dict[str, ConjureFieldDefinition]:
+        return {
+            "logical_paths": ConjureFieldDefinition("logicalPaths", List[str]),
+        }
+
+    __slots__: List[str] = ["_logical_paths"]
+
+    def __init__(self, logical_paths: List[str]):
+        self._logical_paths = logical_paths
+
+    @property
+    def logical_paths(self) -> List[str]:
+        return self._logical_paths
+
+
 class TransactionProvenance(ConjureBeanType):
     @classmethod
     def _fields(cls) -> Dict[str, ConjureFieldDefinition]:
@@ -737,6 +850,31 @@ class TransactionRange(ConjureBeanType):
         return self._end_transaction_rid
 
 
+class TransactionsPage(ConjureBeanType):
+    @classmethod
+    def _fields(cls) -> Dict[str, ConjureFieldDefinition]:
+        return {
+            "values": ConjureFieldDefinition("values", List[Transaction]),
+            "next_page_token": ConjureFieldDefinition(
+                "nextPageToken", OptionalTypeWrapper[str]
+            ),
+        }
+
+    __slots__ = ["_values", "_next_page_token"]
+
+    def __init__(self, values: "List[Transaction]", next_page_token: str = None):
+        self._values = values
+        self._next_page_token = next_page_token
+
+    @property
+    def values(self) -> "List[Transaction]":
+        return self._values
+
+    @property
+    def next_page_token(self) -> Optional[str]:
+        return self._next_page_token
+
+
 class FileResourcesPage(ConjureBeanType):
     @classmethod
     def _fields(cls) -> Dict[str, ConjureFieldDefinition]:
@@ -36,11 +36,17 @@ class DataProxyService(Service):
         end_ref: str,
         logical_path: str,
         start_transaction_rid: str = None,
+        accept_encoding: Optional[str] = None,
+        byte_range: Optional[str] = None,
     ) -> io.IOBase:
         _headers: Dict[str, Any] = {
             "Accept": "application/octet-stream",
             "Authorization": auth_header,
         }
+        if accept_encoding is not None:
+            _headers["Accept-Encoding"] = accept_encoding
+        if byte_range is not None:
+            _headers["Range"] = byte_range
 
         _params: Dict[str, Any] = {
             "startTransactionRid": start_transaction_rid,
@@ -78,12 +84,15 @@ class DataProxyService(Service):
         logical_path: str,
         transaction_rid: str,
         overwrite: Optional[bool] = None,
+        content_encoding: Optional[str] = None,
     ):
         _headers: Dict[str, Any] = {
             "Accept": "application/json",
             "Content-Type": "application/octet-stream",
             "Authorization": auth_header,
         }
+        if content_encoding is not None:
+            _headers["Content-Encoding"] = content_encoding
 
         _params: Dict[str, Any] = {
             "logicalPath": logical_path,
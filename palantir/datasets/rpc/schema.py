@@ -244,7 +244,7 @@ class FoundryFieldSchema(ConjureBeanType):
     @classmethod
     def _fields(cls) -> Dict[str, ConjureFieldDefinition]:
         return {
-            "type": ConjureFieldDefinition("type", FoundryFieldType),
+            "field_type": ConjureFieldDefinition("type", FoundryFieldType),
             "name": ConjureFieldDefinition("name", OptionalTypeWrapper[str]),
             "nullable": ConjureFieldDefinition("nullable", OptionalTypeWrapper[bool]),
             "user_defined_type_class": ConjureFieldDefinition(
@@ -316,6 +316,10 @@ class FoundryFieldSchema(ConjureBeanType):
     def type(self) -> "FoundryFieldType":
         return self._type
 
+    @property
+    def field_type(self) -> "FoundryFieldType":
+        return self._type
+
     @property
     def name(self) -> Optional[str]:
         return self._name
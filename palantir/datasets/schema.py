@@ -13,13 +13,16 @@
 #  limitations under the License.
 
 from datetime import date
-from typing import TYPE_CHECKING, Any, Optional, Type
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Type
 
 from .types import (
     ArrayFieldType,
+    BinaryFieldType,
     BooleanFieldType,
     ByteFieldType,
+    DecimalFieldType,
     Field,
+    FieldType,
     FileFormat,
     DateFieldType,
     DoubleFieldType,
@@ -27,14 +30,17 @@ from .types import (
     FoundrySchema,
     IntegerFieldType,
     LongFieldType,
+    MapFieldType,
     ShortFieldType,
     StringFieldType,
+    StructFieldType,
     TimestampFieldType,
 )
 
 if TYPE_CHECKING:
     import numpy as np
     import pandas as pd
+    import pyarrow as pa
 
 
 def pandas_to_foundry_schema(df: "pd.DataFrame") -> FoundrySchema:
@@ -44,6 +50,70 @@ def pandas_to_foundry_schema(df: "pd.DataFrame") -> FoundrySchema:
     )
 
 
+def is_compatible(existing: FoundrySchema, new: FoundrySchema) -> bool:
+    """Returns whether data with the new schema can be added to a Dataset with the existing one."""
+    return existing.format == new.format and {
+        field.name: field.type for field in existing.fields
+    } == {field.name: field.type for field in new.fields}
+
+
+def foundry_schema_to_arrow(schema: FoundrySchema) -> "pa.Schema":
+    """
+    Returns: The Apache Arrow schema equivalent to the types and nullability of the fields of a Foundry schema. The
+    fields of structs without :attr:`StructFieldType.names` are named by position, "_1", "_2" and so on.
+    """
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            pa.field(field.name, _get_arrow_type(field.type), field.nullable)
+            for field in schema.fields
+        ]
+    )
+
+
+def _get_arrow_type(  # pylint: disable=too-many-return-statements
+    field_type: FieldType,
+) -> "pa.DataType":
+    import pyarrow as pa
+
+    if isinstance(field_type, ArrayFieldType):
+        return pa.list_(_get_arrow_type(field_type.element_type))
+    if isinstance(field_type, MapFieldType):
+        return pa.map_(
+            _get_arrow_type(field_type.key_type), _get_arrow_type(field_type.value_type)
+        )
+    if isinstance(field_type, StructFieldType):
+        names = field_type.names or [
+            f"_{index + 1}" for index in range(len(field_type.fields))
+        ]
+        return pa.struct(
+            [
+                (name, _get_arrow_type(child))
+                for name, child in zip(names, field_type.fields)
+            ]
+        )
+    if isinstance(field_type, DecimalFieldType):
+        return pa.decimal128(field_type.precision, field_type.scale)
+    atomic_types: Dict[Type[FieldType], Callable[[], "pa.DataType"]] = {
+        BinaryFieldType: pa.binary,
+        BooleanFieldType: pa.bool_,
+        ByteFieldType: pa.int8,
+        DateFieldType: pa.date32,
+        DoubleFieldType: pa.float64,
+        FloatFieldType: pa.float32,
+        IntegerFieldType: pa.int32,
+        LongFieldType: pa.int64,
+        ShortFieldType: pa.int16,
+        StringFieldType: pa.string,
+        TimestampFieldType: lambda: pa.timestamp("us"),
+    }
+    arrow_type = atomic_types.get(type(field_type))
+    if arrow_type is None:
+        raise ValueError(f"Unsupported FieldType: {field_type}")
+    return arrow_type()
+
+
 def _get_field(  # pylint: disable=too-many-return-statements,too-many-branches
     name: Optional[str], obj: Any
 ) -> Field:
@@ -0,0 +1,80 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import threading
+from typing import Any, Dict, Type
+
+from palantir.core.rpc import ConjureClient, ServiceT
+from palantir.core.types import PalantirContext
+from palantir.datasets.rpc.catalog import CatalogService
+from palantir.datasets.rpc.data_proxy import (
+    DataProxyConcatenationService,
+    DataProxyService,
+)
+from palantir.datasets.rpc.path import PathService
+from palantir.datasets.rpc.schema import SchemaService
+from palantir.datasets.rpc.sql import SqlQueryService
+
+LOCAL_SCHEME = "file://"
+
+
+class DatasetServices:
+    """
+    Creates the conjure services used by :class:`DatasetsClient`. Each service, and with it its connection pool, is
+    created on first use and then shared, including between threads.
+    """
+
+    def __init__(self, ctx: PalantirContext):
+        self.factory = ConjureClient()
+        self.ctx = ctx
+        self._services: Dict[Type[Any], Any] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def catalog_service(self) -> CatalogService:
+        return self._service(CatalogService, "foundry-catalog/api")
+
+    @property
+    def data_proxy_service(self) -> DataProxyService:
+        return self._service(DataProxyService, "foundry-data-proxy/api")
+
+    @property
+    def data_proxy_concatenation_service(self) -> DataProxyConcatenationService:
+        return self._service(DataProxyConcatenationService, "foundry-data-proxy/api")
+
+    @property
+    def path_service(self) -> PathService:
+        return self._service(PathService, "compass/api")
+
+    @property
+    def schema_service(self) -> SchemaService:
+        return self._service(SchemaService, "foundry-metadata/api")
+
+    @property
+    def sql_query_service(self) -> SqlQueryService:
+        return self._service(SqlQueryService, "foundry-sql-server/api")
+
+    def _service(self, service: Type[ServiceT], service_path: str) -> ServiceT:
+        with self._lock:
+            if service not in self._services:
+                self._services[service] = self.factory.service(
+                    service, self._uri(service_path)
+                )
+            return self._services[service]
+
+    def _uri(self, service_path: str) -> str:
+        hostname = self.ctx.hostname
+        # hostnames default to https, a scheme may be given explicitly, e.g. for a local test server
+        base_uri = hostname if "://" in hostname else f"https://{hostname}"
+        return f"{base_uri.rstrip('/')}/{service_path}"
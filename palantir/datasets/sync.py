@@ -0,0 +1,97 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Mirroring of a local directory into a Dataset, see :meth:`palantir.datasets.core.Dataset.sync_from`.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Generator, Tuple, Union
+
+from palantir.core.types import ResourceIdentifier
+from palantir.datasets.patterns import is_hidden
+from palantir.datasets.types import SyncResult, TransactionType
+
+if TYPE_CHECKING:
+    from palantir.datasets.core import Dataset
+
+# the key of the file hashes in the record of a transaction written by `sync_from`
+_SYNC_HASHES = "sha256"
+
+
+def sync_from(
+    dataset: "Dataset",
+    local_dir: Union[str, "os.PathLike[str]"],
+    delete: bool,
+    checksum: bool,
+    max_workers: int,
+) -> SyncResult:
+    root = Path(local_dir)
+    local = {
+        path.relative_to(root).as_posix(): path
+        for path in sorted(root.rglob("*"))
+        if path.is_file() and not is_hidden(path.relative_to(root).as_posix())
+    }
+    dataset.update_view()
+    remote = {file.path: file for file in dataset.list_files()}
+    hashes: Dict[str, str] = {}
+    recorded_hashes: Dict[ResourceIdentifier, Dict[str, str]] = {}
+
+    def _is_changed(path: str) -> bool:
+        file = remote.get(path)
+        if file is None or file.length != local[path].stat().st_size:
+            return True
+        if not checksum:
+            return False
+        txn_rid = file.transaction_rid
+        if txn_rid is None:
+            return True
+        if txn_rid not in recorded_hashes:
+            record = dataset.client.get_transaction(dataset, txn_rid).record
+            recorded_hashes[txn_rid] = record.get(_SYNC_HASHES, {})
+        hashes[path] = _sha256(local[path])
+        return recorded_hashes[txn_rid].get(path) != hashes[path]
+
+    def _contents() -> Generator[Tuple[str, bytes], None, None]:
+        for path in changed:
+            content = local[path].read_bytes()
+            if checksum:
+                hashes[path] = hashlib.sha256(content).hexdigest()
+            yield path, content
+
+    changed = [path for path in local if _is_changed(path)]
+    if changed:
+        with dataset.start_transaction(TransactionType.UPDATE) as txn:
+            txn.write_many(_contents(), max_workers)
+            if checksum:
+                txn.record[_SYNC_HASHES] = {path: hashes[path] for path in changed}
+
+    deleted = sorted(set(remote) - set(local)) if delete else []
+    if deleted:
+        with dataset.start_transaction(TransactionType.DELETE) as txn:
+            txn.delete(deleted)
+
+    return SyncResult(
+        uploaded=changed, deleted=deleted, unchanged=len(local) - len(changed)
+    )
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
@@ -0,0 +1,136 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Conversions of Apache Arrow tables for :class:`palantir.datasets.core.Dataset`: to pandas DataFrames when reading, and
+from DataFrames to parquet files encoded in chunks when writing.
+"""
+
+import io
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Sequence, Union
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
+
+def to_pandas(
+    table: "pa.Table",
+    dtype_backend: str,
+    strings_as_categories: Union[bool, Sequence[str]],
+    self_destruct: bool,
+    split_blocks: bool,
+) -> "pd.DataFrame":
+    kwargs: Dict[str, Any] = {}
+    if dtype_backend == "pyarrow":
+        import pandas as pd
+        import pyarrow as pa
+
+        # dictionary encoded columns, i.e. categories, are still converted to pandas categoricals
+        kwargs["types_mapper"] = (
+            lambda t: None if pa.types.is_dictionary(t) else pd.ArrowDtype(t)
+        )
+    elif dtype_backend != "numpy":
+        raise ValueError(
+            f"unsupported dtype_backend '{dtype_backend}', expected 'numpy' or 'pyarrow'"
+        )
+    if strings_as_categories:
+        table = _dictionary_encode(table, strings_as_categories)
+    return table.to_pandas(
+        self_destruct=self_destruct, split_blocks=split_blocks, **kwargs
+    )
+
+
+def _dictionary_encode(
+    table: "pa.Table", columns: Union[bool, Sequence[str]]
+) -> "pa.Table":
+    import pyarrow as pa
+
+    for index, field in enumerate(table.schema):
+        if (
+            pa.types.is_string(field.type) or pa.types.is_large_string(field.type)
+            if isinstance(columns, bool)
+            else field.name in columns
+        ):
+            table = table.set_column(
+                index, field.name, table.column(index).dictionary_encode()
+            )
+    return table
+
+
+class _ChunkingSink(io.RawIOBase):
+    """A write-only stream that holds what is written until it is taken, while keeping the position in the stream."""
+
+    def __init__(self):
+        super().__init__()
+        self.position = 0
+        self._pending = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._pending += data
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def take(self) -> bytes:
+        data = bytes(self._pending)
+        self._pending.clear()
+        return data
+
+
+def parquet_chunks(df: "pd.DataFrame", chunk_size: int) -> Iterator[bytes]:
+    """
+    Encodes the DataFrame as a parquet file in row groups of about a quarter of the chunk size, yielding chunks of at
+    least `chunk_size` bytes of the file as they are encoded, the last may be smaller.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.Table.from_pandas(df)
+    rows_per_group = max(1, table.num_rows * chunk_size // (4 * max(table.nbytes, 1)))
+    sink = _ChunkingSink()
+    with pq.ParquetWriter(sink, table.schema) as writer:
+        for offset in range(0, table.num_rows, rows_per_group):
+            writer.write_table(table.slice(offset, rows_per_group))
+            if sink.pending() >= chunk_size:
+                yield sink.take()
+    yield sink.take()
+
+
+def chunk_batches(
+    reader: "pa.RecordBatchReader", chunk_size: int
+) -> Iterator["pa.Table"]:
+    """Regroups the record batches of a stream into tables of `chunk_size` rows, only the last may be smaller."""
+    import pyarrow as pa
+
+    pending: List["pa.RecordBatch"] = []
+    num_rows = 0
+    for batch in reader:
+        pending.append(batch)
+        num_rows += batch.num_rows
+        while num_rows >= chunk_size:
+            table = pa.Table.from_batches(pending, reader.schema)
+            yield table.slice(0, chunk_size)
+            rest = table.slice(chunk_size)
+            pending, num_rows = rest.to_batches(), rest.num_rows
+    if num_rows:
+        yield pa.Table.from_batches(pending, reader.schema)
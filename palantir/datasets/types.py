@@ -15,11 +15,14 @@
 from abc import ABC
 from dataclasses import dataclass
 from enum import Enum, auto
-from typing import Any, List, Optional, Tuple, Union, Dict
+from typing import TYPE_CHECKING, Any, List, Optional, Tuple, Union, Dict
 
 from palantir.core.types import ResourceIdentifier
 from palantir.core.util import alias
 
+if TYPE_CHECKING:
+    from palantir.datasets.core import File
+
 
 @dataclass(frozen=True)
 class DatasetLocator:
@@ -87,6 +90,46 @@ class TransactionStatus(_AutoNameEnum):
     ABORTED = auto()
 
 
+class FileChangeType(_AutoNameEnum):
+    ADDED = auto()
+    REPLACED = auto()
+    REMOVED = auto()
+
+
+@dataclass(frozen=True)
+class FileChange:
+    """
+    A difference in a file between two views of a Dataset, see :meth:`palantir.datasets.core.Dataset.diff`. A file is
+    replaced if it was written by a different transaction or has a different length in the two views.
+    """
+
+    path: str
+    change_type: FileChangeType
+    before: Optional["File"]
+    after: Optional["File"]
+
+
+@dataclass(frozen=True)
+class MapResult:
+    """
+    The result of applying a function to a file with :meth:`palantir.datasets.core.Dataset.map_files`: either the value
+    it returned or the error it raised.
+    """
+
+    path: str
+    value: Any
+    error: Optional[BaseException]
+
+
+@dataclass(frozen=True)
+class SyncResult:
+    """The files changed by :meth:`palantir.datasets.core.Dataset.sync_from`."""
+
+    uploaded: List[str]
+    deleted: List[str]
+    unchanged: int
+
+
 field_types = alias(ignore_case=True)
 
 
@@ -209,6 +252,8 @@ class StringFieldType(AtomicFieldType):
 @dataclass(frozen=True)
 class StructFieldType(FieldType):
     fields: List[FieldType]
+    # the names of the fields, in the same order, if known
+    names: Optional[List[str]] = None
 
 
 @field_types.alias("datetime", "timestamp")
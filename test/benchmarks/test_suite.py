@@ -0,0 +1,44 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import pytest
+from expects import expect, equal, contain
+
+from benchmarks.server import StandInFoundryServer
+from benchmarks.suite import BENCHMARKS, BenchmarkResult, regressions, run
+
+
+class TestBenchmarkSuite:
+    @pytest.fixture(autouse=True)
+    def before(self):
+        with StandInFoundryServer() as server:
+            self.server = server
+            yield
+
+    def test_run_quick(self):
+        results = run(self.server, repeat=1, quick=True, report=lambda _: None)
+
+        expect([result.name for result in results]).to(
+            equal([bench.name for bench in BENCHMARKS])
+        )
+
+    def test_regressions(self):
+        result = BenchmarkResult("read_arrow", 100, "rows", best=1.5, median=1.5)
+
+        expect(regressions([result], {"read_arrow[100]": 1.0}, 0.25)).to(
+            contain(
+                "read_arrow[100]: 1.5000s exceeds baseline 1.0000s by more than 25%"
+            )
+        )
+        expect(regressions([result], {"read_arrow[100]": 1.3}, 0.25)).to(equal([]))
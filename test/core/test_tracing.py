@@ -0,0 +1,246 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import contextlib
+import contextvars
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+from conjure_python_client import Service
+from expects import expect, equal, be_a, raise_error
+from mockito import mock, when
+
+from palantir.core import tracing
+from palantir.core.rpc import (
+    ConjureClient,
+    _TraceHeadersAdapter,
+    _TracedService,
+    _inject_trace_headers,
+)
+from palantir.core.types import ResourceIdentifier
+from palantir.datasets.client import DatasetsClient
+from palantir.datasets.core import Dataset, File
+from palantir.datasets.types import DatasetLocator
+
+
+class RecordingSpan:
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+
+    def end(self):
+        self.tracer.ended.append(self.name)
+
+
+class RecordingTracer:
+    def __init__(self):
+        self.spans = []
+        self.active = []
+        self.ended = []
+
+    @contextlib.contextmanager
+    def start_as_current_span(self, name, attributes=None, end_on_exit=True):
+        self.spans.append((name, attributes, tuple(self.active)))
+        self.active.append(name)
+        span = RecordingSpan(self, name)
+        try:
+            yield span
+        finally:
+            self.active.pop()
+            if end_on_exit:
+                span.end()
+
+
+class RecordingAdapter(requests.adapters.BaseAdapter):
+    def __init__(self):
+        super().__init__()
+        self.headers = []
+
+    def send(self, request, *_args, **_kwargs):
+        self.headers.append(dict(request.headers))
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'"echo"'
+        return response
+
+    def close(self):
+        pass
+
+
+class EchoService(Service):
+    def echo(self, dataset_rid: str, logical_path: str = None) -> str:
+        return f"{dataset_rid}/{logical_path}"
+
+
+class TestTracing:
+    @pytest.fixture(autouse=True)
+    def before(self):
+        self.tracer = RecordingTracer()
+        tracing.set_tracer(self.tracer, inject=self._inject)
+        yield
+        tracing.set_tracer(None)
+
+    def _inject(self, headers):
+        headers["X-Test-Span"] = self.tracer.active[-1]
+
+    def test_noop_by_default(self):
+        tracing.set_tracer(None)
+        expect(tracing.get_tracer()).to(be_a(tracing.NoOpTracer))
+
+        with tracing.span("span") as span:
+            expect(span).to(equal(None))
+
+    def test_traced(self):
+        @tracing.traced
+        def operation():
+            with tracing.span("child"):
+                return "result"
+
+        expect(operation()).to(equal("result"))
+        expect([name for name, _, _ in self.tracer.spans]).to(
+            equal(["TestTracing.test_traced.<locals>.operation", "child"])
+        )
+        expect(self.tracer.spans[1][2]).to(
+            equal(("TestTracing.test_traced.<locals>.operation",))
+        )
+
+    def test_traced_propagates_errors(self):
+        @tracing.traced
+        def operation():
+            raise ValueError("failed")
+
+        expect(operation).to(raise_error(ValueError, "failed"))
+        expect(self.tracer.active).to(equal([]))
+
+    def test_traced_service(self):
+        service = _TracedService(
+            EchoService(requests.Session(), ["https://unused"], 1, 1, None)
+        )
+
+        expect(service.echo(dataset_rid="ri.0", logical_path="path")).to(
+            equal("ri.0/path")
+        )
+        expect(self.tracer.spans).to(
+            equal(
+                [
+                    (
+                        "EchoService.echo",
+                        {
+                            "palantir.dataset_rid": "ri.0",
+                            "palantir.logical_path": "path",
+                        },
+                        (),
+                    )
+                ]
+            )
+        )
+
+    def test_inject_trace_headers(self):
+        request = requests.Request("GET", "https://unused").prepare()
+        with tracing.span("rpc"):
+            _inject_trace_headers(request)
+
+        expect(request.headers["X-Test-Span"]).to(equal("rpc"))
+
+    def test_trace_headers_adapter(self):
+        adapter = RecordingAdapter()
+        session = requests.Session()
+        session.mount("https://", _TraceHeadersAdapter(adapter))
+
+        with tracing.span("rpc"):
+            session.get("https://unused/echo")
+
+        expect(adapter.headers[0]["X-Test-Span"]).to(equal("rpc"))
+
+    def test_service_keeps_session_auth(self):
+        service = ConjureClient().service(EchoService, "https://unused")
+
+        session = service._service._requests_session
+        expect(session.auth).to(equal(None))
+        expect(session.get_adapter("https://unused/echo")).to(
+            be_a(_TraceHeadersAdapter)
+        )
+
+    def test_dataset_methods_are_traced(self):
+        client = mock(DatasetsClient)
+        locator = DatasetLocator(
+            rid=ResourceIdentifier.from_string("ri.foundry.test.dataset.0"),
+            branch_id="master",
+            end_transaction_rid=ResourceIdentifier.from_string(
+                "ri.foundry.test.transaction.0"
+            ),
+        )
+        dataset = Dataset(client, locator)
+        when(client).read_dataset(locator).thenReturn("table")
+
+        dataset.read_arrow()
+
+        expect(self.tracer.spans).to(equal([("Dataset.read_arrow", None, ())]))
+
+    def test_list_files_is_traced_until_exhausted(self):
+        client = mock(DatasetsClient)
+        dataset = Dataset(client, mock(DatasetLocator))
+
+        def _list(**_):
+            with tracing.span("CatalogService.get_dataset_view_files2"):
+                yield "file"
+
+        when(client).list_files(
+            dataset=dataset, path=None, max_workers=1, shards=None
+        ).thenReturn(_list())
+
+        files = dataset.list_files()
+        expect(self.tracer.spans).to(equal([]))
+        expect(list(files)).to(equal(["file"]))
+        expect(self.tracer.spans).to(
+            equal(
+                [
+                    ("Dataset.list_files", None, ()),
+                    (
+                        "CatalogService.get_dataset_view_files2",
+                        None,
+                        ("Dataset.list_files",),
+                    ),
+                ]
+            )
+        )
+
+    def test_read_is_traced_until_closed(self):
+        client = mock(DatasetsClient)
+        dataset = mock(Dataset)
+        dataset.rid = "ri.foundry.test.dataset.0"
+        dataset.branch = "master"
+        file = File(dataset, "path", client=client)
+        when(client).read_file(...).thenReturn(io.BytesIO(b"content"))
+
+        with file.read() as stream:
+            expect(self.tracer.active).to(equal([]))
+            expect(self.tracer.ended).to(equal([]))
+            expect(stream.read()).to(equal(b"content"))
+
+        expect(self.tracer.spans).to(equal([("File.read", None, ())]))
+        expect(self.tracer.ended).to(equal(["File.read"]))
+
+    def test_in_current_context_runs_in_a_copy_of_the_callers_context(self):
+        var: contextvars.ContextVar[str] = contextvars.ContextVar("var", default="")
+        token = var.set("caller")
+        try:
+            run = tracing.in_current_context(var.get)
+        finally:
+            var.reset(token)
+
+        with ThreadPoolExecutor(1) as executor:
+            expect(executor.submit(run).result()).to(equal("caller"))
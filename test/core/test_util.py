@@ -0,0 +1,44 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import pytest
+from expects import expect, equal
+
+from palantir.core.util import atomic_write
+
+
+class TestAtomicWrite:
+    def test_replaces_path(self, tmp_path):
+        path = tmp_path / "dir" / "file"
+
+        with atomic_write(path, "w", encoding="utf-8") as file:
+            file.write("first")
+            expect(path.exists()).to(equal(False))
+        with atomic_write(path) as file:
+            file.write(b"second")
+
+        expect(path.read_bytes()).to(equal(b"second"))
+        expect(sorted(p.name for p in path.parent.iterdir())).to(equal(["file"]))
+
+    def test_keeps_path_on_error(self, tmp_path):
+        path = tmp_path / "file"
+        path.write_bytes(b"original")
+
+        with pytest.raises(RuntimeError):
+            with atomic_write(path) as file:
+                file.write(b"partial")
+                raise RuntimeError("failed")
+
+        expect(path.read_bytes()).to(equal(b"original"))
+        expect([p.name for p in tmp_path.iterdir()]).to(equal(["file"]))
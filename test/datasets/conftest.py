@@ -0,0 +1,35 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from typing import Callable
+
+import pytest
+
+from palantir.core import context
+from palantir.datasets import dataset
+from palantir.datasets.core import Dataset
+
+
+@pytest.fixture
+def local_dataset(tmp_path) -> Callable[..., Dataset]:
+    """
+    Returns: A function that creates a Dataset at a path in a local store under `tmp_path / "store"`, passing any
+    keyword arguments on to :func:`palantir.datasets.dataset`.
+    """
+    ctx = context(f"file://{tmp_path / 'store'}")
+
+    def _create(path: str = "/test/dataset", **kwargs) -> Dataset:
+        return dataset(path, create=True, ctx=ctx, **kwargs)
+
+    return _create
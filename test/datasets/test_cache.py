@@ -0,0 +1,66 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import pandas as pd
+import pytest
+from expects import expect, equal
+from mockito import spy2, verify
+
+from palantir.datasets.cache import FileCache
+
+
+class TestFileCache:
+    @pytest.fixture(autouse=True)
+    def before(self, tmp_path, local_dataset):
+        self.dataset = local_dataset()
+        with self.dataset.start_transaction() as txn:
+            txn.write("dir/a.txt", b"a")
+        self.cache = FileCache(tmp_path / "cache")
+
+    def test_get_downloads_once(self):
+        file = next(self.dataset.list_files())
+        spy2(file.read)
+
+        path = self.cache.get(file)
+        expect(self.cache.get(file)).to(equal(path))
+
+        expect(path.read_bytes()).to(equal(b"a"))
+        expect(path.parent.name).to(equal(str(file.transaction_rid)))
+        verify(file, times=1).read()
+
+    def test_requires_transaction(self):
+        with pytest.raises(ValueError):
+            self.cache.get(self.dataset.file("dir/a.txt"))
+
+
+class TestQueryLocal:
+    @pytest.fixture(autouse=True)
+    def before(self, tmp_path, local_dataset):
+        pytest.importorskip("duckdb")
+        self.dataset = local_dataset()
+        self.cache = FileCache(tmp_path / "cache")
+
+    def test_query_local(self):
+        self.dataset.write_pandas(pd.DataFrame({"id": [1, 2, 3], "word": list("abb")}))
+
+        table = self.dataset.query_local(
+            "SELECT word, count(*) AS n FROM ds WHERE id > 1 GROUP BY word",
+            cache=self.cache,
+        )
+
+        expect(table.to_pylist()).to(equal([{"word": "b", "n": 2}]))
+
+    def test_no_parquet_files(self):
+        with pytest.raises(ValueError):
+            self.dataset.query_local("SELECT * FROM ds", cache=self.cache)
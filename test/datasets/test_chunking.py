@@ -0,0 +1,55 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from expects import expect, equal
+
+from palantir.datasets.chunking import ChunkSizer, MEGABYTE
+
+GIGABYTE = 1024 * MEGABYTE
+
+
+class TestChunkSizer:
+    def test_initial_chunk_size(self):
+        expect(ChunkSizer().chunk_size(100 * MEGABYTE)).to(equal(50 * MEGABYTE))
+
+    def test_fast_link(self):
+        sizer = ChunkSizer()
+        sizer.record(100 * MEGABYTE, 0.1)
+
+        expect(sizer.chunk_size(100 * GIGABYTE)).to(equal(1024 * MEGABYTE))
+
+    def test_slow_link(self):
+        sizer = ChunkSizer()
+        sizer.record(10 * MEGABYTE, 10)
+
+        expect(sizer.chunk_size(GIGABYTE)).to(equal(10 * MEGABYTE))
+        sizer.record(10 * MEGABYTE, 100)
+        expect(sizer.chunk_size(GIGABYTE)).to(equal(8 * MEGABYTE))
+
+    def test_small_uploads_are_not_measured(self):
+        sizer = ChunkSizer()
+        sizer.record(MEGABYTE, 10)
+
+        expect(sizer.throughput).to(equal(None))
+
+    def test_max_chunks(self):
+        sizer = ChunkSizer(max_chunks=10)
+
+        expect(sizer.chunk_size(GIGABYTE)).to(equal(GIGABYTE // 10 + 1))
+
+    def test_memory_budget(self):
+        sizer = ChunkSizer(max_chunks=10, memory_budget=16 * MEGABYTE)
+        sizer.record(100 * MEGABYTE, 0.1)
+
+        expect(sizer.chunk_size(GIGABYTE)).to(equal(16 * MEGABYTE))
@@ -12,6 +12,7 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import gzip
 import io
 
 from os.path import relpath
@@ -21,14 +22,16 @@ import pyarrow as pa
 import pytest
 import urllib3
 from dateutil.parser import isoparse
-from expects import expect, equal, raise_error
-from mockito import mock, verifyZeroInteractions, when, verify
+from expects import expect, equal, raise_error, be
+from mockito import arg_that, mock, verifyZeroInteractions, when, verify
 
 from palantir.core.config import StaticTokenProvider, StaticHostnameProvider, AuthToken
 from palantir.core.types import ResourceIdentifier, PalantirContext
 from palantir.datasets.client import DatasetsClient, DatasetServices
+from palantir.datasets.compression import accept_encoding
 from palantir.datasets.core import Transaction, File, Dataset
 from palantir.datasets.rpc.catalog import (
+    AddFilesToDeleteTransactionRequest,
     Dataset as ConjureDataset,
     Transaction as ConjureTransaction,
     TransactionStatus as ConjureTransactionStatus,
@@ -60,6 +63,7 @@ from palantir.datasets.rpc.schema import (
     FoundryFieldType,
     FoundryFieldSchema,
     FoundrySchema as ConjureFoundrySchema,
+    VersionedFoundrySchema,
 )
 from palantir.datasets.rpc.sql import (
     QueryStatus,
@@ -83,6 +87,9 @@ from palantir.datasets.types import (
     FileFormat,
     ArrayFieldType,
     LongFieldType,
+    DecimalFieldType,
+    MapFieldType,
+    StringFieldType,
 )
 
 FILE_LEN = 10
@@ -101,7 +108,7 @@ def get_file(path: str) -> FileResource:
     )
 
 
-# pylint: disable=too-many-public-methods
+# pylint: disable=too-many-public-methods,too-many-lines
 class TestFoundryClient:
     AUTH_HEADER: str = "auth-header"
     DATASET_RID: ResourceIdentifier = ResourceIdentifier.from_string(
@@ -416,6 +423,79 @@ class TestFoundryClient:
         )
         expect(_bytes.read()).to(equal(binary_content))
 
+    @pytest.mark.parametrize("status, expected", [(206, b"3456"), (200, b"56")])
+    def test_read_file_from_offset(self, status, expected):
+        http_response = urllib3.HTTPResponse(
+            body=io.BytesIO(b"3456"), status=status, preload_content=False
+        )
+        when(self.data_proxy_service).get_file_in_view(
+            auth_header=self.AUTH_HEADER,
+            dataset_rid=str(self.DATASET_RID),
+            end_ref=str(self.END_TRANSACTION_RID),
+            logical_path="path",
+            start_transaction_rid=None,
+            accept_encoding="identity",
+            byte_range="bytes=2-",
+        ).thenReturn(http_response)
+
+        stream = self.client.read_file(
+            FileLocator(self.DATASET_RID, str(self.END_TRANSACTION_RID), "path"),
+            offset=2,
+        )
+
+        expect(stream.read()).to(equal(expected))
+
+    def test_put_file_compressed(self):
+        self.client.compression = "gzip"
+        content = b"a,b,c\n" * 1000
+        when(self.data_proxy_service).put_file(...).thenReturn(None)
+
+        self.client.put_file(
+            FileLocator(self.DATASET_RID, str(self.END_TRANSACTION_RID), "data.csv"),
+            content,
+        )
+        self.client.put_file(
+            FileLocator(
+                self.DATASET_RID, str(self.END_TRANSACTION_RID), "data.parquet"
+            ),
+            content,
+        )
+
+        sent = []
+        verify(self.data_proxy_service).put_file(
+            auth_header=self.AUTH_HEADER,
+            dataset_rid=str(self.DATASET_RID),
+            transaction_rid=str(self.END_TRANSACTION_RID),
+            logical_path="data.csv",
+            file_data=arg_that(lambda data: sent.append(b"".join(data)) is None),
+            content_encoding="gzip",
+        )
+        expect(gzip.decompress(sent[0])).to(equal(content))
+        verify(self.data_proxy_service).put_file(
+            auth_header=self.AUTH_HEADER,
+            dataset_rid=str(self.DATASET_RID),
+            transaction_rid=str(self.END_TRANSACTION_RID),
+            logical_path="data.parquet",
+            file_data=content,
+        )
+
+    def test_read_file_compressed(self):
+        self.client.compression = "gzip"
+        when(self.data_proxy_service).get_file_in_view(...).thenReturn(io.BytesIO())
+
+        self.client.read_file(
+            FileLocator(self.DATASET_RID, str(self.END_TRANSACTION_RID), "data.csv")
+        )
+
+        verify(self.data_proxy_service).get_file_in_view(
+            auth_header=self.AUTH_HEADER,
+            dataset_rid=str(self.DATASET_RID),
+            end_ref=str(self.END_TRANSACTION_RID),
+            logical_path="data.csv",
+            start_transaction_rid=None,
+            accept_encoding=accept_encoding(),
+        )
+
     def test_put_file(self):
         path = "path"
         binary_content = b"123456"
@@ -532,6 +612,26 @@ class TestFoundryClient:
             file_data=second_chunk,
         )
 
+    def test_put_file_unchunked_on_fast_link(self):
+        megabyte = 1024 * 1024
+        content = b"0" * (60 * megabyte)
+        self.client.chunk_sizer.record(100 * megabyte, 0.1)
+        when(self.data_proxy_service).put_file(...).thenReturn(None)
+
+        self.client.put_file(
+            FileLocator(self.DATASET_RID, str(self.END_TRANSACTION_RID), "path"),
+            content,
+        )
+
+        verify(self.data_proxy_service, times=1).put_file(
+            auth_header=self.AUTH_HEADER,
+            dataset_rid=str(self.DATASET_RID),
+            transaction_rid=str(self.END_TRANSACTION_RID),
+            logical_path="path",
+            file_data=content,
+        )
+        verifyZeroInteractions(self.data_proxy_concatenation_service)
+
     def test_put_file_chunked_failure(self):
         path = "path"
         megabyte = 1024 * 1024
@@ -684,6 +784,59 @@ class TestFoundryClient:
             request=CloseTransactionRequest(record={}),
         )
 
+    def test_commit_transaction_with_record(self):
+        txn = Transaction(
+            dataset=self.dataset,
+            rid=self.END_TRANSACTION_RID,
+            status=TransactionStatus.OPEN,
+            txn_type=TransactionType.UPDATE,
+            client=self.client,
+            record={"key": "value"},
+        )
+        when(self.catalog_service).commit_transaction(...)
+
+        self.client.commit_transaction(txn)
+
+        verify(self.catalog_service).commit_transaction(
+            auth_header=self.AUTH_HEADER,
+            dataset_rid=str(self.DATASET_RID),
+            transaction_rid=str(self.END_TRANSACTION_RID),
+            request=CloseTransactionRequest(record={"key": "value"}),
+        )
+
+    def test_get_transaction_keeps_record(self):
+        self.txn.record = {"key": "value"}  # noqa
+        when(self.catalog_service).get_transaction(
+            auth_header=self.AUTH_HEADER,
+            dataset_rid=str(self.DATASET_RID),
+            transaction_rid=str(self.END_TRANSACTION_RID),
+        ).thenReturn(self.txn)
+
+        expect(
+            self.client.get_transaction(self.dataset, self.END_TRANSACTION_RID).record
+        ).to(equal({"key": "value"}))
+
+    def test_delete_files(self):
+        txn = Transaction(
+            dataset=self.dataset,
+            rid=self.END_TRANSACTION_RID,
+            status=TransactionStatus.OPEN,
+            txn_type=TransactionType.DELETE,
+            client=self.client,
+        )
+        when(self.catalog_service).add_files_to_delete_transaction(...)
+
+        txn.delete(["a.txt", "b.txt"])
+
+        verify(self.catalog_service).add_files_to_delete_transaction(
+            auth_header=self.AUTH_HEADER,
+            dataset_rid=str(self.DATASET_RID),
+            transaction_rid=str(self.END_TRANSACTION_RID),
+            request=AddFilesToDeleteTransactionRequest(
+                logical_paths=["a.txt", "b.txt"]
+            ),
+        )
+
     def test_abort_transaction(self):
         txn = Transaction(
             dataset=self.dataset,
@@ -770,6 +923,111 @@ class TestFoundryClient:
             schema=expected,
         )
 
+    def test_get_schema(self):
+        schema = ConjureFoundrySchema(
+            field_schema_list=[
+                FoundryFieldSchema(
+                    name="foo", field_type=FoundryFieldType.STRING, custom_metadata={}
+                ),
+                FoundryFieldSchema(
+                    name="bar",
+                    field_type=FoundryFieldType.DECIMAL,
+                    precision=38,
+                    scale=2,
+                    custom_metadata={},
+                    nullable=False,
+                ),
+                FoundryFieldSchema(
+                    name="tags",
+                    field_type=FoundryFieldType.MAP,
+                    map_key_type=FoundryFieldSchema(
+                        field_type=FoundryFieldType.STRING, custom_metadata={}
+                    ),
+                    map_value_type=FoundryFieldSchema(
+                        field_type=FoundryFieldType.ARRAY,
+                        array_subtype=FoundryFieldSchema(
+                            field_type=FoundryFieldType.LONG, custom_metadata={}
+                        ),
+                        custom_metadata={},
+                    ),
+                    custom_metadata={"key": "value"},
+                ),
+            ],
+            data_frame_reader_class="com.palantir.foundry.spark.input.ParquetDataFrameReader",
+            custom_metadata={"key": "value", "format": "parquet"},
+        )
+        when(self.schema_service).get_schema(
+            auth_header=self.AUTH_HEADER,
+            dataset_rid=str(self.DATASET_RID),
+            branch_id=self.BRANCH_ID,
+            end_transaction_rid=str(self.END_TRANSACTION_RID),
+        ).thenReturn(
+            VersionedFoundrySchema(
+                branch_id=self.BRANCH_ID,
+                transaction_rid=str(self.END_TRANSACTION_RID),
+                version_id="version",
+                schema=schema,
+            )
+        )
+
+        result = self.client.get_schema(self.locator)
+
+        expect(self.client.get_schema(self.locator)).to(be(result))
+        verify(self.schema_service, times=1).get_schema(...)
+        expect(result).to(
+            equal(
+                FoundrySchema(
+                    fields=[
+                        Field("foo", "str"),
+                        Field("bar", DecimalFieldType(38, 2), nullable=False),
+                        Field(
+                            "tags",
+                            MapFieldType(
+                                StringFieldType(), ArrayFieldType(LongFieldType())
+                            ),
+                            metadata={"key": "value"},
+                        ),
+                    ],
+                    file_format=FileFormat.PARQUET,
+                )
+            )
+        )
+        expect(result.metadata).to(equal({"key": "value"}))
+
+    def test_get_schema_absent(self):
+        when(self.schema_service).get_schema(
+            auth_header=self.AUTH_HEADER,
+            dataset_rid=str(self.DATASET_RID),
+            branch_id=self.BRANCH_ID,
+            end_transaction_rid=str(self.END_TRANSACTION_RID),
+        ).thenReturn(None)
+
+        expect(self.client.get_schema(self.locator)).to(equal(None))
+        # another client can put a schema on the same end transaction, so an absent schema is not cached
+        expect(self.client.get_schema(self.locator)).to(equal(None))
+        verify(self.schema_service, times=2).get_schema(...)
+
+    def test_put_schema_invalidates_cached_schema(self):
+        when(self.schema_service).get_schema(...).thenReturn(
+            VersionedFoundrySchema(
+                branch_id=self.BRANCH_ID,
+                transaction_rid=str(self.END_TRANSACTION_RID),
+                version_id="version",
+                schema=ConjureFoundrySchema(
+                    field_schema_list=[],
+                    data_frame_reader_class="com.palantir.foundry.spark.input.ParquetDataFrameReader",
+                    custom_metadata={},
+                ),
+            )
+        )
+        when(self.schema_service).put_schema(...)
+
+        self.client.get_schema(self.locator)
+        self.client.put_schema(self.dataset, FoundrySchema([("foo", "str")]))
+        self.client.get_schema(self.locator)
+
+        verify(self.schema_service, times=2).get_schema(...)
+
     def test_read_dataset(self):
         query_id = "query_id"
         running = QueryStatus(running=RunningQueryStatus())
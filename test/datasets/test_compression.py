@@ -0,0 +1,84 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import gzip
+
+import pytest
+from expects import expect, equal, be_false, be_true, raise_error
+
+from benchmarks.server import StandInFoundryServer
+from palantir.datasets import dataset
+from palantir.datasets.compression import (
+    CompressedContent,
+    decompress,
+    is_compressible,
+    validate_encoding,
+)
+
+CSV = b"id,value\n" + b"".join(b"%d,%d\n" % (i, i * i) for i in range(100_000))
+
+
+class TestCompression:
+    def test_is_compressible(self):
+        expect(is_compressible("data.csv", CSV)).to(be_true)
+        expect(is_compressible("data.csv", b"small")).to(be_false)
+        expect(is_compressible("data.PARQUET", CSV)).to(be_false)
+        expect(is_compressible("data", gzip.compress(CSV))).to(be_false)
+        expect(is_compressible("part-0", b"PAR1" + CSV)).to(be_false)
+
+    def test_gzip(self):
+        body = CompressedContent(CSV, "gzip")
+
+        compressed = b"".join(body)
+
+        expect(len(compressed)).to(equal(len(b"".join(body))))
+        expect(len(compressed) < len(CSV) / 2).to(be_true)
+        expect(gzip.decompress(compressed)).to(equal(CSV))
+        expect(b"".join(decompress(body, "gzip"))).to(equal(CSV))
+
+    def test_zstd(self):
+        pytest.importorskip("zstandard")
+
+        expect(b"".join(decompress(CompressedContent(CSV, "zstd"), "zstd"))).to(
+            equal(CSV)
+        )
+
+    def test_unsupported_encoding(self):
+        expect(lambda: validate_encoding("br")).to(raise_error(ValueError))
+
+    def test_dataset_round_trip(self, local_dataset):
+        target = local_dataset(compression="gzip")
+
+        with target.start_transaction() as txn:
+            txn.write("data.csv", CSV)
+
+        expect(target.file("data.csv").read().read()).to(equal(CSV))
+
+    @pytest.mark.parametrize("encoding", ["gzip", "zstd"])
+    def test_http_round_trip(self, encoding):
+        if encoding == "zstd":
+            pytest.importorskip("zstandard")
+
+        with StandInFoundryServer() as server:
+            target = dataset(
+                "/compression/dataset",
+                create=True,
+                ctx=server.context(),
+                compression=encoding,
+            )
+            with target.start_transaction() as txn:
+                txn.write("data.csv", CSV)
+
+            with target.file("data.csv").read() as stream:
+                expect(stream.read()).to(equal(CSV))
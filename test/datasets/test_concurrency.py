@@ -0,0 +1,109 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from expects import expect, equal, be
+from mockito import mock, when
+
+from palantir.core import context
+from palantir.core.rpc import ConjureClient
+from palantir.datasets.client import DatasetServices, DatasetsClient
+from palantir.datasets.rpc.catalog import CatalogService
+
+THREADS = 16
+
+
+def _hammer(func, count=THREADS * 4):
+    """Calls func(index) for each index from many threads at once and returns the results."""
+    barrier = threading.Barrier(THREADS)
+
+    def _call(index):
+        if index < THREADS:
+            barrier.wait()
+        return func(index)
+
+    with ThreadPoolExecutor(THREADS) as executor:
+        return list(executor.map(_call, range(count)))
+
+
+class TestDatasetServicesConcurrency:
+    def test_services_are_created_once(self):
+        services = DatasetServices(context("example.com", "token"))
+        services.factory = mock(ConjureClient)
+        created = []
+
+        def _create(_service, uri):
+            time.sleep(0.01)
+            created.append(uri)
+            return object()
+
+        when(services.factory).service(CatalogService, ...).thenAnswer(_create)
+
+        results = _hammer(lambda _: services.catalog_service)
+
+        expect(created).to(equal(["https://example.com/foundry-catalog/api"]))
+        expect(all(result is results[0] for result in results)).to(be(True))
+
+
+class TestSharedDataset:
+    @pytest.fixture(autouse=True)
+    def before(self, local_dataset):
+        self.dataset = local_dataset()
+
+    def test_shared_client_writes_to_many_datasets(self):
+        client: DatasetsClient = self.dataset.client
+
+        def _write(index):
+            created = client.create_dataset(f"/concurrency/{index}", "master")
+            with created.start_transaction() as txn:
+                txn.write(f"{index}.txt", str(index).encode())
+            return created
+
+        for index, created in enumerate(_hammer(_write)):
+            expect([file.path for file in created.list_files()]).to(
+                equal([f"{index}.txt"])
+            )
+            expect(created.file(f"{index}.txt").read().read()).to(
+                equal(str(index).encode())
+            )
+
+    def test_views_are_consistent_while_committing(self):
+        commits = 20
+        committed = threading.Event()
+
+        def _commit():
+            try:
+                for index in range(commits):
+                    with self.dataset.start_transaction() as txn:
+                        txn.write(f"{index}.txt", b"content")
+            finally:
+                committed.set()
+
+        def _read(_):
+            while not committed.is_set():
+                self.dataset.update_view()
+                for file in self.dataset.list_files():
+                    file.read().close()
+
+        writer = threading.Thread(target=_commit)
+        writer.start()
+        _hammer(_read, THREADS)
+        writer.join()
+
+        self.dataset.update_view()
+        expect(len(list(self.dataset.list_files()))).to(equal(commits))
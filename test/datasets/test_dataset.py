@@ -13,16 +13,23 @@
 #  limitations under the License.
 
 import io
+import tracemalloc
 
 import pandas as pd
 import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
-from expects import expect, equal
+from expects import expect, equal, contain
 from mockito import mock, when, verify
 
+from benchmarks.server import StandInFoundryServer
 from palantir.core.types import ResourceIdentifier
+from palantir.datasets import dataset
+from palantir.datasets.checkpoint import FileCheckpoint
+from palantir.datasets.chunking import ChunkSizer
 from palantir.datasets.client import DatasetsClient
 from palantir.datasets.core import Dataset, File, Transaction
+from palantir.datasets.errors import SchemaMismatchError
 from palantir.datasets.types import (
     DatasetLocator,
     TransactionType,
@@ -32,6 +39,10 @@ from palantir.datasets.types import (
     Field,
     StringFieldType,
     LongFieldType,
+    SyncResult,
+    FileChangeType,
+    StructFieldType,
+    DoubleFieldType,
 )
 
 
@@ -39,6 +50,7 @@ class TestDataset:
     @pytest.fixture(autouse=True)
     def before(self):
         self.client = mock(DatasetsClient)
+        self.client.chunk_sizer = ChunkSizer()
         self.locator = DatasetLocator(
             rid=ResourceIdentifier.from_string("ri.foundry.test.dataset.0"),
             branch_id="master",
@@ -80,7 +92,9 @@ class TestDataset:
             yield file1
             yield file2
 
-        when(self.client).list_files(dataset=self.dataset, path=None).thenReturn(gen())
+        when(self.client).list_files(
+            dataset=self.dataset, path=None, max_workers=1, shards=None
+        ).thenReturn(gen())
 
         expect(list(self.dataset.list_files())).to(equal([file1, file2]))
 
@@ -100,9 +114,9 @@ class TestDataset:
             yield file1
             yield file2
 
-        when(self.client).list_files(dataset=self.dataset, path="path").thenReturn(
-            gen()
-        )
+        when(self.client).list_files(
+            dataset=self.dataset, path="path", max_workers=1, shards=None
+        ).thenReturn(gen())
 
         expect(list(self.dataset.list_files(path="path"))).to(equal([file1, file2]))
 
@@ -123,7 +137,7 @@ class TestDataset:
     def test_read_pandas(self):
         table = mock(pa.Table)
         df = mock(pd.DataFrame)
-        when(table).to_pandas().thenReturn(df)
+        when(table).to_pandas(self_destruct=True, split_blocks=True).thenReturn(df)
         when(self.client).read_dataset(self.locator).thenReturn(table)
 
         expect(self.dataset.read_pandas()).to(equal(df))
@@ -205,3 +219,606 @@ class TestDataset:
                 ]
             ),
         )
+
+
+class TestSyncFrom:
+    @pytest.fixture(autouse=True)
+    def before(self, tmp_path, local_dataset):
+        self.local_dir = tmp_path / "local"
+        self.local_dir.mkdir()
+        self.dataset = local_dataset()
+
+    def _write(self, path, content):
+        (self.local_dir / path).parent.mkdir(parents=True, exist_ok=True)
+        (self.local_dir / path).write_bytes(content)
+
+    def _contents(self):
+        return {file.path: file.read().read() for file in self.dataset.list_files()}
+
+    def test_sync_from(self):
+        self._write("a.txt", b"a")
+        self._write("dir/b.txt", b"b")
+        self._write(".hidden", b"hidden")
+
+        expect(self.dataset.sync_from(self.local_dir)).to(
+            equal(SyncResult(uploaded=["a.txt", "dir/b.txt"], deleted=[], unchanged=0))
+        )
+        expect(self._contents()).to(equal({"a.txt": b"a", "dir/b.txt": b"b"}))
+
+        self._write("a.txt", b"aa")
+        self._write("c.txt", b"c")
+        (self.local_dir / "dir" / "b.txt").unlink()
+
+        expect(self.dataset.sync_from(self.local_dir)).to(
+            equal(SyncResult(uploaded=["a.txt", "c.txt"], deleted=[], unchanged=0))
+        )
+        expect(self.dataset.sync_from(self.local_dir, delete=True)).to(
+            equal(SyncResult(uploaded=[], deleted=["dir/b.txt"], unchanged=2))
+        )
+        expect(self._contents()).to(equal({"a.txt": b"aa", "c.txt": b"c"}))
+
+    def test_sync_from_with_checksum(self):
+        self._write("a.txt", b"a")
+        self._write("b.txt", b"b")
+        self.dataset.sync_from(self.local_dir, checksum=True)
+
+        self._write("a.txt", b"x")
+
+        expect(self.dataset.sync_from(self.local_dir)).to(
+            equal(SyncResult(uploaded=[], deleted=[], unchanged=2))
+        )
+        expect(self.dataset.sync_from(self.local_dir, checksum=True)).to(
+            equal(SyncResult(uploaded=["a.txt"], deleted=[], unchanged=1))
+        )
+        expect(self._contents()).to(equal({"a.txt": b"x", "b.txt": b"b"}))
+
+
+class TestIncrementalReads:
+    @pytest.fixture(autouse=True)
+    def before(self, tmp_path, local_dataset):
+        self.tmp_path = tmp_path
+        self.dataset = local_dataset()
+
+    def _append(self, name, values):
+        with io.BytesIO() as buf:
+            pd.DataFrame({"value": values}).to_parquet(buf)
+            with self.dataset.start_transaction(TransactionType.APPEND) as txn:
+                txn.write(f"{name}.parquet", buf.getvalue())
+        return self.dataset.view[1]
+
+    def test_list_files_since(self):
+        first = self._append("first", [1])
+        self._append("second", [2])
+        self._append("third", [3])
+
+        expect([file.path for file in self.dataset.list_files_since(first)]).to(
+            equal(["second.parquet", "third.parquet"])
+        )
+        expect(len(list(self.dataset.list_files_since(None)))).to(equal(3))
+        expect(list(self.dataset.list_files_since(self.dataset.view[1]))).to(equal([]))
+
+    def test_read_arrow_since(self):
+        checkpoint = FileCheckpoint(self.tmp_path / "checkpoint")
+        self._append("first", [1, 2])
+
+        expect(self.dataset.read_arrow_since(checkpoint.load()).num_rows).to(equal(2))
+        checkpoint.save(self.dataset.view[1])
+
+        self._append("second", [3])
+        self._append("third", [4, 5])
+
+        table = self.dataset.read_arrow_since(checkpoint.load())
+        expect(table.column("value").to_pylist()).to(equal([3, 4, 5]))
+        checkpoint.save(self.dataset.view[1])
+        expect(FileCheckpoint(self.tmp_path / "checkpoint").load()).to(
+            equal(self.dataset.view[1])
+        )
+        expect(self.dataset.read_arrow_since(checkpoint.load()).num_rows).to(equal(0))
+
+    def test_read_arrow_since_closes_files(self, monkeypatch):
+        self._append("first", [1, 2])
+        self._append("second", [3])
+        streams = []
+        read_file = self.dataset.client.read_file
+
+        def _read_file(locator):
+            streams.append(read_file(locator))
+            return streams[-1]
+
+        monkeypatch.setattr(self.dataset.client, "read_file", _read_file)
+
+        expect(self.dataset.read_arrow_since(None).num_rows).to(equal(3))
+        expect([stream.closed for stream in streams]).to(equal([True, True]))
+
+
+class TestDiff:
+    @pytest.fixture(autouse=True)
+    def before(self, local_dataset):
+        self.dataset = local_dataset()
+
+    def test_diff(self):
+        with self.dataset.start_transaction(TransactionType.SNAPSHOT) as txn:
+            txn.write_many({"a": b"a", "b": b"b", "c": b"c", "d": b"d"})
+        before = self.dataset.view
+        with self.dataset.start_transaction(TransactionType.UPDATE) as txn:
+            txn.write_many({"b": b"bb", "e": b"e"})
+        with self.dataset.start_transaction(TransactionType.DELETE) as txn:
+            txn.delete(["c"])
+
+        changes = list(self.dataset.diff(before))
+
+        expect([(c.path, c.change_type) for c in changes]).to(
+            equal(
+                [
+                    ("b", FileChangeType.REPLACED),
+                    ("c", FileChangeType.REMOVED),
+                    ("e", FileChangeType.ADDED),
+                ]
+            )
+        )
+        expect(changes[0].before.read().read()).to(equal(b"b"))
+        expect(changes[0].after.read().read()).to(equal(b"bb"))
+        expect(list(self.dataset.diff(self.dataset))).to(equal([]))
+
+        table = self.dataset.diff_arrow(before)
+        expect(table.column("change_type").to_pylist()).to(
+            equal(["REPLACED", "REMOVED", "ADDED"])
+        )
+        expect(table.column("after_length").to_pylist()).to(equal([2, None, 1]))
+
+    def test_diff_in_catalog_order(self):
+        # U+FF01 sorts before U+1F600 by code point but after it by UTF-16 code unit, like the catalog sorts
+        with self.dataset.start_transaction(TransactionType.SNAPSHOT) as txn:
+            txn.write("\uff01", b"a")
+        before = self.dataset.view
+        with self.dataset.start_transaction(TransactionType.UPDATE) as txn:
+            txn.write("\U0001f600", b"b")
+
+        expect([file.path for file in self.dataset.list_files()]).to(
+            equal(["\U0001f600", "\uff01"])
+        )
+        expect([(c.path, c.change_type) for c in self.dataset.diff(before)]).to(
+            equal([("\U0001f600", FileChangeType.ADDED)])
+        )
+
+
+class TestFileReadInto:
+    @pytest.fixture(autouse=True)
+    def before(self, local_dataset):
+        self.dataset = local_dataset()
+        self.content = bytes(range(256)) * 1000
+        with self.dataset.start_transaction() as txn:
+            txn.write("blob.bin", self.content)
+
+    def test_read_into(self):
+        buffer = bytearray(len(self.content) + 10)
+
+        num_bytes = self.dataset.file("blob.bin").read_into(buffer)
+
+        expect(num_bytes).to(equal(len(self.content)))
+        expect(bytes(buffer[:num_bytes])).to(equal(self.content))
+
+    def test_read_into_too_small(self):
+        with pytest.raises(ValueError):
+            self.dataset.file("blob.bin").read_into(bytearray(10))
+
+    def test_read_arrow_buffer(self):
+        listed = next(self.dataset.list_files())
+
+        for file in (listed, self.dataset.file("blob.bin")):
+            buffer = file.read_arrow_buffer()
+            expect(buffer.size).to(equal(len(self.content)))
+            expect(buffer.to_pybytes()).to(equal(self.content))
+
+
+class TestFileReadIntoHttp:
+    @pytest.fixture(autouse=True)
+    def before(self):
+        with StandInFoundryServer() as server:
+            self.dataset = dataset(
+                "/read-into/dataset", create=True, ctx=server.context()
+            )
+            self.size = 8 * 1024 * 1024
+            with self.dataset.start_transaction() as txn:
+                txn.write("blob.bin", b"x" * self.size)
+            yield
+
+    def test_read_into_memory(self):
+        file = next(self.dataset.list_files())
+        buffer = bytearray(self.size)
+
+        tracemalloc.start()
+        try:
+            num_bytes = file.read_into(buffer)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        expect(num_bytes).to(equal(self.size))
+        expect(bytes(buffer) == b"x" * self.size).to(equal(True))
+        expect(peak < self.size // 2).to(equal(True))
+
+    def test_read_arrow_buffer_memory(self):
+        file = next(self.dataset.list_files())
+
+        tracemalloc.start()
+        try:
+            buffer = file.read_arrow_buffer()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        expect(buffer.size).to(equal(self.size))
+        expect(peak < self.size // 2).to(equal(True))
+
+
+class TestReadPandas:
+    @pytest.fixture(autouse=True)
+    def before(self, local_dataset):
+        self.dataset = local_dataset()
+        self.df = pd.DataFrame({"id": list(range(10)), "word": ["a", "b"] * 5})
+        self.dataset.write_pandas(self.df)
+
+    def test_pyarrow_backend(self):
+        df = self.dataset.read_pandas(dtype_backend="pyarrow")
+
+        expect(isinstance(df["id"].dtype, pd.ArrowDtype)).to(equal(True))
+        expect(df["word"].tolist()).to(equal(self.df["word"].tolist()))
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            self.dataset.read_pandas(dtype_backend="unknown")
+
+    def test_strings_as_categories(self):
+        for columns in (True, ["word"]):
+            df = self.dataset.read_pandas(strings_as_categories=columns)
+            expect(str(df["word"].dtype)).to(equal("category"))
+            expect(str(df["id"].dtype)).to(equal("int64"))
+            expect(df["word"].astype(str).tolist()).to(equal(self.df["word"].tolist()))
+
+    def test_chunks(self):
+        chunks = list(self.dataset.read_pandas(chunk_size=4))
+
+        expect([len(chunk) for chunk in chunks]).to(equal([4, 4, 2]))
+        expect(pd.concat(chunks, ignore_index=True).equals(self.df)).to(equal(True))
+
+
+class TestPolarsAndDuckDB:
+    @pytest.fixture(autouse=True)
+    def before(self, local_dataset):
+        self.dataset = local_dataset()
+        self.df = pd.DataFrame({"id": [1, 2, 3], "word": ["a", "b", "c"]})
+        self.dataset.write_pandas(self.df)
+
+    def test_read_polars(self):
+        polars = pytest.importorskip("polars")
+
+        df = self.dataset.read_polars()
+
+        expect(df.to_dict(as_series=False)).to(equal(self.df.to_dict("list")))
+        lazy = self.dataset.read_polars(lazy=True)
+        expect(
+            lazy.filter(polars.col("id") > 1).select("word").collect()["word"].to_list()
+        ).to(equal(["b", "c"]))
+
+    def test_to_duckdb(self):
+        duckdb = pytest.importorskip("duckdb")
+
+        connection = duckdb.connect()
+        relation = self.dataset.to_duckdb(connection)
+
+        expect(relation.filter("id > 1").project("word").fetchall()).to(
+            equal([("b",), ("c",)])
+        )
+
+    def test_to_duckdb_default_connection(self):
+        pytest.importorskip("duckdb")
+
+        relation = self.dataset.to_duckdb()
+
+        expect(relation.project("word").fetchall()).to(equal([("a",), ("b",), ("c",)]))
+
+
+class TestWritePandasModes:
+    @pytest.fixture(autouse=True)
+    def before(self, local_dataset):
+        self.dataset = local_dataset()
+        self.df = pd.DataFrame({"id": [1, 2], "word": ["a", "b"]})
+        self.dataset.write_pandas(self.df)
+
+    def test_append(self):
+        more = pd.DataFrame({"id": [3], "word": ["c"]})
+
+        self.dataset.write_pandas(more, mode="append")
+        self.dataset.write_pandas(more, mode="update")
+
+        paths = sorted(file.path for file in self.dataset.list_files())
+        expect(paths[0]).to(equal("dataframe.parquet"))
+        expect(len(paths)).to(equal(3))
+        expect(all(path.startswith("part-") for path in paths[1:])).to(equal(True))
+        expect(sorted(self.dataset.read_pandas()["id"].tolist())).to(
+            equal([1, 2, 3, 3])
+        )
+
+    def test_append_to_empty_dataset(self, local_dataset):
+        empty = local_dataset("/write-pandas/empty")
+
+        empty.write_pandas(self.df, mode="append")
+
+        expect(empty.read_pandas().equals(self.df)).to(equal(True))
+
+    def test_incompatible_schema(self):
+        with pytest.raises(SchemaMismatchError) as exc_info:
+            self.dataset.write_pandas(
+                pd.DataFrame({"id": ["1"], "word": ["c"]}), mode="append"
+            )
+
+        expect(str(exc_info.value)).to(contain("['id']"))
+        expect(len(list(self.dataset.list_files()))).to(equal(1))
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            self.dataset.write_pandas(self.df, mode="merge")
+
+
+class TestSchema:
+    @pytest.fixture(autouse=True)
+    def before(self, local_dataset):
+        self.dataset = local_dataset()
+
+    def test_schema(self):
+        expect(self.dataset.schema()).to(equal(None))
+        expect(self.dataset.arrow_schema()).to(equal(None))
+
+        self.dataset.write_pandas(pd.DataFrame({"id": [1], "word": ["a"]}))
+
+        expect(self.dataset.schema()).to(
+            equal(FoundrySchema([("id", "long"), ("word", "str")]))
+        )
+        expect(self.dataset.arrow_schema()).to(
+            equal(pa.schema([("id", pa.int64()), ("word", pa.string())]))
+        )
+
+    def test_struct_round_trip(self):
+        table = pa.table(
+            {
+                "id": pa.array([1, 2], pa.int64()),
+                "point": pa.array(
+                    [{"x": 1.0, "y": 2.0}, {"x": 3.0, "y": 4.0}],
+                    pa.struct([("x", pa.float64()), ("y", pa.float64())]),
+                ),
+            }
+        )
+        buffer = io.BytesIO()
+        pq.write_table(table, buffer)
+        with self.dataset.start_transaction() as txn:
+            txn.write("part-0.parquet", buffer.getvalue())
+        self.dataset.client.put_schema(
+            self.dataset,
+            FoundrySchema(
+                [
+                    ("id", "long"),
+                    (
+                        "point",
+                        StructFieldType(
+                            [DoubleFieldType(), DoubleFieldType()], ["x", "y"]
+                        ),
+                    ),
+                ]
+            ),
+        )
+
+        expect(self.dataset.schema().fields[1].type.names).to(equal(["x", "y"]))
+        expect(self.dataset.arrow_schema()).to(equal(self.dataset.read_arrow().schema))
+
+
+class TestPipelinedWritePandas:
+    @pytest.fixture(autouse=True)
+    def before(self, local_dataset):
+        self.dataset = local_dataset(
+            "/pipelined/dataset", chunk_sizer=ChunkSizer(initial_chunk_size=64 * 1024)
+        )
+        self.df = pd.DataFrame(
+            {"id": range(100_000), "value": [i * 0.5 for i in range(100_000)]}
+        )
+        self.chunks = []
+        put_file_chunks = self.dataset.client.put_file_chunks
+
+        def _put_file_chunks(locator, chunks, max_workers):
+            return put_file_chunks(
+                locator,
+                (self.chunks.append(len(chunk)) or chunk for chunk in chunks),
+                max_workers,
+            )
+
+        self.dataset.client.put_file_chunks = _put_file_chunks
+
+    def test_write_pandas(self):
+        self.dataset.write_pandas(self.df)
+
+        expect(len(self.chunks) > 2).to(equal(True))
+        expect(all(size >= 64 * 1024 for size in self.chunks[:-1])).to(equal(True))
+        expect([file.path for file in self.dataset.list_files()]).to(
+            equal(["dataframe.parquet"])
+        )
+        expect(self.dataset.read_pandas().equals(self.df)).to(equal(True))
+
+    def test_write_pandas_append(self):
+        self.dataset.write_pandas(self.df.head(10))
+
+        self.dataset.write_pandas(self.df, mode="append", max_workers=2)
+
+        expect(len(self.dataset.read_pandas())).to(equal(100_010))
+
+    def test_write_pandas_counts_string_contents(self):
+        df = pd.DataFrame({"text": ["x" * 1000] * 100})
+
+        self.dataset.write_pandas(df)
+
+        expect(len(self.chunks) > 0).to(equal(True))
+        expect(self.dataset.read_pandas().equals(df)).to(equal(True))
+
+
+class TestIterFileContents:
+    @pytest.fixture(autouse=True)
+    def before(self, local_dataset):
+        self.dataset = local_dataset()
+        self.files = {f"{i:02d}.txt": str(i).encode() * (i + 1) for i in range(20)}
+        with self.dataset.start_transaction() as txn:
+            txn.write_many(self.files)
+        self.in_flight = []
+        self.max_in_flight = 0
+        self.max_in_flight_bytes = 0
+        service = self.dataset.client.services.data_proxy_service
+        get_file_in_view = service.get_file_in_view
+
+        def _get_file_in_view(**kwargs):
+            self.in_flight.append(kwargs["logical_path"])
+            self.max_in_flight = max(self.max_in_flight, len(self.in_flight))
+            self.max_in_flight_bytes = max(
+                self.max_in_flight_bytes,
+                sum(len(self.files[path]) for path in self.in_flight),
+            )
+            return get_file_in_view(**kwargs)
+
+        service.get_file_in_view = _get_file_in_view
+
+    def _consume(self, **kwargs):
+        contents = {}
+        for file, content in self.dataset.iter_file_contents(**kwargs):
+            contents[file.path] = content
+            self.in_flight.remove(file.path)
+        return contents
+
+    def test_ordered_contents(self):
+        contents = self._consume(prefetch=4)
+
+        expect(list(contents)).to(equal(sorted(self.files)))
+        expect(contents).to(equal(self.files))
+        expect(self.max_in_flight <= 4).to(equal(True))
+
+    def test_max_bytes(self):
+        expect(self._consume(prefetch=8, max_bytes=20)).to(equal(self.files))
+        # at most the file held by the caller and either 20 bytes of files or a single larger file
+        expect(self.max_in_flight_bytes <= 40 + 40).to(equal(True))
+
+    def test_stop_early(self):
+        contents = self.dataset.iter_file_contents(prefetch=2)
+
+        file, content = next(contents)
+        contents.close()
+
+        expect(file.path).to(equal("00.txt"))
+        expect(content).to(equal(b"0"))
+
+
+class TestListFiles:
+    @pytest.fixture(autouse=True)
+    def before(self, local_dataset):
+        self.dataset = local_dataset()
+        self.paths = [
+            f"year={year}/part-{i:03d}.parquet"
+            for year in range(2020, 2025)
+            for i in range(90)
+        ]
+        with self.dataset.start_transaction() as txn:
+            txn.write_many({path: b"x" for path in self.paths})
+        self.pages = []
+        self.logical_paths = set()
+        catalog = self.dataset.client.services.catalog_service
+        get_dataset_view_files2 = catalog.get_dataset_view_files2
+
+        def _get_dataset_view_files2(**kwargs):
+            self.pages.append((kwargs["page_size"], kwargs["page_start_logical_path"]))
+            self.logical_paths.add(kwargs["logical_path"])
+            return get_dataset_view_files2(**kwargs)
+
+        catalog.get_dataset_view_files2 = _get_dataset_view_files2
+
+    def test_page_size_grows(self):
+        expect([file.path for file in self.dataset.list_files()]).to(equal(self.paths))
+        expect([page_size for page_size, _ in self.pages]).to(equal([100, 200, 400]))
+
+    def test_discovered_shards(self):
+        files = list(self.dataset.list_files(max_workers=4))
+
+        expect(sorted(file.path for file in files)).to(equal(self.paths))
+        shard_starts = {start for size, start in self.pages if size > 1}
+        expect(shard_starts).to(
+            equal({None, "year=2021", "year=2022", "year=2023", "year=2024"})
+        )
+
+    def test_given_shards(self):
+        files = self.dataset.list_files(
+            "year=2022/", max_workers=2, shards=["year=2022/part-05"]
+        )
+
+        expect(sorted(file.path for file in files)).to(
+            equal([path for path in self.paths if path.startswith("year=2022/")])
+        )
+        expect(all(size > 1 for size, _ in self.pages)).to(equal(True))
+
+    def test_stop_early(self):
+        files = self.dataset.list_files(max_workers=4)
+
+        expect(next(files).path).to(contain("part-000"))
+        files.close()
+
+    def test_glob(self):
+        files = self.dataset.list_files(glob="year=2024/**/part-00?.parquet")
+
+        expect([file.path for file in files]).to(
+            equal([f"year=2024/part-00{i}.parquet" for i in range(10)])
+        )
+        expect(self.logical_paths).to(equal({"year=2024/"}))
+
+    @pytest.mark.parametrize("max_workers", [1, 2])
+    def test_glob_with_braces(self, max_workers):
+        files = self.dataset.list_files(
+            glob="year={2021,2023}/part-01*", max_workers=max_workers
+        )
+
+        expect(sorted(file.path for file in files)).to(
+            equal(
+                [
+                    f"year={year}/part-{i:03d}.parquet"
+                    for year in (2021, 2023)
+                    for i in range(10, 20)
+                ]
+            )
+        )
+        expect(self.logical_paths).to(equal({"year=2021/part-01", "year=2023/part-01"}))
+
+    @pytest.mark.parametrize(
+        "glob", ["./year=2024/part-00?.parquet", "/year=2024/part-00?.parquet"]
+    )
+    def test_glob_relative_to_root(self, glob):
+        files = self.dataset.list_files("./", glob=glob)
+
+        expect([file.path for file in files]).to(
+            equal([f"year=2024/part-00{i}.parquet" for i in range(10)])
+        )
+        expect(self.logical_paths).to(equal({"year=2024/part-00"}))
+
+    def test_glob_within_path(self):
+        expect(list(self.dataset.list_files("year=2021/", glob="year=2022/*"))).to(
+            equal([])
+        )
+        files = self.dataset.list_files("year=2022/", glob="**/part-08[5-9]*")
+
+        expect([file.path for file in files]).to(
+            equal([f"year=2022/part-{i:03d}.parquet" for i in range(85, 90)])
+        )
+        expect(self.logical_paths).to(equal({"year=2022/"}))
+
+    def test_regex(self):
+        files = self.dataset.list_files(regex=r"year=2020/part-0[0-4]5\.parquet")
+
+        expect([file.path for file in files]).to(
+            equal([f"year=2020/part-0{i}5.parquet" for i in range(5)])
+        )
+        expect(self.logical_paths).to(equal({"year=2020/part-0"}))
+
+    def test_glob_and_regex(self):
+        with pytest.raises(ValueError):
+            self.dataset.list_files(glob="*", regex=".*")
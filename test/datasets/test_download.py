@@ -0,0 +1,130 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import io
+
+import pytest
+import requests
+from expects import expect, equal
+
+from palantir.datasets.download import ResumableStream
+
+CONTENT = bytes(range(256)) * 4
+
+
+class _DroppingStream(io.RawIOBase):
+    """Serves content from an offset and fails once `limit` bytes have been read, as a dropped connection does."""
+
+    def __init__(self, content: bytes, limit: int, error: Exception = None):
+        super().__init__()
+        self._content = io.BytesIO(content)
+        self._limit = limit
+        self._error = error
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self._limit <= 0:
+            if self._error is None:
+                return 0
+            raise self._error
+        num_bytes = self._content.readinto(memoryview(buffer)[: min(100, self._limit)])
+        self._limit -= num_bytes
+        return num_bytes
+
+
+def _http_error(status_code: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status_code
+    return requests.HTTPError(f"{status_code}", response=response)
+
+
+class TestResumableStream:
+    @pytest.fixture(autouse=True)
+    def before(self):
+        self.offsets = []
+
+    def _stream(self, limit, error=ConnectionResetError("reset"), content=CONTENT):
+        def _open_at(offset):
+            self.offsets.append(offset)
+            return _DroppingStream(content[offset:], limit, error)
+
+        return io.BufferedReader(
+            ResumableStream(_open_at, len(CONTENT), max_retries=2, retry_interval=0)
+        )
+
+    def test_reconnects_from_last_byte(self):
+        expect(self._stream(300).read()).to(equal(CONTENT))
+        expect(self.offsets).to(equal([0, 300, 600, 900]))
+
+    def test_reconnects_when_truncated(self):
+        expect(self._stream(500, error=None).read()).to(equal(CONTENT))
+        expect(self.offsets).to(equal([0, 500, 1000]))
+
+    def test_gives_up_without_progress(self):
+        with pytest.raises(ConnectionResetError):
+            self._stream(0).read()
+        expect(self.offsets).to(equal([0, 0, 0]))
+
+    def test_fails_without_retrying_client_errors(self):
+        for error in (_http_error(404), FileNotFoundError("missing")):
+            self.offsets.clear()
+            with pytest.raises(type(error)):
+                self._stream(0, error=error).read()
+            expect(self.offsets).to(equal([0]))
+
+    def test_retries_server_errors(self):
+        with pytest.raises(requests.HTTPError):
+            self._stream(0, error=_http_error(503)).read()
+        expect(self.offsets).to(equal([0, 0, 0]))
+
+    def test_too_long(self):
+        with pytest.raises(IOError):
+            self._stream(2000, content=CONTENT + b"extra").read()
+
+
+class TestResumableDownload:
+    @pytest.fixture(autouse=True)
+    def before(self, tmp_path, local_dataset):
+        self.tmp_path = tmp_path
+        self.dataset = local_dataset()
+        with self.dataset.start_transaction() as txn:
+            txn.write("dir/blob.bin", CONTENT)
+        service = self.dataset.client.services.data_proxy_service
+        get_file_in_view = service.get_file_in_view
+        self.ranges = []
+
+        def _get_file_in_view(**kwargs):
+            self.ranges.append(kwargs.get("byte_range"))
+            return _DroppingStream(
+                get_file_in_view(**kwargs).read(), 400, ConnectionResetError("reset")
+            )
+
+        service.get_file_in_view = _get_file_in_view
+
+    def test_read_resumable(self):
+        with self.dataset.file("dir/blob.bin").read_resumable(
+            retry_interval=0
+        ) as stream:
+            expect(stream.read()).to(equal(CONTENT))
+        expect(self.ranges).to(equal([None, "bytes=400-", "bytes=800-"]))
+
+    def test_download(self):
+        file = next(self.dataset.list_files())
+
+        path = file.download(self.tmp_path / "out" / "blob.bin", retry_interval=0)
+
+        expect(path.read_bytes()).to(equal(CONTENT))
+        expect(sorted(p.name for p in path.parent.iterdir())).to(equal(["blob.bin"]))
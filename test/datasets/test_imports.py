@@ -0,0 +1,72 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import json
+import subprocess
+import sys
+
+import pytest
+from expects import expect, equal, contain
+
+HEAVY_MODULES = [
+    "conjure_python_client",
+    "dateutil",
+    "numpy",
+    "pandas",
+    "palantir.datasets.client",
+    "palantir.datasets.rpc",
+    "pyarrow",
+    "requests",
+    "tomli",
+]
+
+
+def _imported_modules(statement: str):
+    """Runs the import statement in a fresh interpreter and returns the heavy modules it loaded."""
+    script = (
+        f"import json, sys\n{statement}\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output)
+
+
+class TestImports:
+    @pytest.mark.parametrize(
+        "statement",
+        [
+            "import palantir",
+            "import palantir.core",
+            "import palantir.datasets",
+            "from palantir.core.types import ResourceIdentifier",
+            "from palantir.datasets.types import DatasetLocator",
+            "from palantir.datasets.core import Dataset",
+            "from palantir.datasets.errors import TransactionAbortedError",
+        ],
+    )
+    def test_lightweight_imports(self, statement):
+        expect(_imported_modules(statement)).to(equal([]))
+
+    def test_dataset_loads_client(self):
+        expect(_imported_modules("from palantir.datasets import dataset")).to(
+            contain("palantir.datasets.client", "conjure_python_client")
+        )
+
+    def test_unknown_attribute(self):
+        import palantir.datasets
+
+        with pytest.raises(AttributeError):
+            palantir.datasets.missing  # pylint: disable=pointless-statement
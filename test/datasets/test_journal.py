@@ -0,0 +1,122 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import pytest
+from expects import expect, equal
+
+from palantir.core.types import ResourceIdentifier
+from palantir.datasets.journal import JournalEntry, UploadJournal
+from palantir.datasets.types import FileLocator, TransactionStatus
+
+DATASET_RID = ResourceIdentifier.from_string("ri.foundry.main.dataset.0")
+
+
+def _locator(txn: str, path: str = "big.bin") -> FileLocator:
+    return FileLocator(dataset_rid=DATASET_RID, end_ref=txn, logical_path=path)
+
+
+class TestUploadJournal:
+    @pytest.fixture(autouse=True)
+    def before(self, tmp_path):
+        self.journal = UploadJournal(tmp_path / "upload.journal")
+
+    def test_record_and_complete(self):
+        first = _locator("ri.foundry.main.transaction.1")
+        second = _locator("ri.foundry.main.transaction.2")
+        self.journal.record(first, JournalEntry(0, 4, "a"))
+        self.journal.record(first, JournalEntry(1, 2, "b"))
+        self.journal.record(second, JournalEntry(0, 4, "c"))
+
+        expect(self.journal.chunks(first)).to(
+            equal({0: JournalEntry(0, 4, "a"), 1: JournalEntry(1, 2, "b")})
+        )
+        expect([str(rid) for rid in self.journal.transactions(DATASET_RID)]).to(
+            equal(["ri.foundry.main.transaction.1", "ri.foundry.main.transaction.2"])
+        )
+
+        self.journal.complete(first)
+        expect(self.journal.chunks(first)).to(equal({}))
+        expect(self.journal.chunks(second)).to(equal({0: JournalEntry(0, 4, "c")}))
+        self.journal.complete(second)
+        expect(self.journal.path.exists()).to(equal(False))
+
+    def test_incomplete_last_line(self):
+        locator = _locator("ri.foundry.main.transaction.1")
+        self.journal.record(locator, JournalEntry(0, 4, "a"))
+        with open(self.journal.path, "a", encoding="utf-8") as file:
+            file.write('{"datasetRid": "ri.foundry')
+
+        expect(self.journal.chunks(locator)).to(equal({0: JournalEntry(0, 4, "a")}))
+
+
+class TestResumableUpload:
+    @pytest.fixture(autouse=True)
+    def before(self, tmp_path, local_dataset):
+        self.journal = UploadJournal(tmp_path / "upload.journal")
+        self.dataset = local_dataset(upload_journal=self.journal)
+        self.content = bytes(range(10)) * 10
+        self.uploaded = []
+        self.fail_at = None
+        service = self.dataset.client.services.data_proxy_service
+        put_file = service.put_file
+
+        def _put_file(**kwargs):
+            if self.fail_at == len(self.uploaded):
+                raise ConnectionError("connection reset")
+            self.uploaded.append(kwargs["logical_path"])
+            put_file(**kwargs)
+
+        service.put_file = _put_file
+
+    def _upload(self, txn):
+        self.dataset.client._put_file_chunked(
+            _locator(str(txn.rid)).with_updated(dataset_rid=self.dataset.rid),
+            self.content,
+            chunk_size=30,
+        )
+
+    def test_resumes_from_uploaded_chunks(self):
+        txn = self.dataset.start_transaction()
+        self.fail_at = 2
+        with pytest.raises(ConnectionError):
+            self._upload(txn)
+        expect(self.uploaded).to(equal(["big.bin.0", "big.bin.1"]))
+
+        self.fail_at = None
+        resumed = self.dataset.transaction(
+            self.journal.transactions(self.dataset.rid)[0]
+        )
+        expect(resumed.status).to(equal(TransactionStatus.OPEN))
+        self._upload(resumed)
+        resumed.commit()
+
+        expect(self.uploaded).to(
+            equal(["big.bin.0", "big.bin.1", "big.bin.2", "big.bin.3"])
+        )
+        expect(self.dataset.file("big.bin").read().read()).to(equal(self.content))
+        expect(self.journal.transactions(self.dataset.rid)).to(equal([]))
+
+    def test_reuploads_changed_chunks(self):
+        txn = self.dataset.start_transaction()
+        self.fail_at = 2
+        with pytest.raises(ConnectionError):
+            self._upload(txn)
+
+        self.fail_at = None
+        self.content = bytes(reversed(self.content))
+        self._upload(txn)
+        txn.commit()
+
+        expect(len(self.uploaded)).to(equal(6))
+        expect(self.dataset.file("big.bin").read().read()).to(equal(self.content))
@@ -0,0 +1,112 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import pandas as pd
+import pytest
+from expects import expect, equal, raise_error, be_a
+
+from palantir.core import context
+from palantir.datasets import dataset
+from palantir.datasets.client import dataset_services
+from palantir.datasets.errors import (
+    SimultaneousOpenTransactionError,
+    TransactionAbortedError,
+)
+from palantir.datasets.local import LocalDatasetServices
+from palantir.datasets.types import TransactionType
+
+
+class TestLocalDatasetServices:
+    @pytest.fixture(autouse=True)
+    def before(self, tmp_path):
+        self.tmp_path = tmp_path
+        self.ctx = context(hostname=f"file://{tmp_path}")
+        self.dataset = dataset("/local/dataset", create=True, ctx=self.ctx)
+
+    def _paths(self):
+        return sorted(file.path for file in self.dataset.list_files())
+
+    def test_dataset_services(self):
+        expect(dataset_services(self.ctx)).to(be_a(LocalDatasetServices))
+        expect(str(dataset("/local/dataset", ctx=self.ctx).rid)).to(
+            equal(str(self.dataset.rid))
+        )
+        expect(lambda: dataset("/local/missing", ctx=self.ctx)).to(
+            raise_error(ValueError)
+        )
+
+    def test_write_and_read_files(self):
+        with self.dataset.start_transaction() as txn:
+            txn.write("a.txt", b"a")
+            txn.write("dir/b.txt", b"b")
+            txn.write("_hidden", b"hidden")
+
+        expect(self._paths()).to(equal(["a.txt", "dir/b.txt"]))
+        expect(self.dataset.file("dir/b.txt").read().read()).to(equal(b"b"))
+
+    def test_transaction_types(self):
+        with self.dataset.start_transaction() as txn:
+            txn.write("a.txt", b"a")
+        with self.dataset.start_transaction(TransactionType.UPDATE) as txn:
+            txn.write("a.txt", b"updated")
+            txn.write("b.txt", b"b")
+        expect(self._paths()).to(equal(["a.txt", "b.txt"]))
+        expect(self.dataset.file("a.txt").read().read()).to(equal(b"updated"))
+
+        with self.dataset.start_transaction(TransactionType.SNAPSHOT) as txn:
+            txn.write("c.txt", b"c")
+        expect(self._paths()).to(equal(["c.txt"]))
+
+    def test_aborted_transaction(self):
+        with pytest.raises(TransactionAbortedError):
+            with self.dataset.start_transaction() as txn:
+                txn.write("a.txt", b"a")
+                raise RuntimeError("failed")
+
+        self.dataset.update_view()
+        expect(self._paths()).to(equal([]))
+
+    def test_simultaneous_open_transaction(self):
+        txn = self.dataset.start_transaction()
+        expect(self.dataset.start_transaction).to(
+            raise_error(SimultaneousOpenTransactionError)
+        )
+        txn.abort()
+
+    def test_write_and_read_pandas(self):
+        df = pd.DataFrame({"id": [1, 2, 3], "word": ["a", "b", "c"]})
+
+        self.dataset.write_pandas(df)
+
+        expect(self.dataset.read_pandas().equals(df)).to(equal(True))
+        schema = self.dataset.client.services.schema_service.get_schema(
+            "local", str(self.dataset.rid), "master", str(self.dataset.view[1])
+        )
+        expect([field.name for field in schema.schema.field_schema_list]).to(
+            equal(["id", "word"])
+        )
+
+    def test_logical_path_outside_of_dataset(self):
+        with pytest.raises(TransactionAbortedError):
+            with self.dataset.start_transaction() as txn:
+                expect(lambda: txn.write("../../escaped.txt", b"x")).to(
+                    raise_error(ValueError)
+                )
+                expect(lambda: txn.write("a/../../b.txt", b"x")).to(
+                    raise_error(ValueError)
+                )
+                raise RuntimeError("abort")
+
+        expect(list(self.tmp_path.rglob("*escaped.txt"))).to(equal([]))
+        expect(list(self.tmp_path.rglob("b.txt"))).to(equal([]))
@@ -0,0 +1,165 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import pytest
+from expects import expect, equal
+
+from palantir.datasets.manifest import ManifestIndex
+from palantir.datasets.types import TransactionType
+
+
+class TestManifestIndex:
+    @pytest.fixture(autouse=True)
+    def before(self, tmp_path, local_dataset):
+        self.index = ManifestIndex(tmp_path / "manifests")
+        self.dataset = local_dataset(manifest_index=self.index)
+        with self.dataset.start_transaction(TransactionType.SNAPSHOT) as txn:
+            txn.write_many({"a/1.txt": b"1", "a/2.txt": b"2", "b/3.txt": b"3"})
+        self.listings = []
+        catalog = self.dataset.client.services.catalog_service
+        get_dataset_view_files2 = catalog.get_dataset_view_files2
+
+        def _record(**kwargs):
+            self.listings.append(kwargs)
+            return get_dataset_view_files2(**kwargs)
+
+        catalog.get_dataset_view_files2 = _record
+
+    def _paths(self, path=None):
+        return {file.path: file for file in self.dataset.list_files(path)}
+
+    def test_lists_view_once(self):
+        first = self._paths()
+        expect(len(self.listings)).to(equal(1))
+
+        second = self._paths()
+        expect(len(self.listings)).to(equal(1))
+        expect(sorted(second)).to(equal(["a/1.txt", "a/2.txt", "b/3.txt"]))
+        expect([(f.transaction_rid, f.length, f.modified) for f in second.values()]).to(
+            equal([(f.transaction_rid, f.length, f.modified) for f in first.values()])
+        )
+
+    def test_prefix_answered_locally(self):
+        self._paths()
+
+        expect(sorted(self._paths("a/"))).to(equal(["a/1.txt", "a/2.txt"]))
+        expect(sorted(self._paths("b"))).to(equal(["b/3.txt"]))
+        expect(len(self.listings)).to(equal(1))
+
+    def test_lists_only_new_transactions(self):
+        self._paths()
+        with self.dataset.start_transaction(TransactionType.APPEND) as txn:
+            txn.write("c/4.txt", b"4")
+        with self.dataset.start_transaction(TransactionType.UPDATE) as update:
+            update.write("a/1.txt", b"one")
+
+        files = self._paths()
+
+        expect(sorted(files)).to(equal(["a/1.txt", "a/2.txt", "b/3.txt", "c/4.txt"]))
+        expect(files["a/1.txt"].transaction_rid).to(equal(update.rid))
+        expect(files["a/1.txt"].length).to(equal(3))
+        expect(self.listings[-1]["start_transaction_rid"]).to(equal(str(txn.rid)))
+
+    def test_relists_after_delete(self):
+        self._paths()
+        with self.dataset.start_transaction(TransactionType.APPEND) as txn:
+            txn.write("c/4.txt", b"4")
+        with self.dataset.start_transaction(TransactionType.DELETE) as txn:
+            txn.delete(["a/1.txt"])
+
+        expect(sorted(self._paths())).to(equal(["a/2.txt", "b/3.txt", "c/4.txt"]))
+        expect(self.listings[-1]["start_transaction_rid"]).to(
+            equal(str(self.dataset.locator.start_transaction_rid))
+        )
+
+    def test_snapshot_starts_new_view(self):
+        self._paths()
+        with self.dataset.start_transaction(TransactionType.SNAPSHOT) as txn:
+            txn.write("d/5.txt", b"5")
+
+        expect(sorted(self._paths())).to(equal(["d/5.txt"]))
+
+    def test_earlier_view(self):
+        earlier = self.dataset.locator
+        self._paths()
+        with self.dataset.start_transaction(TransactionType.APPEND) as txn:
+            txn.write("c/4.txt", b"4")
+        self._paths()
+
+        self.dataset.locator = earlier
+        expect(sorted(self._paths())).to(equal(["a/1.txt", "a/2.txt", "b/3.txt"]))
+
+    def test_keeps_views_with_the_same_start(self):
+        earlier, earlier_view = self.dataset.locator, self.dataset.view
+        self._paths()
+        with self.dataset.start_transaction(TransactionType.APPEND) as txn:
+            txn.write("c/4.txt", b"4")
+        later = self.dataset.locator
+        self._paths()
+        num_listings = len(self.listings)
+
+        for locator in (earlier, later, earlier, later):
+            self.dataset.locator = locator
+            self._paths()
+        changes = list(self.dataset.diff(earlier_view))
+
+        expect([change.path for change in changes]).to(equal(["c/4.txt"]))
+
+        expect(len(self.listings)).to(equal(num_listings))
+
+    def test_keeps_views_of_other_branches(self):
+        self._paths()
+        other = self.dataset.locator.with_updated(branch_id="other")
+        self.index.replace(other, [])
+        num_listings = len(self.listings)
+
+        expect(sorted(self._paths())).to(equal(["a/1.txt", "a/2.txt", "b/3.txt"]))
+        expect(len(self.listings)).to(equal(num_listings))
+        expect(list(self.index.files(self.dataset, other))).to(equal([]))
+
+    def test_evicts_least_recently_used_views(self):
+        self.index.max_views = 2
+        locators = [self.dataset.locator]
+        self._paths()
+        for num in range(2):
+            with self.dataset.start_transaction(TransactionType.APPEND) as txn:
+                txn.write(f"c/{num}.txt", b"c")
+            locators.append(self.dataset.locator)
+            self._paths()
+
+        expect(self.index.files(self.dataset, locators[0])).to(equal(None))
+        expect(self.index.end_transaction_rids(self.dataset.locator)).to(
+            equal({str(locator.end_transaction_rid) for locator in locators[1:]})
+        )
+
+    def test_update_requires_indexed_view(self):
+        self._paths()
+        with self.dataset.start_transaction(TransactionType.APPEND) as txn:
+            txn.write("c/4.txt", b"4")
+
+        expect(
+            self.index.update(self.dataset.locator, "ri.foundry.main.transaction.0", [])
+        ).to(equal(False))
+        expect(self.index.files(self.dataset, self.dataset.locator)).to(equal(None))
+
+    def test_list_transactions(self):
+        with self.dataset.start_transaction(TransactionType.APPEND) as txn:
+            txn.write("c/4.txt", b"4")
+
+        txns = list(self.dataset.client.list_transactions(self.dataset, page_size=1))
+
+        expect([t.txn_type for t in txns]).to(
+            equal([TransactionType.APPEND, TransactionType.SNAPSHOT])
+        )
+        expect(txns[0].rid).to(equal(txn.rid))
@@ -0,0 +1,67 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import os
+
+import pytest
+from expects import expect, equal
+
+
+def _parse(file):
+    content = file.read().read()
+    if content == b"bad":
+        raise ValueError(f"cannot parse {file.path}")
+    return int(content), os.getpid()
+
+
+class TestMapFiles:
+    @pytest.fixture(autouse=True)
+    def before(self, local_dataset):
+        self.dataset = local_dataset()
+        self.files = {f"{i:02d}.txt": str(i).encode() for i in range(20)}
+        with self.dataset.start_transaction() as txn:
+            txn.write_many(self.files)
+
+    def test_ordered(self):
+        results = list(
+            self.dataset.map_files(_parse, processes=2, threads_per_process=2)
+        )
+
+        expect([result.path for result in results]).to(equal(sorted(self.files)))
+        expect([result.value[0] for result in results]).to(equal(list(range(20))))
+        expect({result.value[1] for result in results} - {os.getpid()}).to(
+            equal({result.value[1] for result in results})
+        )
+
+    def test_unordered(self):
+        results = self.dataset.map_files(_parse, processes=2, ordered=False)
+
+        expect(sorted(result.value[0] for result in results)).to(equal(list(range(20))))
+
+    def test_errors(self):
+        with self.dataset.start_transaction() as txn:
+            txn.write("05.txt", b"bad")
+
+        with pytest.raises(ValueError):
+            list(self.dataset.map_files(_parse, processes=2))
+
+        results = list(self.dataset.map_files(_parse, processes=2, errors="collect"))
+        failed = [result for result in results if result.error is not None]
+        expect([result.path for result in failed]).to(equal(["05.txt"]))
+        expect(str(failed[0].error)).to(equal("cannot parse 05.txt"))
+        expect(len(results)).to(equal(20))
+
+    def test_unsupported_errors(self):
+        with pytest.raises(ValueError):
+            self.dataset.map_files(_parse, errors="ignore")
@@ -0,0 +1,107 @@
+#  (c) Copyright 2022 Palantir Technologies Inc. All rights reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import re
+
+import pytest
+from expects import expect, equal
+
+from palantir.datasets.patterns import (
+    PathPattern,
+    expand_braces,
+    relative_path,
+    narrow_prefixes,
+    regex_prefix,
+)
+
+
+class TestPathPattern:
+    @pytest.mark.parametrize(
+        "glob,path,expected",
+        [
+            ("year=2024/*.parquet", "year=2024/a.parquet", True),
+            ("year=2024/*.parquet", "year=2024/m=1/a.parquet", False),
+            ("year=2024/**/*.parquet", "year=2024/a.parquet", True),
+            ("year=2024/**/*.parquet", "year=2024/m=1/d=2/a.parquet", True),
+            ("**/*.parquet", "a.parquet", True),
+            ("**/*.parquet", "a/b.csv", False),
+            ("data/**", "data/a/b", True),
+            ("part-?.csv", "part-1.csv", True),
+            ("part-?.csv", "part-10.csv", False),
+            ("part-[!0].csv", "part-0.csv", False),
+            ("part-[0-4].csv", "part-3.csv", True),
+            ("{raw,clean}/*.csv", "clean/a.csv", True),
+            ("{raw,clean}/*.csv", "other/a.csv", False),
+            ("a.{csv}", "a.{csv}", True),
+        ],
+    )
+    def test_glob_matches(self, glob, path, expected):
+        expect(PathPattern.from_glob(glob).matches(path)).to(equal(expected))
+
+    @pytest.mark.parametrize(
+        "glob,prefixes",
+        [
+            ("year=2024/**/*.parquet", ["year=2024/"]),
+            ("**/*.parquet", [""]),
+            ("{raw,clean}/*.csv", ["clean/", "raw/"]),
+            ("{a,ab}/x", ["a/x", "ab/x"]),
+            ("{a,a/b}/*", ["a/"]),
+        ],
+    )
+    def test_glob_prefixes(self, glob, prefixes):
+        expect(PathPattern.from_glob(glob).prefixes).to(equal(prefixes))
+
+    def test_expand_braces(self):
+        expect(expand_braces("a/{b,{c,d}}/{e,f}")).to(
+            equal(["a/b/e", "a/b/f", "a/c/e", "a/c/f", "a/d/e", "a/d/f"])
+        )
+        expect(expand_braces("a/{b}/{c")).to(equal(["a/{b}/{c"]))
+
+    @pytest.mark.parametrize(
+        "regex,prefix",
+        [
+            (r"year=2024/.*\.parquet", "year=2024/"),
+            (r"^data/\d+", "data/"),
+            (r"a\.b?c", "a."),
+            (r"ab+c", "ab"),
+            (r"a|b", ""),
+            (r"x/(a|b)", "x/"),
+            (r"x/[|]y|", ""),
+            (r"x/[|]y", "x/"),
+        ],
+    )
+    def test_regex_prefix(self, regex, prefix):
+        expect(regex_prefix(regex)).to(equal(prefix))
+
+    def test_case_insensitive_regex(self):
+        pattern = PathPattern.from_regex(re.compile("data/.*", re.IGNORECASE))
+
+        expect(pattern.prefixes).to(equal([""]))
+        expect(pattern.matches("DATA/a")).to(equal(True))
+
+    def test_narrow_prefixes(self):
+        expect(narrow_prefixes(["b/", "a/", "a/c", "b/"])).to(equal(["a/", "b/"]))
+
+    @pytest.mark.parametrize(
+        "path,expected",
+        [
+            ("year=2024/*", "year=2024/*"),
+            ("./year=2024/*", "year=2024/*"),
+            ("/year=2024/*", "year=2024/*"),
+            ("/./year=2024/", "year=2024/"),
+            ("/", ""),
+        ],
+    )
+    def test_relative_path(self, path, expected):
+        expect(relative_path(path)).to(equal(expected))
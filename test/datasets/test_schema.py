@@ -16,14 +16,20 @@ from datetime import date
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
 import pytest
 from expects import expect, equal
 
-from palantir.datasets.schema import pandas_to_foundry_schema, _get_field
+from palantir.datasets.schema import (
+    foundry_schema_to_arrow,
+    pandas_to_foundry_schema,
+    _get_field,
+)
 from palantir.datasets.types import (
     ArrayFieldType,
     BooleanFieldType,
     ByteFieldType,
+    DecimalFieldType,
     Field,
     FileFormat,
     DateFieldType,
@@ -32,8 +38,10 @@ from palantir.datasets.types import (
     FoundrySchema,
     IntegerFieldType,
     LongFieldType,
+    MapFieldType,
     ShortFieldType,
     StringFieldType,
+    StructFieldType,
     TimestampFieldType,
 )
 
@@ -175,3 +183,47 @@ class TestPandasSchemaConverter:
         )
 
         expect(pandas_to_foundry_schema(df)).to(equal(expected))
+
+
+class TestArrowSchemaConverter:
+    def test_to_arrow(self):
+        schema = FoundrySchema(
+            fields=[
+                Field("id", "long", nullable=False),
+                Field("name", "str"),
+                Field("price", DecimalFieldType(38, 2)),
+                Field("tags", ArrayFieldType(StringFieldType())),
+                Field("counts", MapFieldType(StringFieldType(), IntegerFieldType())),
+                Field("point", StructFieldType([DoubleFieldType(), DoubleFieldType()])),
+                Field(
+                    "named",
+                    StructFieldType([LongFieldType(), StringFieldType()], ["a", "b"]),
+                ),
+                Field("day", "date"),
+                Field("at", "timestamp"),
+            ]
+        )
+
+        expect(foundry_schema_to_arrow(schema)).to(
+            equal(
+                pa.schema(
+                    [
+                        pa.field("id", pa.int64(), nullable=False),
+                        pa.field("name", pa.string()),
+                        pa.field("price", pa.decimal128(38, 2)),
+                        pa.field("tags", pa.list_(pa.string())),
+                        pa.field("counts", pa.map_(pa.string(), pa.int32())),
+                        pa.field(
+                            "point",
+                            pa.struct([("_1", pa.float64()), ("_2", pa.float64())]),
+                        ),
+                        pa.field(
+                            "named",
+                            pa.struct([("a", pa.int64()), ("b", pa.string())]),
+                        ),
+                        pa.field("day", pa.date32()),
+                        pa.field("at", pa.timestamp("us")),
+                    ]
+                )
+            )
+        )
@@ -13,8 +13,8 @@
 #  limitations under the License.
 
 import pytest
-from expects import expect, be, raise_error
-from mockito import mock, when
+from expects import expect, be, be_below, equal, raise_error
+from mockito import mock, verify, when
 
 from palantir.core.types import ResourceIdentifier
 from palantir.datasets.client import DatasetsClient
@@ -87,3 +87,54 @@ class TestTransaction:
         )
 
         expect(txn.status).to(be(TransactionStatus.ABORTED))
+
+    def test_write_many(self):
+        txn = Transaction(
+            self.dataset,
+            rid="ri.foundry.test.transaction.2",
+            txn_type=TransactionType.UPDATE,
+            status=TransactionStatus.OPEN,
+            client=self.client,
+        )
+        written = {}
+        when(self.client).put_file(...).thenAnswer(
+            lambda locator, content: written.update({locator.logical_path: content})
+        )
+
+        txn.write_many({f"file{i}": bytes([i]) for i in range(20)}, max_workers=4)
+
+        expect(written).to(equal({f"file{i}": bytes([i]) for i in range(20)}))
+        verify(self.client, times=20).put_file(...)
+
+    def test_write_many_aborts_on_error(self):
+        txn = Transaction(
+            self.dataset,
+            rid="ri.foundry.test.transaction.2",
+            txn_type=TransactionType.UPDATE,
+            status=TransactionStatus.OPEN,
+            client=self.client,
+        )
+        when(self.client).start_transaction(
+            self.dataset, TransactionType.UPDATE
+        ).thenReturn(txn)
+        when(self.client).abort_transaction(txn).thenReturn(None)
+        consumed = []
+
+        def _put_file(locator, _content):
+            if locator.logical_path == "file3":
+                raise ValueError("upload failed")
+
+        def _files():
+            for index in range(100):
+                consumed.append(index)
+                yield f"file{index}", b"content"
+
+        when(self.client).put_file(...).thenAnswer(_put_file)
+
+        def _write_many():
+            with self.dataset.start_transaction() as txn_ctx:
+                txn_ctx.write_many(_files(), max_workers=2)
+
+        expect(_write_many).to(raise_error(TransactionAbortedError))
+        expect(txn.status).to(be(TransactionStatus.ABORTED))
+        expect(len(consumed)).to(be_below(100))